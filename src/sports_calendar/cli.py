@@ -3,8 +3,8 @@ import typer
 from . import logger
 from .__version__ import __version__
 from .initialize import init
-from .sync_db import sync_db
-from .sync_calendar import sync_calendar, clear_cal
+from .sync_db import sync_db, migrate_landing
+from .sync_calendar import sync_calendar, clear_cal, export_cal
 from .validate_db import validate_db
 from .sc_core.setup import Paths, setup_logging
 
@@ -12,8 +12,10 @@ from .sc_core.setup import Paths, setup_logging
 app = typer.Typer(help="Sports Calendar CLI Application — manage DB, calendar, validation.")
 
 app.add_typer(sync_db, name="sync-db", help="Commands to manage the data synchronization pipeline.")
+app.add_typer(migrate_landing, name="migrate-landing", help="Commands to migrate landing files to JSON Lines.")
 app.add_typer(sync_calendar, name="sync-calendar", help="Commands to manage calendar selection.")
 app.add_typer(clear_cal, name="clear-calendar", help="Commands to clear events from the Google Calendar.")
+app.add_typer(export_cal, name="export-calendar", help="Commands to export the events of a selection to an ICS file.")
 app.add_typer(validate_db, name="validate-db", help="Commands to validate the database.")
 
 app.command(name="init")(init)
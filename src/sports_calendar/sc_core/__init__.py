@@ -5,4 +5,6 @@ from .datastage import DataStage
 from .loader import load_yml
 from .setup import Paths, setup_logging
 from .spec_model import SpecModel
-from .types import IOContent
\ No newline at end of file
+from .types import IOContent
+from .rate_limiter import TokenBucket
+from .table_schema import TableSchema
\ No newline at end of file
@@ -4,5 +4,9 @@ logger = logging.getLogger(__name__)
 from .base_file_handler import BaseFileHandler
 from .csv_handler import CSVHandler
 from .json_handler import JSONHandler
+from .jsonl_handler import JSONLHandler, migrate_json_to_jsonl
+from .parquet_handler import ParquetHandler
+from .partitioned_handler import PartitionedFileHandler
 from .factory import FileHandlerFactory
-from .metadata_manager import MetadataEntry
\ No newline at end of file
+from .metadata_manager import MetadataEntry
+from .table_index import TableIndex, CombinedTableIndex, PartitionKeyIndex
\ No newline at end of file
@@ -2,6 +2,8 @@ from abc import ABC, abstractmethod
 from pathlib import Path
 from datetime import datetime, timezone
 
+import numpy as np
+
 from . import logger
 from .metadata_manager import MetadataManager
 from sports_calendar.sc_core import IOContent
@@ -10,6 +12,8 @@ from sports_calendar.sc_core import IOContent
 class BaseFileHandler(ABC):
     """ Abstract base class for file handlers. """
 
+    stores_dtypes = False  # Whether the columns are read back with the dtypes they were written with
+
     def __init__(self, file_path: str | Path):
         """ Initialize the file handler. """
         self.file_path = Path(file_path).resolve()
@@ -17,7 +21,13 @@ class BaseFileHandler(ABC):
         self.meta_manager = MetadataManager(self.file_path)
 
     def __len__(self) -> int:
-        """ Return the length of the content. """
+        """ Return the length of the content, using the row count tracked in metadata when available. """
+        if not self.exists():
+            return 0
+        rows = self.meta_manager.read_rows()
+        if rows is not None:
+            return rows
+        logger.debug(f"No row count recorded in metadata for {self.path}. Reading the file to get its length.")
         return self._get_len()
 
     def __repr__(self):
@@ -29,6 +39,10 @@ class BaseFileHandler(ABC):
         """ Return the file path. """
         return self.file_path
 
+    def exists(self) -> bool:
+        """ Return whether the file exists. """
+        return self.path.exists()
+
     @staticmethod
     def _check_path(file_path: Path) -> None:
         """ Check if the file path is valid. """
@@ -41,17 +55,24 @@ class BaseFileHandler(ABC):
         if not file_path.exists():
             logger.debug(f"The file {file_path} does not exist. It will be created on write.")
 
-    def read(self) -> IOContent:
-        """ Read the content of the file. """
-        return self._read_file()
+    def read(self, columns: list[str] | None = None) -> IOContent:
+        """ Read the content of the file, optionally only the given columns (tabular files only). """
+        if columns is None:
+            return self._read_file()
+        return self._read_columns(columns)
+
+    def read_rows(self, positions: np.ndarray) -> IOContent:
+        """ Read only the rows at the given positions of the file (tabular files only). """
+        return self._read_rows(np.asarray(positions, dtype=np.intp))
 
     def write(self, data: IOContent, source_versions: dict | None = None, overwrite: bool = False) -> None:
         """ TODO """
         data = self._add_ctime(data)
         try:
             added = len(data)
+            existing = self.__len__()
             if overwrite:
-                removed = self.__len__()
+                removed = existing
                 self._overwrite(data)
             else:
                 removed = 0
@@ -62,10 +83,29 @@ class BaseFileHandler(ABC):
         self.meta_manager.record_write(
             added=added,
             removed=removed,
-            source_versions=source_versions or {}
+            source_versions=source_versions or {},
+            rows=existing - removed + added
         )
         logger.info(f"Data written to {self.path} successfully.")
 
+    def replace_rows(self, positions: np.ndarray, data: IOContent, source_versions: dict | None = None) -> None:
+        """ Delete the rows at the given positions and append the data at the end of the file (tabular files only). """
+        positions = np.unique(np.asarray(positions, dtype=np.intp))
+        data = self._add_ctime(data)
+        try:
+            existing = self.__len__()
+            self._replace_rows(positions, data)
+        except Exception as e:
+            logger.error(f"Failed to replace rows of {self.path}: {e}")
+            raise
+        self.meta_manager.record_write(
+            added=len(data),
+            removed=len(positions),
+            source_versions=source_versions or {},
+            rows=existing - len(positions) + len(data)
+        )
+        logger.info(f"{len(positions)} rows of {self.path} replaced by {len(data)} rows successfully.")
+
     def delete(self, force: bool = False) -> None:
         """ Delete data from the file. """
         removed = self.__len__()
@@ -92,6 +132,21 @@ class BaseFileHandler(ABC):
     def _read_file(self) -> IOContent:
         """ TODO """
 
+    def _read_columns(self, columns: list[str]) -> IOContent:
+        """ Read only the given columns of the file. """
+        logger.error(f"{self.__class__.__name__} does not support reading a subset of columns.")
+        raise NotImplementedError(f"{self.__class__.__name__} does not support reading a subset of columns.")
+
+    def _read_rows(self, positions: np.ndarray) -> IOContent:
+        """ Read only the rows at the given positions of the file. """
+        logger.error(f"{self.__class__.__name__} does not support reading a subset of rows.")
+        raise NotImplementedError(f"{self.__class__.__name__} does not support reading a subset of rows.")
+
+    def _replace_rows(self, positions: np.ndarray, data: IOContent) -> None:
+        """ Delete the rows at the given (sorted) positions and append the data at the end of the file. """
+        logger.error(f"{self.__class__.__name__} does not support replacing a subset of rows.")
+        raise NotImplementedError(f"{self.__class__.__name__} does not support replacing a subset of rows.")
+
     @abstractmethod
     def _append(self, data: IOContent) -> None:
         """ Append data to the file using _write_file() method. """
@@ -1,3 +1,6 @@
+import csv
+
+import numpy as np
 import pandas as pd
 
 from . import logger
@@ -21,6 +24,10 @@ class CSVHandler(BaseFileHandler):
         self._check_iso_format(cutoff)
         filtered_content = content[content['_ctime'] >= cutoff]
         self._write_file(filtered_content)
+        self.meta_manager.record_cleanup(
+            removed=len(content) - len(filtered_content),
+            rows=len(filtered_content)
+        )
 
     def _read_file(self) -> pd.DataFrame:
         """ Read the CSV file and return its content as a DataFrame. """
@@ -36,14 +43,66 @@ class CSVHandler(BaseFileHandler):
             logger.error(f"Failed to read CSV file {self.path}: {e}")
             raise e
 
+    def _read_columns(self, columns: list[str]) -> pd.DataFrame:
+        """ Read only the given columns (the ones missing from the file are skipped). """
+        if not self.path.exists():
+            logger.debug(f"CSV file {self.path} does not exist. Returning empty DataFrame.")
+            return pd.DataFrame()
+        wanted = set(columns)
+        try:
+            return pd.read_csv(self.path, dtype=str, usecols=lambda col: col in wanted)
+        except pd.errors.EmptyDataError:
+            logger.debug(f"CSV file {self.path} is empty.")
+            return pd.DataFrame()
+        except Exception as e:
+            logger.error(f"Failed to read columns {columns} from CSV file {self.path}: {e}")
+            raise e
+
+    def _read_rows(self, positions: np.ndarray) -> pd.DataFrame:
+        """ Read the rows at the given positions (the whole file is parsed, CSV rows can't be seeked). """
+        return self._read_file().iloc[positions].reset_index(drop=True)
+
+    def _replace_rows(self, positions: np.ndarray, data: pd.DataFrame) -> None:
+        """ Replace rows of the CSV file, only appending the new rows when no row is deleted. """
+        self._validate_data(data)
+        if len(positions) == 0 and data.empty:
+            return
+        if len(positions) == 0:
+            self._append(data)
+            return
+        logger.debug(f"Deleting {len(positions)} rows of CSV file {self.path} and appending {len(data)} rows.")
+        content = self._read_file()
+        kept = np.ones(len(content), dtype=bool)
+        kept[positions] = False
+        self._write_file(pd.concat([content[kept], data], ignore_index=True))
+
+    def _read_header(self) -> list[str] | None:
+        """ Read only the header line of the CSV file, or None if the file doesn't exist or is empty. """
+        if not self.path.exists():
+            return None
+        with self.path.open("r", newline="") as f:
+            return next(csv.reader(f), None)
+
     def _append(self, data: pd.DataFrame) -> None:
-        """ Append data to the CSV file. """
+        """ Append data to the CSV file, writing only the new rows when the header matches. """
         logger.debug(f"Appending data to CSV file: {self.path}")
-        content = self._read_file()
-        if not content.empty and set(content.columns) != set(data.columns):
-            logger.warning("Data columns do not match existing CSV columns. Appending anyway.")
-        content = pd.concat([content, data], ignore_index=True)
-        self._write_file(content)
+        self._validate_data(data)
+        header = self._read_header()
+        if header is None:
+            self._write_file(data)
+            return
+        if list(data.columns) != header:
+            if set(data.columns) != set(header):
+                logger.warning("Data columns do not match existing CSV columns. Rewriting the whole file.")
+                content = pd.concat([self._read_file(), data], ignore_index=True)
+                self._write_file(content)
+                return
+            data = data[header]
+        try:
+            data.to_csv(self.path, mode="a", header=False, index=False)
+        except Exception as e:
+            logger.error(f"Failed to append to CSV file {self.path}: {e}")
+            raise e
 
     def _overwrite(self, data: pd.DataFrame) -> None:
         """ Overwrite the CSV file with new data. """
@@ -4,20 +4,30 @@ from . import logger
 from .base_file_handler import BaseFileHandler
 from .csv_handler import CSVHandler
 from .json_handler import JSONHandler
+from .jsonl_handler import JSONLHandler
+from .parquet_handler import ParquetHandler
+from .partitioned_handler import PartitionedFileHandler
 
 
 class FileHandlerFactory:
     """ Factory class to create file handlers. """
 
+    handler_map: dict[str, type[BaseFileHandler]] = {
+        ".csv": CSVHandler,
+        ".json": JSONHandler,
+        ".jsonl": JSONLHandler,
+        ".parquet": ParquetHandler,
+    }
+
     @staticmethod
-    def create_file_handler(file_path: Path | str) -> BaseFileHandler:
-        """ Create a file handler based on the file path. """
+    def create_file_handler(file_path: Path | str, partition_by: str | None = None, partition_kind: str | None = None) -> BaseFileHandler:
+        """ Create a file handler based on the file path (partitioned if a partition field is given or the table is stored as partitions). """
         file_path = Path(file_path).resolve()
         file_suffix = file_path.suffix.lower()
-        if file_suffix == ".csv":
-            return CSVHandler(file_path)
-        elif file_suffix == ".json":
-            return JSONHandler(file_path)
-        else:
-            logger.error(f"Unsupported file type: {file_suffix}. Supported types are: .csv, .json")
-            raise ValueError(f"Unsupported file type: {file_suffix}. Supported types are: .csv, .json")
+        if file_suffix not in FileHandlerFactory.handler_map:
+            logger.error(f"Unsupported file type: {file_suffix}. Supported types are: .csv, .json, .jsonl, .parquet")
+            raise ValueError(f"Unsupported file type: {file_suffix}. Supported types are: .csv, .json, .jsonl, .parquet")
+        handler_class = FileHandlerFactory.handler_map[file_suffix]
+        if partition_by is not None or PartitionedFileHandler.is_partitioned(file_path):
+            return PartitionedFileHandler(file_path, handler_class, field=partition_by, kind=partition_kind)
+        return handler_class(file_path)
@@ -22,6 +22,10 @@ class JSONHandler(BaseFileHandler):
             logger.error("JSON file does not contain '_ctime' key for cleanup.")
             raise ValueError("JSON file does not contain '_ctime' key for cleanup.")
         self._write_file(filtered_content)
+        self.meta_manager.record_cleanup(
+            removed=len(content) - len(filtered_content),
+            rows=len(filtered_content)
+        )
 
     def _read_file(self) -> list[dict]:
         """ Read the JSON file and return its content. """
@@ -0,0 +1,166 @@
+import os
+import json
+from pathlib import Path
+from typing import Iterator
+
+from . import logger
+from .base_file_handler import BaseFileHandler
+from .json_handler import JSONHandler
+
+
+class JSONLHandler(BaseFileHandler):
+    """ JSON Lines file handler for reading and writing one JSON record per line. """
+
+    def iter_records(self) -> Iterator[dict]:
+        """ Iterate over the records of the file one line at a time. """
+        if not self.path.exists():
+            logger.debug(f"JSONL file {self.path} does not exist. Nothing to iterate over.")
+            return
+        with self.path.open("r") as f:
+            for line_number, line in enumerate(f, start=1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError as e:
+                    logger.error(f"Invalid JSON on line {line_number} of {self.path}: {e}")
+                    raise ValueError(f"Invalid JSON on line {line_number} of {self.path}: {e}")
+
+    def cleanup(self, cutoff: str) -> None:
+        """ Cleanup the JSONL file by removing records older than the cutoff date (ISO format). """
+        logger.debug(f"Cleaning up JSONL file {self.path} with cutoff date {cutoff}")
+        if not self.path.exists():
+            logger.debug(f"JSONL file {self.path} does not exist. Nothing to clean up.")
+            return
+        self._check_iso_format(cutoff)
+
+        kept, removed = 0, 0
+        tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        try:
+            with tmp_path.open("w") as f:
+                for item in self.iter_records():
+                    if "_ctime" not in item:
+                        logger.error("JSONL file does not contain '_ctime' key for cleanup.")
+                        raise ValueError("JSONL file does not contain '_ctime' key for cleanup.")
+                    if item["_ctime"] >= cutoff:
+                        f.write(json.dumps(item) + "\n")
+                        kept += 1
+                    else:
+                        removed += 1
+            os.replace(tmp_path, self.path)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+        self.meta_manager.record_cleanup(removed=removed, rows=kept)
+
+    def _read_file(self) -> list[dict]:
+        """ Read the JSONL file and return its content. """
+        try:
+            return list(self.iter_records())
+        except Exception as e:
+            logger.error(f"Failed to read JSONL file {self.path}: {e}")
+            raise e
+
+    def _append(self, data: list[dict]) -> None:
+        """ Append data to the JSONL file, one line per record. """
+        logger.debug(f"Appending data to JSONL file: {self.path}")
+        self._validate_data(data)
+        try:
+            with self.path.open("a") as f:
+                for item in data:
+                    f.write(json.dumps(item) + "\n")
+        except Exception as e:
+            logger.error(f"Failed to append to JSONL file {self.path}: {e}")
+            raise e
+
+    def _overwrite(self, data: list[dict]) -> None:
+        """ Overwrite the JSONL file with new data. """
+        logger.debug(f"Overwriting JSONL file with new data: {self.path}")
+        self._write_file(data)
+
+    def _write_file(self, data: list[dict]) -> None:
+        """ Write data to the JSONL file. """
+        self._validate_data(data)
+        try:
+            with self.path.open("w") as f:
+                for item in data:
+                    f.write(json.dumps(item) + "\n")
+        except Exception as e:
+            logger.error(f"Failed to write JSONL file {self.path}: {e}")
+            raise e
+
+    def _get_len(self) -> int:
+        """ Return the length of the content by counting non-empty lines. """
+        if not self.path.exists():
+            return 0
+        with self.path.open("r") as f:
+            return sum(1 for line in f if line.strip())
+
+    def _validate_data(self, data: list[dict]) -> None:
+        """ Check that the data is a list of dictionaries. """
+        if not isinstance(data, list):
+            logger.error(f"Data must be a list. File handler path: {self.path}")
+            raise ValueError(f"Data must be a list. File handler path: {self.path}")
+        if not all(isinstance(d, dict) for d in data):
+            logger.error(f"All elements in the data must be dictionaries. File handler path: {self.path}")
+            raise ValueError(f"All elements in the data must be dictionaries. File handler path: {self.path}")
+
+    def _add_ctime(self, data: list[dict]) -> list[dict]:
+        """ Add creation time to each dictionary in the list. """
+        for item in data:
+            item["_ctime"] = self._today()
+        return data
+
+
+def migrate_json_to_jsonl(json_path: Path | str, remove_source: bool = True) -> Path:
+    """
+    Convert a JSON array file into a JSON Lines file next to it and return the new path.
+    Both files share the same metadata file (same stem), so the history is kept as is.
+    If the JSON Lines file already exists (e.g. written by a pipeline run before the migration, or by a previous
+    migration with the source kept), the JSON records it doesn't contain yet are prepended to it, records being
+    compared on their whole content (including their '_ctime').
+    """
+    json_handler = JSONHandler(json_path)
+    jsonl_handler = JSONLHandler(json_handler.path.with_suffix(".jsonl"))
+    records = json_handler.read()
+
+    if not jsonl_handler.path.exists():
+        jsonl_handler._write_file(records)
+        logger.info(f"Migrated {len(records)} records from {json_handler.path} to {jsonl_handler.path}.")
+    else:
+        existing = {_record_key(record) for record in jsonl_handler.iter_records()}
+        missing = [record for record in records if _record_key(record) not in existing]
+        if missing:
+            _prepend_records(jsonl_handler, missing)
+            logger.info(
+                f"Merged {len(missing)} records of {json_handler.path} into the existing {jsonl_handler.path} "
+                f"({len(records) - len(missing)} were already there)."
+            )
+        else:
+            logger.info(f"{json_handler.path} already migrated to {jsonl_handler.path}, skipping.")
+
+    if remove_source:
+        json_handler.path.unlink()
+        logger.debug(f"Removed migrated file {json_handler.path}.")
+    return jsonl_handler.path
+
+def _record_key(record: dict) -> str:
+    """ Return the key identifying a record by its whole content. """
+    return json.dumps(record, sort_keys=True)
+
+def _prepend_records(handler: JSONLHandler, records: list[dict]) -> None:
+    """ Write the records before the existing ones of a JSON Lines file (atomically) and record the write. """
+    handler._validate_data(records)
+    tmp_path = handler.path.with_suffix(handler.path.suffix + ".tmp")
+    rows = len(records)
+    try:
+        with tmp_path.open("w") as f:
+            for item in records:
+                f.write(json.dumps(item) + "\n")
+            for item in handler.iter_records():
+                f.write(json.dumps(item) + "\n")
+                rows += 1
+        os.replace(tmp_path, handler.path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+    handler.meta_manager.record_write(added=len(records), rows=rows)
@@ -16,13 +16,14 @@ class MetadataEntry:
     removed: int = 0
     version: int = 1
     source_versions: dict | None = None
+    rows: int | None = None  # total number of rows in the file after the operation
 
     def __repr__(self):
         """ Return a string representation of the metadata entry. """
         return (
             f"MetadataEntry(timestamp={self.timestamp}, operation={self.operation}, "
             f"added={self.added}, removed={self.removed}, version={self.version}, "
-            f"source_versions={self.source_versions})"
+            f"source_versions={self.source_versions}, rows={self.rows})"
         )
 
     def to_dict(self) -> dict:
@@ -33,7 +34,8 @@ class MetadataEntry:
             "added": self.added,
             "removed": self.removed,
             "version": self.version,
-            "source_versions": self.source_versions
+            "source_versions": self.source_versions,
+            "rows": self.rows
         }
 
     @classmethod
@@ -45,7 +47,8 @@ class MetadataEntry:
             added=d.get("added", 0),
             removed=d.get("removed", 0),
             version=d.get("version", 1),
-            source_versions=d.get("source_versions")
+            source_versions=d.get("source_versions"),
+            rows=d.get("rows")
         )
 
 
@@ -56,7 +59,6 @@ class MetadataManager:
         """ Initialize the MetadataManager """
         self.file_path = Path(file_path)
         self.meta_dir = self.file_path.parent / ".meta"
-        self.meta_dir.mkdir(exist_ok=True)
         self.meta_file = self.meta_dir / f"{self.file_path.stem}.json"
 
     def read(self) -> list[MetadataEntry]:
@@ -82,11 +84,19 @@ class MetadataManager:
                 return entry
         return None
 
+    def read_rows(self) -> int | None:
+        """ Return the row count recorded by the last operation, or None if unknown. """
+        last_meta = self.read_last()
+        if last_meta is None:
+            return None
+        return last_meta.rows
+
     def write(self, meta: MetadataEntry) -> None:
         """ Write metadata to the JSON file. """
         entries = self.read()
         entries.append(meta)
         dict_entries = [e.to_dict() for e in entries]
+        self.meta_dir.mkdir(exist_ok=True)
         with self.meta_file.open('w') as file:
             json.dump(dict_entries, file, indent=4)
 
@@ -101,7 +111,8 @@ class MetadataManager:
         self,
         added: int,
         removed: int = 0,
-        source_versions: dict | None = None
+        source_versions: dict | None = None,
+        rows: int | None = None
     ) -> None:
         """ Record an append operation in the metadata. """
         last_meta = self.read_last()
@@ -113,7 +124,8 @@ class MetadataManager:
             added=added,
             removed=removed,
             version=version,
-            source_versions=source_versions
+            source_versions=source_versions,
+            rows=rows
         )
         self.write(entry)
 
@@ -126,7 +138,8 @@ class MetadataManager:
             operation="read",
             added=0,
             removed=0,
-            version=version
+            version=version,
+            rows=last_meta.rows if last_meta else None
         )
         self.write(entry)
 
@@ -139,7 +152,22 @@ class MetadataManager:
             operation="delete",
             added=0,
             removed=removed,
-            version=version
+            version=version,
+            rows=0
+        )
+        self.write(entry)
+
+    def record_cleanup(self, removed: int, rows: int) -> None:
+        """ Record a cleanup operation in the metadata. """
+        last_meta = self.read_last()
+        version = last_meta.version + 1 if last_meta else 1
+        entry = MetadataEntry(
+            timestamp=self.get_now(),
+            operation="cleanup",
+            added=0,
+            removed=removed,
+            version=version,
+            rows=rows
         )
         self.write(entry)
 
@@ -155,6 +183,7 @@ class MetadataManager:
 # - Removed (optional, int)
 # - Version
 # - Source versions (dict[sourc_model: max_version & version_field])
+# - Rows (total row count after the operation, so the file doesn't need to be re-parsed to get its length)
 
 # When a file is updated using a set of sources, here is what the updated metadata should contain:
 # - Timestamp of the operation (self.now)
@@ -0,0 +1,130 @@
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from . import logger
+from .base_file_handler import BaseFileHandler
+
+
+class ParquetHandler(BaseFileHandler):
+    """ Parquet file handler for reading and writing columnar files with their dtypes preserved. """
+
+    stores_dtypes = True
+
+    def cleanup(self, cutoff: str) -> None:
+        """ Cleanup the Parquet file by removing rows older than the cutoff date (ISO format). """
+        logger.debug(f"Cleaning up Parquet file {self.path} with cutoff date {cutoff}")
+        content = self._read_file()
+        self._validate_data(content)
+        if content.empty:
+            logger.debug(f"Parquet file {self.path} is empty. Nothing to clean up.")
+            return
+        if '_ctime' not in content.columns:
+            logger.error("Parquet file does not contain '_ctime' column for cleanup.")
+            raise ValueError("Parquet file does not contain '_ctime' column for cleanup.")
+        self._check_iso_format(cutoff)
+        filtered_content = content[content['_ctime'] >= cutoff]
+        self._write_file(filtered_content)
+        self.meta_manager.record_cleanup(
+            removed=len(content) - len(filtered_content),
+            rows=len(filtered_content)
+        )
+
+    def _read_file(self) -> pd.DataFrame:
+        """ Read the Parquet file and return its content as a DataFrame. """
+        if not self.path.exists():
+            logger.debug(f"Parquet file {self.path} does not exist. Returning empty DataFrame.")
+            return pd.DataFrame()
+        try:
+            return pd.read_parquet(self.path)
+        except Exception as e:
+            logger.error(f"Failed to read Parquet file {self.path}: {e}")
+            raise e
+
+    def _read_columns(self, columns: list[str]) -> pd.DataFrame:
+        """ Read only the given columns (the ones missing from the file are skipped). """
+        if not self.path.exists():
+            logger.debug(f"Parquet file {self.path} does not exist. Returning empty DataFrame.")
+            return pd.DataFrame()
+        try:
+            available = set(pq.read_schema(self.path).names)
+            return pd.read_parquet(self.path, columns=[col for col in columns if col in available])
+        except Exception as e:
+            logger.error(f"Failed to read columns {columns} from Parquet file {self.path}: {e}")
+            raise e
+
+    def _read_rows(self, positions: np.ndarray) -> pd.DataFrame:
+        """ Read the rows at the given positions, only converting them to pandas. """
+        if not self.path.exists():
+            logger.debug(f"Parquet file {self.path} does not exist. Returning empty DataFrame.")
+            return pd.DataFrame()
+        if len(positions) == 0:
+            return pq.read_schema(self.path).empty_table().to_pandas()  # Only the footer is read
+        return pq.read_table(self.path).take(pa.array(positions)).to_pandas()
+
+    def _replace_rows(self, positions: np.ndarray, data: pd.DataFrame) -> None:
+        """ Replace rows of the Parquet file with Arrow, the kept rows are not converted to pandas. """
+        self._validate_data(data)
+        if len(positions) == 0 and data.empty:
+            return
+        if not self.path.exists():
+            self._write_file(data)
+            return
+        logger.debug(f"Deleting {len(positions)} rows of Parquet file {self.path} and appending {len(data)} rows.")
+        table = pq.read_table(self.path)
+        kept = np.ones(table.num_rows, dtype=bool)
+        kept[positions] = False
+        table = table.filter(pa.array(kept))
+        try:
+            new_rows = pa.Table.from_pandas(data, preserve_index=False)
+            table = pa.concat_tables([table, new_rows], promote_options="permissive")
+        except (pa.ArrowInvalid, pa.ArrowTypeError) as e:
+            logger.warning(f"New rows don't match the schema of Parquet file {self.path} ({e}). Rewriting it with pandas.")
+            self._write_file(pd.concat([table.to_pandas(), data], ignore_index=True))
+            return
+        try:
+            pq.write_table(table, self.path)
+        except Exception as e:
+            logger.error(f"Failed to write Parquet file {self.path}: {e}")
+            raise e
+
+    def _append(self, data: pd.DataFrame) -> None:
+        """ Append data to the Parquet file (the file is rewritten, Parquet can't be appended in place). """
+        logger.debug(f"Appending data to Parquet file: {self.path}")
+        content = self._read_file()
+        if not content.empty and set(content.columns) != set(data.columns):
+            logger.warning("Data columns do not match existing Parquet columns. Appending anyway.")
+        content = pd.concat([content, data], ignore_index=True)
+        self._write_file(content)
+
+    def _overwrite(self, data: pd.DataFrame) -> None:
+        """ Overwrite the Parquet file with new data. """
+        logger.debug(f"Overwriting Parquet file with new data: {self.path}")
+        self._write_file(data)
+
+    def _write_file(self, data: pd.DataFrame) -> None:
+        """ Write the DataFrame to a Parquet file. """
+        self._validate_data(data)
+        try:
+            data.to_parquet(self.path, index=False)
+        except Exception as e:
+            logger.error(f"Failed to write Parquet file {self.path}: {e}")
+            raise e
+
+    def _get_len(self) -> int:
+        """ Return the length of the content from the file footer, without reading the data. """
+        if not self.path.exists():
+            return 0
+        return pq.read_metadata(self.path).num_rows
+
+    def _validate_data(self, data: pd.DataFrame) -> None:
+        """ Check that the data is a pandas DataFrame. """
+        if not isinstance(data, pd.DataFrame):
+            logger.error(f"Data must be a pandas DataFrame. File handler path: {self.path}")
+            raise ValueError(f"Data must be a pandas DataFrame. File handler path: {self.path}")
+
+    def _add_ctime(self, data: pd.DataFrame) -> pd.DataFrame:
+        """ Add a creation time column to the DataFrame. """
+        data['_ctime'] = self._today()
+        return data
@@ -0,0 +1,275 @@
+from __future__ import annotations
+import json
+import shutil
+from pathlib import Path
+from typing import Iterable
+
+import pandas as pd
+
+from . import logger
+from .base_file_handler import BaseFileHandler
+
+PARTITION_KINDS = ("month", "year")
+UNDATED_PARTITION = "undated"  # Rows whose partition field is missing or not a date
+MANIFEST_NAME = "_partitions.json"
+
+
+class PartitionedFileHandler(BaseFileHandler):
+    """
+    Handler of a tabular file split into one file per month (or year) of a date field.
+
+    The partitions of `<dir>/<name>.<ext>` are stored as `<dir>/<name>/<key>.<ext>` (e.g. `matches/2025-03.parquet`)
+    and are read / written with the handler of their extension. The metadata is kept for the whole table, under
+    the path of the unpartitioned file, and for each partition by its handler.
+    """
+
+    def __init__(self, file_path: str | Path, handler_class: type[BaseFileHandler], field: str | None = None, kind: str | None = None):
+        super().__init__(file_path)
+        self.handler_class = handler_class
+        self.directory = self.path.with_suffix("")
+        self.manifest_path = self.directory / MANIFEST_NAME
+        manifest = self._read_manifest()
+        self.field = field or manifest.get("field")
+        self.kind = kind or manifest.get("kind") or "month"
+        if self.kind not in PARTITION_KINDS:
+            logger.error(f"Invalid partition kind '{self.kind}' for {self.path}. Expected one of {PARTITION_KINDS}.")
+            raise ValueError(f"Invalid partition kind '{self.kind}' for {self.path}. Expected one of {PARTITION_KINDS}.")
+
+    def __repr__(self):
+        """ Return a string representation of the file handler. """
+        return f"{self.__class__.__name__}(path={self.path}, field={self.field}, kind={self.kind})"
+
+    @property
+    def stores_dtypes(self) -> bool:
+        """ Whether the partitions are read back with the dtypes they were written with. """
+        return self.handler_class.stores_dtypes
+
+    @staticmethod
+    def is_partitioned(file_path: Path) -> bool:
+        """ Check if a table is stored as partitions (the unpartitioned file takes precedence). """
+        return not file_path.is_file() and (file_path.with_suffix("") / MANIFEST_NAME).is_file()
+
+    # Partitions
+
+    def partition_keys(self) -> list[str]:
+        """ Return the sorted keys of the existing partitions. """
+        if not self.directory.exists():
+            return []
+        return sorted(path.stem for path in self.directory.glob(f"*{self.path.suffix}") if path.name != MANIFEST_NAME)
+
+    def partition_path(self, key: str) -> Path:
+        """ Return the path of the file of a partition. """
+        return self.directory / f"{key}{self.path.suffix}"
+
+    def partition_handler(self, key: str) -> BaseFileHandler:
+        """ Return the handler of the file of a partition. """
+        return self.handler_class(self.partition_path(key))
+
+    def select_partitions(self, date_from: str | None = None, date_to: str | None = None) -> list[str]:
+        """ Return the keys of the partitions which may contain rows in the date range (undated rows are always kept). """
+        return [
+            key for key in self.partition_keys()
+            if key == UNDATED_PARTITION or (
+                (date_from is None or key >= str(date_from)[:len(key)])
+                and (date_to is None or key <= str(date_to)[:len(key)])
+            )
+        ]
+
+    def get_partition_keys(self, data: pd.DataFrame) -> pd.Series:
+        """ Return the partition key of each row of the data. """
+        if self.field is None:
+            logger.error(f"No partition field defined for {self.path}.")
+            raise ValueError(f"No partition field defined for {self.path}.")
+        if self.field not in data.columns:
+            logger.error(f"Partition field '{self.field}' not found in the data written to {self.path}.")
+            raise ValueError(f"Partition field '{self.field}' not found in the data written to {self.path}.")
+        dates = pd.to_datetime(data[self.field], errors="coerce", utc=True)
+        if self.kind == "month":
+            codes = dates.dt.year * 100 + dates.dt.month
+            labels = {code: f"{int(code) // 100:04d}-{int(code) % 100:02d}" for code in codes.dropna().unique()}
+        else:
+            codes = dates.dt.year
+            labels = {code: f"{int(code):04d}" for code in codes.dropna().unique()}
+        return codes.map(labels).fillna(UNDATED_PARTITION).astype(str)
+
+    def split(self, data: pd.DataFrame) -> dict[str, pd.DataFrame]:
+        """ Split the data by partition key. """
+        if data.empty:
+            return {}
+        keys = self.get_partition_keys(data).to_numpy()
+        return {key: data.iloc[positions].copy() for key, positions in pd.Series(keys).groupby(keys, sort=True).indices.items()}
+
+    def read_partitions(self, keys: Iterable[str], columns: list[str] | None = None) -> pd.DataFrame:
+        """ Read and concatenate the given partitions (missing ones are skipped). """
+        frames = []
+        for key in keys:
+            if self.partition_path(key).exists():
+                frames.append(self.partition_handler(key).read(columns=columns))
+        frames = [frame for frame in frames if not frame.empty]
+        if not frames:
+            return pd.DataFrame()
+        return pd.concat(frames, ignore_index=True)
+
+    def write_partitions(self, data: pd.DataFrame, keys: Iterable[str], source_versions: dict | None = None) -> dict[str, pd.DataFrame]:
+        """
+        Replace the given partitions with the rows of the data (which must only belong to these partitions) and
+        return the content written to each of them. The partitions left without rows are deleted.
+        """
+        self._validate_data(data)
+        self.migrate()
+        keys = set(keys)
+        data = self._add_ctime(data)
+        parts = self.split(data)
+        unexpected = set(parts) - keys
+        if unexpected:
+            logger.error(f"Data written to {self.path} contains rows of partitions {sorted(unexpected)} which are not replaced.")
+            raise ValueError(f"Data written to {self.path} contains rows of partitions {sorted(unexpected)} which are not replaced.")
+
+        existing = self.__len__()
+        removed = sum(len(self.partition_handler(key)) for key in keys if self.partition_path(key).exists())
+        for key in sorted(keys):
+            if key in parts:
+                logger.debug(f"Writing {len(parts[key])} rows to partition {key} of {self.path}.")
+                self.partition_handler(key).write(parts[key], source_versions=source_versions, overwrite=True)
+            else:
+                self._delete_partition(key)
+        self.meta_manager.record_write(
+            added=len(data),
+            removed=removed,
+            source_versions=source_versions or {},
+            rows=existing - removed + len(data)
+        )
+        logger.info(f"Data written to {len(keys)} partitions of {self.path} successfully.")
+        return parts
+
+    # BaseFileHandler
+
+    def exists(self) -> bool:
+        """ Return whether the table has partitions (or an unpartitioned file not migrated yet). """
+        return self.path.is_file() or bool(self.partition_keys())
+
+    def delete(self, force: bool = False) -> None:
+        """ Delete every partition of the table. """
+        removed = self.__len__()
+        if self.directory.exists() or self.path.is_file():
+            if force or self._confirm_delete():
+                shutil.rmtree(self.directory, ignore_errors=True)
+                self.path.unlink(missing_ok=True)
+                logger.info(f"Partitions of {self.path} deleted successfully.")
+            else:
+                logger.info(f"Deletion of the partitions of {self.path} was cancelled.")
+        else:
+            logger.warning(f"No partitions found for {self.path}, nothing to delete.")
+        self.meta_manager.record_delete(removed=removed)
+
+    def cleanup(self, cutoff: str) -> None:
+        """ Cleanup the partitions by removing rows older than the cutoff date (ISO format). """
+        logger.debug(f"Cleaning up partitions of {self.path} with cutoff date {cutoff}")
+        self._check_iso_format(cutoff)
+        removed = 0
+        for key in self.partition_keys():
+            handler = self.partition_handler(key)
+            content = handler.read()
+            if content.empty:
+                continue
+            if '_ctime' not in content.columns:
+                logger.error(f"Partition {key} of {self.path} does not contain '_ctime' column for cleanup.")
+                raise ValueError(f"Partition {key} of {self.path} does not contain '_ctime' column for cleanup.")
+            filtered_content = content[content['_ctime'] >= cutoff]
+            if len(filtered_content) < len(content):
+                removed += len(content) - len(filtered_content)
+                handler._overwrite(filtered_content)
+                handler.meta_manager.record_cleanup(removed=len(content) - len(filtered_content), rows=len(filtered_content))
+        self.meta_manager.record_cleanup(removed=removed, rows=self._get_len())
+
+    def _read_file(self) -> pd.DataFrame:
+        """ Read every partition (and the unpartitioned file not migrated yet). """
+        frames = [self._read_unpartitioned(), self.read_partitions(self.partition_keys())]
+        frames = [frame for frame in frames if not frame.empty]
+        return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+    def _read_columns(self, columns: list[str]) -> pd.DataFrame:
+        """ Read only the given columns of every partition. """
+        frames = [self._read_unpartitioned(columns), self.read_partitions(self.partition_keys(), columns=columns)]
+        frames = [frame for frame in frames if not frame.empty]
+        return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+    def _append(self, data: pd.DataFrame) -> None:
+        """ Append the rows of the data to their partitions. """
+        self._validate_data(data)
+        self.migrate()
+        for key, part in self.split(data).items():
+            logger.debug(f"Appending {len(part)} rows to partition {key} of {self.path}.")
+            self.partition_handler(key).write(part)
+
+    def _overwrite(self, data: pd.DataFrame) -> None:
+        """ Replace every partition with the rows of the data. """
+        self._write_file(data)
+
+    def _write_file(self, data: pd.DataFrame) -> None:
+        """ Write the data as partitions, deleting the previous ones. """
+        self._validate_data(data)
+        self._write_manifest()
+        self.path.unlink(missing_ok=True)
+        parts = self.split(data)
+        for key in self.partition_keys():
+            if key not in parts:
+                self._delete_partition(key)
+        for key, part in parts.items():
+            self.partition_handler(key).write(part, overwrite=True)
+
+    def _get_len(self) -> int:
+        """ Return the number of rows of all the partitions. """
+        unpartitioned = self.handler_class(self.path)._get_len() if self.path.is_file() else 0
+        return sum(len(self.partition_handler(key)) for key in self.partition_keys()) + unpartitioned
+
+    def _validate_data(self, data: pd.DataFrame) -> None:
+        """ Check that the data is a pandas DataFrame. """
+        if not isinstance(data, pd.DataFrame):
+            logger.error(f"Data must be a pandas DataFrame. File handler path: {self.path}")
+            raise ValueError(f"Data must be a pandas DataFrame. File handler path: {self.path}")
+
+    def _add_ctime(self, data: pd.DataFrame) -> pd.DataFrame:
+        """ Add a creation time column to the DataFrame. """
+        data['_ctime'] = self._today()
+        return data
+
+    # Layout
+
+    def migrate(self) -> None:
+        """ Split the unpartitioned file of the table (written before it was partitioned) into partitions. """
+        self._write_manifest()
+        if not self.path.is_file():
+            return
+        logger.info(f"Migrating {self.path} to partitions by {self.kind} of '{self.field}'.")
+        content = self._read_unpartitioned()
+        for key, part in self.split(content).items():
+            # The rows keep their creation time, so the partitions are appended to without going through write()
+            handler = self.partition_handler(key)
+            existing = len(handler)
+            handler._append(part)
+            handler.meta_manager.record_write(added=len(part), rows=existing + len(part))
+        self.path.unlink()
+
+    def _delete_partition(self, key: str) -> None:
+        """ Delete the file of a partition left without rows. """
+        if self.partition_path(key).exists():
+            logger.debug(f"Deleting empty partition {key} of {self.path}.")
+            self.partition_handler(key).delete(force=True)
+
+    def _read_unpartitioned(self, columns: list[str] | None = None) -> pd.DataFrame:
+        """ Read the unpartitioned file of the table, if it still exists. """
+        if not self.path.is_file():
+            return pd.DataFrame()
+        return self.handler_class(self.path).read(columns=columns)
+
+    def _read_manifest(self) -> dict:
+        """ Read the partitioning of the table (field and kind) from its manifest. """
+        if not self.manifest_path.exists():
+            return {}
+        return json.loads(self.manifest_path.read_text())
+
+    def _write_manifest(self) -> None:
+        """ Write the partitioning of the table, so that readers find the partitions. """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.manifest_path.write_text(json.dumps({"field": self.field, "kind": self.kind}))
@@ -0,0 +1,319 @@
+from __future__ import annotations
+import json
+from itertools import chain
+from pathlib import Path
+from typing import Iterable
+
+import numpy as np
+import pandas as pd
+
+from . import logger
+
+INDEX_KINDS = ("hash", "month")
+
+
+class TableIndex:
+    """
+    Secondary indexes of a tabular file, stored next to it under `.index/<stem>.json`.
+
+    Each indexed column maps its values (or the month of its dates for a 'month' index) to the row offsets
+    in the file. A key index ('unique') stores the key of every row of a set of fields, in file order, so that
+    the rows sharing a key with new data can be found without reading the file. The index records the size and
+    mtime of the file it was built for, and is ignored once the file changed.
+    """
+
+    def __init__(self, file_path: Path | str, indexes: dict[str, dict] | None = None, file_stat: dict | None = None):
+        self.file_path = Path(file_path)
+        self.indexes = indexes or {}  # name -> {"kind": ..., "entries": {key: [offsets]}} or {"kind": "unique", "fields": [...], "keys": [...]}
+        self.file_stat = file_stat
+
+    def __contains__(self, column: str) -> bool:
+        return column in self.indexes
+
+    def __repr__(self) -> str:
+        return f"TableIndex(path={self.file_path}, columns={list(self.indexes)})"
+
+    @staticmethod
+    def index_path(file_path: Path | str) -> Path:
+        """ Return the path of the index file of a data file. """
+        file_path = Path(file_path)
+        return file_path.parent / ".index" / f"{file_path.stem}.json"
+
+    @staticmethod
+    def key_name(fields: list[str]) -> str:
+        """ Return the name of the key index of a set of fields. """
+        return "key:" + ",".join(fields)
+
+    @classmethod
+    def build(cls, file_path: Path | str, df: pd.DataFrame, columns: dict[str, str], keys: list[list[str]] | None = None) -> TableIndex:
+        """
+        Build the indexes of the columns (column -> kind) of a DataFrame, offsets being row positions, and the
+        key indexes of the field sets.
+        """
+        indexes = {}
+        for column, kind in columns.items():
+            if kind not in INDEX_KINDS:
+                logger.error(f"Invalid index kind '{kind}' for column '{column}'. Expected one of {INDEX_KINDS}.")
+                raise ValueError(f"Invalid index kind '{kind}' for column '{column}'. Expected one of {INDEX_KINDS}.")
+            if column not in df.columns:
+                logger.warning(f"Column '{column}' not found in {file_path}, skipping its index.")
+                continue
+            indexes[column] = {"kind": kind, "entries": cls._build_entries(df[column], kind)}
+        for fields in keys or []:
+            indexes[cls.key_name(fields)] = {"kind": "unique", "fields": list(fields), "keys": make_keys(df, fields).tolist()}
+        return cls(file_path, indexes)
+
+    @staticmethod
+    def _build_entries(values: pd.Series, kind: str, start: int = 0) -> dict[str, list[int]]:
+        """ Map the keys of the values to their row positions (shifted by start). """
+        if kind == "month":
+            dates = pd.to_datetime(values, errors="coerce", utc=True)
+            values = dates.dt.year * 100 + dates.dt.month  # Grouped as integers, formatted once per month
+        entries: dict[str, list[int]] = {}
+        for value, positions in values.groupby(values, sort=False, observed=True).indices.items():  # Missing values are not indexed
+            key = make_key(value) if kind == "hash" else f"{int(value) // 100:04d}-{int(value) % 100:02d}"
+            if key is not None:
+                entries.setdefault(key, []).extend((positions + start).tolist())
+        return {key: sorted(offsets) for key, offsets in entries.items()}
+
+    @classmethod
+    def load(cls, file_path: Path | str) -> TableIndex | None:
+        """ Load the index of a file, or return None if it doesn't exist or is stale. """
+        file_path = Path(file_path)
+        index_path = cls.index_path(file_path)
+        if not index_path.exists() or not file_path.exists():
+            return None
+        try:
+            content = json.loads(index_path.read_text())
+        except Exception as e:
+            logger.warning(f"Ignoring corrupted index file {index_path}: {e}")
+            return None
+        index = cls(file_path, content.get("indexes"), content.get("file"))
+        if index.file_stat != cls._stat(file_path):
+            logger.debug(f"Index file {index_path} is stale, ignoring it.")
+            return None
+        return index
+
+    def write(self) -> None:
+        """ Write the index for the current version of the data file. """
+        index_path = self.index_path(self.file_path)
+        index_path.parent.mkdir(parents=True, exist_ok=True)
+        self.file_stat = self._stat(self.file_path)
+        tmp_path = index_path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps({"file": self.file_stat, "indexes": self.indexes}))
+        tmp_path.replace(index_path)
+        logger.debug(f"Index of {self.file_path} written to {index_path} (columns: {list(self.indexes)}).")
+
+    @classmethod
+    def delete(cls, file_path: Path | str) -> None:
+        """ Delete the index file of a data file. """
+        cls.index_path(file_path).unlink(missing_ok=True)
+
+    def lookup(self, column: str, values: Iterable) -> np.ndarray:
+        """ Return the sorted offsets of the rows whose column value is one of the values ('hash' index). """
+        entries = self.indexes[column]["entries"]
+        keys = {make_key(value) for value in values}
+        return self._merge(entries.get(key, []) for key in keys if key is not None)
+
+    def lookup_keys(self, fields: list[str], data: pd.DataFrame) -> np.ndarray:
+        """ Return the sorted offsets of the rows sharing their key on the fields with a row of the data ('unique' index). """
+        keys = np.asarray(self.indexes[self.key_name(fields)]["keys"], dtype=object)
+        return np.flatnonzero(pd.Index(keys).isin(make_keys(data, fields)))
+
+    def update(self, removed: np.ndarray, appended: pd.DataFrame, start: int) -> None:
+        """
+        Update the indexes after the rows at the removed offsets were deleted from the file (the next rows moving
+        up) and the appended rows were written at its end, from offset start.
+        """
+        removed = np.unique(np.asarray(removed, dtype=np.intp))
+        for name, index in self.indexes.items():
+            if index["kind"] == "unique":
+                keys = np.delete(np.asarray(index["keys"], dtype=object), removed)
+                index["keys"] = keys.tolist() + make_keys(appended, index["fields"]).tolist()
+                continue
+            entries = self._shift_entries(index["entries"], removed)
+            if name not in appended.columns:
+                logger.warning(f"Column '{name}' not found in the rows appended to {self.file_path}, they are not indexed.")
+            else:
+                for key, offsets in self._build_entries(appended[name].reset_index(drop=True), index["kind"], start).items():
+                    entries[key] = entries.get(key, []) + offsets  # Appended offsets come after the existing ones
+            index["entries"] = entries
+
+    @staticmethod
+    def _shift_entries(entries: dict[str, list[int]], removed: np.ndarray) -> dict[str, list[int]]:
+        """ Drop the removed offsets from the entries and move the next ones up. """
+        if len(removed) == 0:
+            return entries
+        keys = list(entries)
+        lengths = np.fromiter((len(offsets) for offsets in entries.values()), dtype=np.intp, count=len(keys))
+        offsets = np.fromiter(chain.from_iterable(entries.values()), dtype=np.intp, count=int(lengths.sum()))
+        owners = np.repeat(np.arange(len(keys)), lengths)
+        kept = ~np.isin(offsets, removed)
+        offsets, owners = offsets[kept], owners[kept]
+        offsets = (offsets - np.searchsorted(removed, offsets)).tolist()
+        bounds = np.cumsum(np.bincount(owners, minlength=len(keys))).tolist()
+        return {
+            key: offsets[begin:end]
+            for key, begin, end in zip(keys, [0] + bounds[:-1], bounds)
+            if end > begin
+        }
+
+    def lookup_range(self, column: str, date_from: str | None = None, date_to: str | None = None) -> np.ndarray:
+        """
+        Return the sorted offsets of the rows which may be in the date range ('month' index). Whole months
+        are returned, so the rows still have to be filtered on the exact bounds.
+        """
+        entries = self.indexes[column]["entries"]
+        month_from = str(date_from)[:7] if date_from is not None else None
+        month_to = str(date_to)[:7] if date_to is not None else None
+        return self._merge(
+            offsets for month, offsets in entries.items()
+            if (month_from is None or month >= month_from) and (month_to is None or month <= month_to)
+        )
+
+    @staticmethod
+    def _merge(offset_lists: Iterable[list[int]]) -> np.ndarray:
+        offset_lists = [np.asarray(offsets, dtype=np.intp) for offsets in offset_lists]
+        if not offset_lists:
+            return np.array([], dtype=np.intp)
+        return np.unique(np.concatenate(offset_lists))
+
+    @staticmethod
+    def _stat(file_path: Path) -> dict:
+        stat = file_path.stat()
+        return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+class CombinedTableIndex:
+    """
+    Read-only index of consecutive parts of a table (e.g. partitions loaded together for a query), the offsets of
+    each part are shifted by the rows before it. Key lookups and updates are done on the index of each file.
+    """
+
+    def __init__(self, indexes: list[TableIndex], lengths: list[int]):
+        self.parts = list(zip(indexes, np.cumsum([0] + list(lengths[:-1])).tolist()))
+
+    def __contains__(self, column: str) -> bool:
+        return bool(self.parts) and all(column in index for index, _ in self.parts)
+
+    def __repr__(self) -> str:
+        return f"CombinedTableIndex(parts={[str(index.file_path) for index, _ in self.parts]})"
+
+    def lookup(self, column: str, values: Iterable) -> np.ndarray:
+        """ Return the sorted offsets of the rows whose column value is one of the values ('hash' index). """
+        values = list(values)
+        return np.concatenate([index.lookup(column, values) + offset for index, offset in self.parts] or [np.array([], dtype=np.intp)])
+
+    def lookup_range(self, column: str, date_from: str | None = None, date_to: str | None = None) -> np.ndarray:
+        """ Return the sorted offsets of the rows which may be in the date range ('month' index). """
+        return np.concatenate([index.lookup_range(column, date_from, date_to) + offset for index, offset in self.parts] or [np.array([], dtype=np.intp)])
+
+
+class PartitionKeyIndex:
+    """
+    Partition of each unique key of a partitioned table (for each unique field set), stored in its directory under
+    `.index/_keys.json`, so that the partitions holding previous versions of new rows are found without reading the
+    other partitions. The index records the metadata version of the table it was written for, and is ignored once
+    the table changed by another path (e.g. cleanup).
+    """
+
+    file_name = "_keys.json"
+
+    def __init__(self, directory: Path | str, entries: dict[str, dict] | None = None, version: int | None = None):
+        self.directory = Path(directory)
+        self.entries = entries or {}  # key name -> {"fields": [...], "partitions": {row key: partition}}
+        self.version = version
+
+    def __repr__(self) -> str:
+        return f"PartitionKeyIndex(directory={self.directory}, keys={list(self.entries)})"
+
+    @classmethod
+    def index_path(cls, directory: Path | str) -> Path:
+        """ Return the path of the key index of a partitioned table. """
+        return Path(directory) / ".index" / cls.file_name
+
+    @classmethod
+    def build(cls, directory: Path | str, partitions: Iterable[tuple[str, pd.DataFrame]], keys: list[list[str]]) -> PartitionKeyIndex:
+        """ Build the index from the key columns of every partition ((partition, DataFrame) pairs). """
+        index = cls(directory, {TableIndex.key_name(fields): {"fields": list(fields), "partitions": {}} for fields in keys})
+        for partition, df in partitions:
+            index._add(partition, df)
+        return index
+
+    @classmethod
+    def load(cls, directory: Path | str, version: int | None) -> PartitionKeyIndex | None:
+        """ Load the index of a table, or return None if it doesn't exist or was written for another version of the table. """
+        index_path = cls.index_path(directory)
+        if not index_path.exists():
+            return None
+        try:
+            content = json.loads(index_path.read_text())
+        except Exception as e:
+            logger.warning(f"Ignoring corrupted key index file {index_path}: {e}")
+            return None
+        if content.get("version") is None or content.get("version") != version:
+            logger.debug(f"Key index file {index_path} is stale, ignoring it.")
+            return None
+        return cls(directory, content.get("entries"), content.get("version"))
+
+    def write(self, version: int | None) -> None:
+        """ Write the index for the given metadata version of the table. """
+        index_path = self.index_path(self.directory)
+        index_path.parent.mkdir(parents=True, exist_ok=True)
+        self.version = version
+        tmp_path = index_path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps({"version": self.version, "entries": self.entries}))
+        tmp_path.replace(index_path)
+        logger.debug(f"Key index of {self.directory} written to {index_path} (keys: {list(self.entries)}).")
+
+    def covers(self, keys: list[list[str]]) -> bool:
+        """ Check if the index holds the given unique field sets. """
+        return all(TableIndex.key_name(fields) in self.entries for fields in keys)
+
+    def lookup(self, data: pd.DataFrame) -> set[str]:
+        """ Return the partitions holding rows which share a unique key with a row of the data. """
+        partitions = set()
+        for entry in self.entries.values():
+            known = entry["partitions"]
+            partitions.update(known[key] for key in set(make_keys(data, entry["fields"]).tolist()) if key in known)
+        return partitions
+
+    def update(self, parts: dict[str, pd.DataFrame], rewritten: Iterable[str]) -> None:
+        """ Update the index after the rewritten partitions were replaced by the parts (partition -> rows written). """
+        rewritten = set(rewritten)
+        for entry in self.entries.values():
+            entry["partitions"] = {key: partition for key, partition in entry["partitions"].items() if partition not in rewritten}
+        for partition, df in parts.items():
+            self._add(partition, df)
+
+    def _add(self, partition: str, df: pd.DataFrame) -> None:
+        """ Map the keys of the rows of a partition to it. """
+        if df.empty:
+            return
+        for entry in self.entries.values():
+            entry["partitions"].update(dict.fromkeys(make_keys(df, entry["fields"]).tolist(), partition))
+
+
+def make_key(value) -> str | None:
+    """ Return the key of a value in a 'hash' index (integral floats and ints share the same key). """
+    if value is None or value is pd.NA or (isinstance(value, float) and np.isnan(value)):
+        return None
+    if isinstance(value, (float, np.floating)) and float(value).is_integer():
+        return str(int(value))
+    if isinstance(value, (int, np.integer)):
+        return str(int(value))
+    return str(value)
+
+def make_keys(df: pd.DataFrame, fields: list[str]) -> np.ndarray:
+    """ Return the key of each row of the DataFrame on the fields (the keys of its values, joined). """
+    missing = [field for field in fields if field not in df.columns]
+    if missing:
+        logger.error(f"Key fields {missing} not found in the data.")
+        raise ValueError(f"Key fields {missing} not found in the data.")
+    keys = None
+    for field in fields:
+        codes, uniques = pd.factorize(df[field], use_na_sentinel=False)
+        labels = np.array([make_key(value) or "" for value in uniques], dtype=object)  # Converted once per value
+        field_keys = pd.Series(labels[codes], dtype=object)
+        keys = field_keys if keys is None else keys + "\x1f" + field_keys
+    return keys.to_numpy(dtype=object) if keys is not None else np.array([], dtype=object)
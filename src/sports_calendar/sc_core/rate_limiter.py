@@ -0,0 +1,45 @@
+import time
+import threading
+
+from . import logger
+
+
+class TokenBucket:
+    """ Thread-safe token bucket allowing `rate_per_minute` requests per minute with bursts of up to `burst` requests. """
+
+    def __init__(self, rate_per_minute: float, burst: int = 1):
+        if rate_per_minute <= 0 or burst < 1:
+            logger.error(f"Invalid token bucket settings: rate_per_minute={rate_per_minute}, burst={burst}.")
+            raise ValueError(f"Invalid token bucket settings: rate_per_minute={rate_per_minute}, burst={burst}.")
+        self.rate = rate_per_minute / 60
+        self.capacity = burst
+        self.tokens = float(burst)
+        self.updated_at = time.monotonic()
+        self.blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: int = 1) -> float:
+        """ Take `tokens` tokens (at most `burst`), waiting until they are available. Return the time waited in seconds. """
+        tokens = min(tokens, self.capacity)
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if now >= self.blocked_until and self.tokens >= tokens:
+                    self.tokens -= tokens
+                    return waited
+                wait = max(self.blocked_until - now, (tokens - self.tokens) / self.rate)
+            time.sleep(wait)
+            waited += wait
+
+    def pause(self, seconds: float) -> None:
+        """ Block every caller for `seconds` (e.g. when the provider reports that the quota is exhausted). """
+        with self._lock:
+            self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+            self.tokens = 0.0
+
+    def _refill(self, now: float) -> None:
+        """ Add the tokens accumulated since the last update. """
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
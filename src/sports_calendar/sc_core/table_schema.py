@@ -0,0 +1,97 @@
+from __future__ import annotations
+from typing import Iterable
+
+import pandas as pd
+
+from . import logger
+
+
+class TableSchema:
+    """
+    Column types of a table (the types of the validate_db column specs), used to keep DataFrames in stable dtypes
+    instead of round trips through str: 'int' -> Int64, 'float' -> float64, 'bool' -> boolean, 'str' -> category.
+    """
+
+    TYPES = ("int", "float", "bool", "str")
+    UNTYPED = ("datetime",)  # Kept as ISO strings: the calendar builds the identity of its events from them
+    _BOOLS = {"true": True, "false": False, "1": True, "0": False, "1.0": True, "0.0": False}
+
+    def __init__(self, columns: dict[str, str]):
+        invalid = {column: type_ for column, type_ in columns.items() if type_ not in self.TYPES}
+        if invalid:
+            logger.error(f"Invalid column types {invalid}. Expected one of {self.TYPES}.")
+            raise ValueError(f"Invalid column types {invalid}. Expected one of {self.TYPES}.")
+        self.columns = dict(columns)
+
+    def __contains__(self, column: str) -> bool:
+        return column in self.columns
+
+    def __bool__(self) -> bool:
+        return bool(self.columns)
+
+    def __repr__(self) -> str:
+        return f"TableSchema({self.columns})"
+
+    @classmethod
+    def from_columns(cls, columns: Iterable) -> TableSchema:
+        """ Build the schema of column specs (with a name and a type), skipping the untyped and datetime ones. """
+        return cls({
+            column.name: column.type
+            for column in columns
+            if column.type is not None and column.type not in cls.UNTYPED
+        })
+
+    def matches(self, df: pd.DataFrame) -> bool:
+        """ Check if the typed columns of the DataFrame already have their dtype. """
+        return all(self._has_dtype(df[column], type_) for column, type_ in self.columns.items() if column in df.columns)
+
+    def apply(self, df: pd.DataFrame) -> pd.DataFrame:
+        """ Return the DataFrame with its typed columns cast to their dtype (the others and the input are left unchanged). """
+        to_cast = [
+            column for column, type_ in self.columns.items()
+            if column in df.columns and not self._has_dtype(df[column], type_)
+        ]
+        if not to_cast:
+            return df
+        df = df.copy(deep=False)
+        for column in to_cast:
+            df[column] = self._cast(df[column], self.columns[column])
+        return df
+
+    def _cast(self, series: pd.Series, type_: str) -> pd.Series:
+        """ Cast a column to the dtype of its type, invalid values becoming missing. """
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            series = series.astype(object)
+        if type_ == "str":
+            values = series.astype(object)
+            present = values.notna()
+            values[present] = values[present].astype(str)
+            return values.astype("category")
+        if type_ == "bool":
+            if pd.api.types.is_bool_dtype(series.dtype):
+                return series.astype("boolean")
+            cast = series.astype(str).str.lower().map(self._BOOLS).astype("boolean")
+        else:
+            cast = pd.to_numeric(series, errors="coerce")
+            try:
+                cast = cast.astype("Int64") if type_ == "int" else cast.astype("float64")
+            except (TypeError, ValueError) as e:
+                logger.error(f"Failed to cast column '{series.name}' to {type_}: {e}")
+                raise ValueError(f"Failed to cast column '{series.name}' to {type_}: {e}")
+        invalid = int((cast.isna() & series.notna() & ~series.isin(["nan", "None", ""])).sum())
+        if invalid:
+            logger.warning(f"{invalid} values of column '{series.name}' are not valid {type_} values, they are set to missing.")
+        return cast
+
+    @staticmethod
+    def _has_dtype(series: pd.Series, type_: str) -> bool:
+        """ Check if a column already has the dtype of its type. """
+        if type_ == "int":
+            return series.dtype == "Int64"
+        if type_ == "float":
+            return series.dtype == "float64"
+        if type_ == "bool":
+            return series.dtype == "boolean"
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            return series.cat.categories.dtype == object
+        return series.dtype == object and bool(series.isna().all())  # An all-missing category is read back as object
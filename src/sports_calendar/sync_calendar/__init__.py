@@ -1,4 +1,4 @@
 import logging
 logger = logging.getLogger(__name__)
 
-from .cli import sync_calendar, clear_cal
\ No newline at end of file
+from .cli import sync_calendar, clear_cal, export_cal
\ No newline at end of file
@@ -2,4 +2,4 @@ import logging
 logger = logging.getLogger(__name__)
 
 from .sports_calendar import SportsCalendar
-from .google_calendar import GoogleCalendarManager
\ No newline at end of file
+from .google_calendar import GoogleCalendarManager, CalendarState
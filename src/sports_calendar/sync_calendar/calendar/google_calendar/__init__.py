@@ -1,2 +1,3 @@
 from .. import logger
-from .manager import GoogleCalendarManager
\ No newline at end of file
+from .manager import GoogleCalendarManager
+from .state import CalendarState
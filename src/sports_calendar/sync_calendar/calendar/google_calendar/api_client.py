@@ -1,23 +1,38 @@
 import time
+from typing import Callable
 from datetime import datetime
 from icalendar import Event
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
+from googleapiclient.http import HttpRequest
 
 from . import logger
 from .auth import GoogleAuthManager
 from .console import TemporaryConsolePrinter
+from .diff import IDENTITY_KEY_PROPERTY
+from sports_calendar.sc_core import TokenBucket
 
 
 printer = TemporaryConsolePrinter()
 
+BATCH_SIZE = 50  # Maximum number of operations per batch request recommended by the Calendar API
+
+class BatchRequestError(RuntimeError):
+    """ Raised when operations of batch requests failed, with the responses of the successful ones and the errors of the others. """
+
+    def __init__(self, message: str, responses: dict[str, dict], failed: dict[str, Exception]):
+        super().__init__(message)
+        self.responses = responses
+        self.failed = failed
+
 class GoogleCalendarAPI:
     """ TODO """
 
-    def __init__(self, auth_manager: GoogleAuthManager, calendar_id: str):
+    def __init__(self, auth_manager: GoogleAuthManager, calendar_id: str, budget: TokenBucket | None = None):
         """ TODO """
         self.auth_manager = auth_manager
         self.calendar_id = calendar_id
+        self.budget = budget  # API budget shared by the calendars of the same account (None = unlimited)
         self.service = build('calendar', 'v3', credentials=self.auth_manager.credentials)
 
         self._validate_cal_id()
@@ -25,6 +40,7 @@ class GoogleCalendarAPI:
     def _validate_cal_id(self) -> None:
         """ TODO """
         try:
+            self._throttle()
             self.service.calendars().get(calendarId=self.calendar_id).execute()
         except Exception as e:
             logger.error(f"Invalid calendar ID: {e}")
@@ -52,6 +68,7 @@ class GoogleCalendarAPI:
             while True:
                 if page_token:
                     params['pageToken'] = page_token
+                self._throttle()
                 events_result = self.service.events().list(**params).execute()
                 items = events_result.get('items', [])
                 all_events.extend(items)
@@ -65,6 +82,29 @@ class GoogleCalendarAPI:
             logger.exception(f"Unexpected error fetching events.")
             raise
 
+    def fetch_changes(self, sync_token: str | None = None) -> tuple[list[dict], str | None]:
+        """
+        Fetch the events changed since the sync token (all the events if there is none) and the next sync token.
+        Deleted events are returned with the status 'cancelled'. An expired sync token raises an HttpError (410).
+        """
+        params = {
+            'calendarId': self.calendar_id,
+            'singleEvents': True,
+            'maxResults': 2500
+        }
+        if sync_token:
+            params['syncToken'] = sync_token
+
+        all_events = []
+        while True:
+            self._throttle()
+            events_result = self.service.events().list(**params).execute()
+            all_events.extend(events_result.get('items', []))
+            page_token = events_result.get('nextPageToken')
+            if not page_token:
+                return all_events, events_result.get('nextSyncToken')
+            params['pageToken'] = page_token
+
     # Add events
 
     def add_events(
@@ -72,53 +112,59 @@ class GoogleCalendarAPI:
         events: list[Event],
         date_from: str | None = None,
         date_to: str | None = None,
-        verbose: bool = False
+        verbose: bool = False,
+        batch: bool = True
     ) -> None:
-        """ Add multiple events to Google Calendar """
-        date_from = datetime.fromisoformat(date_from).date() if date_from else None
-        date_to = datetime.fromisoformat(date_to).date() if date_to else None
-
+        """ Add multiple events to Google Calendar (in batch requests by default) """
         N_events = len(events)
-        for i, event in enumerate(events):
-            logger.debug(f"Adding event {i + 1}/{N_events}: {event.get('summary')}")
-            if verbose:
-                printer.print(f"Adding event {i + 1}/{N_events}: {event.get('summary')}")
-            if date_from and event.get('dtstart').dt.date() < date_from:
-                continue
-            if date_to and event.get('dtend').dt.date() > date_to:
-                continue
-            self.add_event(event)
+        events = self.filter_events(events, date_from=date_from, date_to=date_to)
+        if batch:
+            self.add_events_batch(events, verbose=verbose)
+        else:
+            for i, event in enumerate(events):
+                logger.debug(f"Adding event {i + 1}/{len(events)}: {event.get('summary')}")
+                if verbose:
+                    printer.print(f"Adding event {i + 1}/{len(events)}: {event.get('summary')}")
+                self.add_event(event)
         if verbose:
             printer.clear()
-        logger.info(f"Added {N_events} events to Google Calendar.")
+        logger.info(f"Added {len(events)} events to Google Calendar ({N_events - len(events)} out of the date range).")
+
+    @staticmethod
+    def filter_events(events: list[Event], date_from: str | None = None, date_to: str | None = None) -> list[Event]:
+        """ Keep the events starting from date_from and ending until date_to (ISO dates) """
+        date_from = datetime.fromisoformat(date_from).date() if date_from else None
+        date_to = datetime.fromisoformat(date_to).date() if date_to else None
+        return [
+            event for event in events
+            if not (date_from and event.get('dtstart').dt.date() < date_from)
+            and not (date_to and event.get('dtend').dt.date() > date_to)
+        ]
+
+    def add_events_batch(self, events: list[Event], verbose: bool = False) -> list[dict]:
+        """ Add events to Google Calendar with batch requests of up to BATCH_SIZE insertions and return the created events """
+        requests = {
+            str(i): (lambda body=self.event_body(event): self.service.events().insert(calendarId=self.calendar_id, body=body))
+            for i, event in enumerate(events)
+        }
+        return list(self._execute_batches(requests, action="Adding", verbose=verbose).values())
 
     def add_event(self, event: Event) -> None:
         """ Add an event to Google Calendar """
-        event_body = {
-            'summary': event.get('summary'),
-            'description': event.get('description'),
-            'start': {
-                'dateTime': event.get('dtstart').dt.isoformat(timespec="seconds"),
-                'timeZone': event.get('dtstart').params.get('TZID', 'UTC')
-            },
-            'end': {
-                'dateTime': event.get('dtend').dt.isoformat(timespec="seconds"),
-                'timeZone': event.get('dtend').params.get('TZID', 'UTC')
-            },
-            'location': event.get('location'),
-        }
+        event_body = self.event_body(event)
 
         max_attempts = 5
         backoff = 1
 
         for attempt in range(max_attempts):
             try:
+                self._throttle()
                 self.service.events().insert(calendarId=self.calendar_id, body=event_body).execute()
                 time.sleep(0.1)
                 return
             except HttpError as e:
                 logger.debug(f"Attempt {attempt + 1}: Error adding event: {e}")
-                if e.resp.status == 403 and e.error_details and e.error_details[0].get('reason') == 'rateLimitExceeded':
+                if self._is_rate_limited(e):
                     if attempt < max_attempts - 1:
                         logger.warning(f"Rate limit exceeded. Retrying in {backoff} seconds...")
                         time.sleep(backoff)
@@ -131,26 +177,48 @@ class GoogleCalendarAPI:
                 logger.exception("Unexpected error adding event.")
                 raise
 
+    # Patch events
+
+    def patch_events_batch(self, patches: dict[str, dict], verbose: bool = False) -> list[dict]:
+        """ Patch events of Google Calendar (event id -> fields to update) with batch requests of up to BATCH_SIZE patches and return the patched events """
+        requests = {
+            event_id: (lambda event_id=event_id, body=body: self.service.events().patch(calendarId=self.calendar_id, eventId=event_id, body=body))
+            for event_id, body in patches.items()
+        }
+        return list(self._execute_batches(requests, action="Patching", verbose=verbose).values())
+
     # Delete events
 
     def delete_events(
         self,
         date_from: str | None = None,
         date_to: str | None = None,
-        verbose: bool = False
+        verbose: bool = False,
+        batch: bool = True
     ) -> None:
-        """ Delete events from Google Calendar within a date range """
+        """ Delete events from Google Calendar within a date range (in batch requests by default) """
         events = self.fetch_events(date_from, date_to)
         N_events = len(events)
-        for i, event in enumerate(events):
-            logger.debug(f"Deleting event {i + 1}/{N_events}: {event.get('summary')}")
-            if verbose:
-                printer.print(f"Deleting event {i + 1}/{N_events}")
-            self.delete_event(event['id'])
+        if batch:
+            self.delete_events_batch([event['id'] for event in events], verbose=verbose)
+        else:
+            for i, event in enumerate(events):
+                logger.debug(f"Deleting event {i + 1}/{N_events}: {event.get('summary')}")
+                if verbose:
+                    printer.print(f"Deleting event {i + 1}/{N_events}")
+                self.delete_event(event['id'])
         if verbose:
             printer.clear()
         logger.info(f"Deleted {N_events} events from Google Calendar.")
 
+    def delete_events_batch(self, event_ids: list[str], verbose: bool = False) -> None:
+        """ Delete events from Google Calendar with batch requests of up to BATCH_SIZE deletions """
+        requests = {
+            event_id: (lambda event_id=event_id: self.service.events().delete(calendarId=self.calendar_id, eventId=event_id))
+            for event_id in event_ids
+        }
+        self._execute_batches(requests, action="Deleting", verbose=verbose, ignored_statuses={404, 410})
+
     def delete_event(self, event_id: str) -> None:
         """ Delete a specific event from Google Calendar """
         max_attempts = 5
@@ -158,12 +226,13 @@ class GoogleCalendarAPI:
 
         for attempt in range(max_attempts):
             try:
+                self._throttle()
                 self.service.events().delete(calendarId=self.calendar_id, eventId=event_id).execute()
                 time.sleep(0.1)
                 return
             except HttpError as e:
                 logger.debug(f"Attempt {attempt + 1}: Error deleting event {event_id}: {e}")
-                if e.resp.status == 403 and e.error_details and e.error_details[0].get('reason') == 'rateLimitExceeded':
+                if self._is_rate_limited(e):
                     if attempt < max_attempts - 1:
                         logger.warning(f"Rate limit exceeded. Retrying in {backoff} seconds...")
                         time.sleep(backoff)
@@ -176,6 +245,122 @@ class GoogleCalendarAPI:
                 logger.exception("Unexpected error deleting event.")
                 raise
 
+    # Batch requests
+
+    def _execute_batches(
+        self,
+        requests: dict[str, Callable[[], HttpRequest]],
+        action: str,
+        verbose: bool = False,
+        ignored_statuses: set[int] | None = None
+    ) -> dict[str, dict]:
+        """
+        Execute the requests by batches of BATCH_SIZE operations and return the responses of the successful ones.
+        The rate-limited operations of a batch are retried in a new batch with an exponential backoff.
+        The other errors (of an operation or of a whole batch) are logged, and a BatchRequestError holding
+        the responses of the successful operations is raised once every batch has been executed.
+        """
+        ignored_statuses = ignored_statuses or set()
+        pending = list(requests)
+        failed: dict[str, Exception] = {}
+        responses: dict[str, dict] = {}
+        N_requests = len(pending)
+        max_attempts = 5
+        backoff = 1
+
+        for attempt in range(max_attempts):
+            rate_limited: dict[str, HttpError] = {}
+
+            def callback(request_id: str, response: dict | None, exception: Exception | None) -> None:
+                if exception is None:
+                    responses[request_id] = response
+                    return
+                if isinstance(exception, HttpError) and self._is_rate_limited(exception):
+                    rate_limited[request_id] = exception
+                elif isinstance(exception, HttpError) and exception.resp.status in ignored_statuses:
+                    logger.debug(f"Ignoring error for request {request_id}: {exception}")
+                else:
+                    logger.error(f"Error for request {request_id}: {exception}")
+                    failed[request_id] = exception
+
+            for start in range(0, len(pending), BATCH_SIZE):
+                chunk = pending[start:start + BATCH_SIZE]
+                logger.debug(f"{action} events {start + 1}-{start + len(chunk)}/{len(pending)} (attempt {attempt + 1}).")
+                if verbose:
+                    printer.print(f"{action} events {start + len(chunk)}/{len(pending)}")
+                batch = self.service.new_batch_http_request(callback=callback)
+                for request_id in chunk:
+                    batch.add(requests[request_id](), request_id=request_id)
+                self._throttle(len(chunk))
+                try:
+                    batch.execute()
+                except Exception as e:
+                    # The whole batch failed (e.g. HttpError of the batch endpoint or transport error)
+                    unanswered = [
+                        request_id for request_id in chunk
+                        if request_id not in responses and request_id not in failed and request_id not in rate_limited
+                    ]
+                    if isinstance(e, HttpError) and self._is_rate_limited(e):
+                        rate_limited.update(dict.fromkeys(unanswered, e))
+                    else:
+                        logger.exception(f"Batch request failed while {action.lower()} events, {len(unanswered)} operations are marked as failed.")
+                        failed.update(dict.fromkeys(unanswered, e))
+
+            if not rate_limited:
+                break
+            if attempt < max_attempts - 1:
+                logger.warning(f"Rate limit exceeded for {len(rate_limited)} operations. Retrying in {backoff} seconds...")
+                time.sleep(backoff)
+                backoff *= 2
+                pending = list(rate_limited)
+        else:
+            logger.error(f"Max attempts reached. {len(rate_limited)} operations failed due to rate limit.")
+            failed.update(rate_limited)
+
+        if failed:
+            logger.error(f"{len(failed)}/{N_requests} operations failed while {action.lower()} events.")
+            raise BatchRequestError(
+                f"{len(failed)}/{N_requests} operations failed while {action.lower()} events.",
+                responses=responses,
+                failed=failed
+            ) from next(iter(failed.values()))
+        return responses
+
+    @staticmethod
+    def _is_rate_limited(error: HttpError) -> bool:
+        """ Check if the error is due to the Calendar API rate limits """
+        if error.resp.status == 429:
+            return True
+        return error.resp.status == 403 and bool(error.error_details) and error.error_details[0].get('reason') in ('rateLimitExceeded', 'userRateLimitExceeded')
+
+    def _throttle(self, cost: int = 1) -> None:
+        """ Wait until the API budget allows `cost` more operations (a batch costs one operation per request) """
+        if self.budget is not None:
+            self.budget.acquire(cost)
+
+    # Event resources
+
+    @staticmethod
+    def event_body(event: Event) -> dict:
+        """ Build the Google Calendar event resource of an event """
+        body = {
+            'summary': event.get('summary'),
+            'description': event.get('description'),
+            'start': {
+                'dateTime': event.get('dtstart').dt.isoformat(timespec="seconds"),
+                'timeZone': event.get('dtstart').params.get('TZID', 'UTC')
+            },
+            'end': {
+                'dateTime': event.get('dtend').dt.isoformat(timespec="seconds"),
+                'timeZone': event.get('dtend').params.get('TZID', 'UTC')
+            },
+            'location': event.get('location'),
+        }
+        identity_key = event.get('x-identity-key')
+        if identity_key is not None:
+            body['extendedProperties'] = {'private': {IDENTITY_KEY_PROPERTY: str(identity_key)}}
+        return body
+
     # Helpe methods
 
     def _format_date(self, date: str) -> str:
@@ -0,0 +1,108 @@
+from __future__ import annotations
+import hashlib
+from datetime import datetime, timezone
+from zoneinfo import ZoneInfo
+from dataclasses import dataclass, field
+
+from icalendar import Event
+
+from . import logger
+
+IDENTITY_KEY_PROPERTY = "identity_key"  # Private extended property holding the identity key of the event
+
+
+@dataclass
+class CalendarDiff:
+    """ Operations to apply to a Google Calendar so that it matches a set of events. """
+    to_insert: list[Event] = field(default_factory=list)
+    to_patch: dict[str, dict] = field(default_factory=dict)  # Google event id -> new event body
+    to_delete: list[str] = field(default_factory=list)  # Google event ids
+    unchanged: int = 0
+
+    def __len__(self) -> int:
+        """ Return the number of operations of the diff. """
+        return len(self.to_insert) + len(self.to_patch) + len(self.to_delete)
+
+    def __repr__(self) -> str:
+        return f"CalendarDiff(insert={len(self.to_insert)}, patch={len(self.to_patch)}, delete={len(self.to_delete)}, unchanged={self.unchanged})"
+
+
+def get_identity_key(google_event: dict) -> str | None:
+    """ Return the identity key stored in the extended properties of a Google Calendar event. """
+    return google_event.get('extendedProperties', {}).get('private', {}).get(IDENTITY_KEY_PROPERTY)
+
+
+def content_hash(event_resource: dict) -> str:
+    """ Return a hash of the fields set by the sync, for a Google event or a new event body. """
+    fields = [event_resource.get(field_name) or "" for field_name in ('summary', 'description', 'location')]
+    fields += [str(_parse_datetime(event_resource.get(field_name, {}))) for field_name in ('start', 'end')]
+    return hashlib.sha256("\x1f".join(fields).encode()).hexdigest()
+
+
+def index_entry(google_event: dict) -> dict:
+    """ Return the entry of a Google event in the local calendar index (see CalendarState). """
+    return {
+        'identity_key': get_identity_key(google_event),
+        'content_hash': content_hash(google_event),
+        'start': _isoformat(_parse_datetime(google_event.get('start', {}))),
+        'end': _isoformat(_parse_datetime(google_event.get('end', {}))),
+    }
+
+
+def diff_events(existing_events: dict[str, dict], events: list[Event], event_body: callable) -> CalendarDiff:
+    """
+    Match the existing Google Calendar events (id -> index entry) with the new events by identity key and
+    return the operations to apply. Existing events without identity key (not created by the diff sync)
+    or duplicated are deleted.
+    """
+    diff = CalendarDiff()
+
+    existing_by_key: dict[str, tuple[str, dict]] = {}
+    for event_id, entry in existing_events.items():
+        key = entry.get('identity_key')
+        if key is None or key in existing_by_key:
+            diff.to_delete.append(event_id)
+        else:
+            existing_by_key[key] = (event_id, entry)
+
+    seen = set()
+    for event in events:
+        key = event.get('x-identity-key')
+        if key is None:
+            logger.error(f"Event {event.get('summary')} has no identity key, cannot sync it.")
+            raise ValueError(f"Event {event.get('summary')} has no identity key, cannot sync it.")
+        key = str(key)
+        if key in seen:
+            logger.debug(f"Skipping duplicated event with identity key: {key}")
+            continue
+        seen.add(key)
+
+        existing = existing_by_key.pop(key, None)
+        if existing is None:
+            diff.to_insert.append(event)
+            continue
+        event_id, entry = existing
+        body = event_body(event)
+        if entry.get('content_hash') != content_hash(body):
+            diff.to_patch[event_id] = body
+        else:
+            diff.unchanged += 1
+
+    diff.to_delete.extend(event_id for event_id, _ in existing_by_key.values())
+    logger.debug(f"Computed calendar diff: {diff}")
+    return diff
+
+
+def _parse_datetime(value: dict) -> datetime | str | None:
+    """ Parse the dateTime of a Google event start / end (in UTC), to compare instants regardless of the offset used. """
+    date_time = value.get('dateTime')
+    if date_time is None:
+        return value.get('date')
+    parsed = datetime.fromisoformat(date_time.replace('Z', '+00:00'))
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=ZoneInfo(value.get('timeZone') or 'UTC'))
+    return parsed.astimezone(timezone.utc)
+
+
+def _isoformat(value: datetime | str | None) -> str | None:
+    return value.isoformat() if isinstance(value, datetime) else value
@@ -2,10 +2,14 @@ from __future__ import annotations
 from datetime import datetime, timezone
 
 from icalendar import Calendar
+from googleapiclient.errors import HttpError
 
 from . import logger
 from .auth import GoogleAuthManager
-from .api_client import GoogleCalendarAPI
+from .api_client import GoogleCalendarAPI, BatchRequestError, printer
+from .diff import CalendarDiff, diff_events, index_entry
+from .state import CalendarState
+from sports_calendar.sc_core import TokenBucket
 
 
 class GoogleCalendarManager:
@@ -33,6 +37,97 @@ class GoogleCalendarManager:
             logger.error(f"Invalid scope '{scope}' specified. Valid options are 'all', 'future', or 'past'.")
             raise ValueError(f"Invalid scope '{scope}' specified. Valid options are 'all', 'future', or 'past'.")
 
+    def sync_calendar(
+        self,
+        calendar: Calendar,
+        scope: str | None = 'future',
+        state: CalendarState | None = None,
+        verbose: bool = False
+    ) -> CalendarDiff:
+        """
+        Synchronize Google Calendar with a calendar within the scope, by inserting, patching and deleting only
+        the events that differ (events are matched by identity key).
+        With a local state, the existing events are read from the state (reconciled with the changes made
+        since the last run) instead of being listed from Google Calendar, and the state is updated with the writes.
+        """
+        today = datetime.now(timezone.utc).date().isoformat()
+        if scope is None or scope == 'all':
+            date_from, date_to = None, None
+        elif scope == 'future':
+            date_from, date_to = today, None
+        elif scope == 'past':
+            date_from, date_to = None, today
+        else:
+            logger.error(f"Invalid scope '{scope}' specified. Valid options are 'all', 'future', or 'past'.")
+            raise ValueError(f"Invalid scope '{scope}' specified. Valid options are 'all', 'future', or 'past'.")
+
+        if state is not None:
+            self.reconcile_state(state)
+            existing_events = state.in_scope(date_from=date_from, date_to=date_to)
+        else:
+            existing_events = {
+                google_event['id']: index_entry(google_event)
+                for google_event in self.api.fetch_events(date_from=date_from, date_to=date_to)
+            }
+        events = self.api.filter_events(calendar.events, date_from=date_from, date_to=date_to)
+        diff = diff_events(existing_events, events, event_body=self.api.event_body)
+        logger.info(f"Synchronizing Google Calendar: {len(diff.to_insert)} to insert, {len(diff.to_patch)} to patch, {len(diff.to_delete)} to delete, {diff.unchanged} unchanged.")
+
+        try:
+            if diff.to_delete:
+                try:
+                    self.api.delete_events_batch(diff.to_delete, verbose=verbose)
+                except BatchRequestError as e:
+                    if state is not None:
+                        state.remove([event_id for event_id in diff.to_delete if event_id not in e.failed])
+                    raise
+                if state is not None:
+                    state.remove(diff.to_delete)
+            if diff.to_patch:
+                try:
+                    patched = self.api.patch_events_batch(diff.to_patch, verbose=verbose)
+                except BatchRequestError as e:
+                    if state is not None:
+                        state.apply(list(e.responses.values()))
+                    raise
+                if state is not None:
+                    state.apply(patched)
+            if diff.to_insert:
+                try:
+                    inserted = self.api.add_events_batch(diff.to_insert, verbose=verbose)
+                except BatchRequestError as e:
+                    if state is not None:
+                        state.apply(list(e.responses.values()))
+                    raise
+                if state is not None:
+                    state.apply(inserted)
+        finally:
+            # The writes which succeeded are kept in the state even if some operations failed
+            if state is not None:
+                state.save()
+        if verbose:
+            printer.clear()
+        return diff
+
+    def reconcile_state(self, state: CalendarState) -> None:
+        """ Update the local state with the changes made to Google Calendar since the last sync (or rebuild it). """
+        if state.sync_token is not None:
+            try:
+                changes, sync_token = self.api.fetch_changes(state.sync_token)
+                logger.info(f"Reconciling calendar state with {len(changes)} changes since the last sync.")
+                state.apply(changes)
+                state.sync_token = sync_token
+                return
+            except HttpError as e:
+                if e.resp.status != 410:
+                    raise
+                logger.warning("Sync token of the calendar state expired. Rebuilding the state from a full listing.")
+        events, sync_token = self.api.fetch_changes()
+        logger.info(f"Building calendar state from {len(events)} events.")
+        state.reset()
+        state.apply(events)
+        state.sync_token = sync_token
+
     def clear_calendar(self, scope: str | None = None, date_from: str | None = None, date_to: str | None = None, verbose: bool = False) -> None:
         """ Clear events from the Google Calendar based on the specified scope """
         today = datetime.now(timezone.utc).date().isoformat()
@@ -49,8 +144,8 @@ class GoogleCalendarManager:
             raise ValueError(f"Invalid scope '{scope}' specified. Valid options are 'all', 'future', or 'past'.")
 
     @classmethod
-    def from_defaults(cls, gcal_id: str) -> GoogleCalendarManager:
+    def from_defaults(cls, gcal_id: str, budget: TokenBucket | None = None) -> GoogleCalendarManager:
         """ Create a GoogleCalendarManager with default settings """
         auth = GoogleAuthManager()
-        api = GoogleCalendarAPI(auth_manager=auth, calendar_id=gcal_id)
+        api = GoogleCalendarAPI(auth_manager=auth, calendar_id=gcal_id, budget=budget)
         return cls(api)
@@ -0,0 +1,87 @@
+from __future__ import annotations
+import json
+from pathlib import Path
+from datetime import datetime, timezone
+
+from . import logger
+from .diff import index_entry
+
+
+class CalendarState:
+    """
+    Local index of the events of a Google Calendar (event id -> identity key, content hash, start and end),
+    kept up to date with the sync writes and with the incremental listing of the Calendar API (sync token).
+    """
+
+    def __init__(self, path: Path, calendar_id: str):
+        self.path = Path(path)
+        self.calendar_id = calendar_id
+        self.sync_token: str | None = None
+        self.events: dict[str, dict] = {}
+
+    @classmethod
+    def load(cls, path: Path, calendar_id: str) -> CalendarState:
+        """ Load the state from its file (an empty state is returned if it doesn't exist or belongs to another calendar). """
+        state = cls(path, calendar_id)
+        if not state.path.exists():
+            logger.debug(f"Calendar state file {state.path} does not exist. Starting from an empty state.")
+            return state
+        try:
+            content = json.loads(state.path.read_text())
+        except Exception as e:
+            logger.warning(f"Ignoring corrupted calendar state file {state.path}: {e}")
+            return state
+        if content.get('calendar_id') != calendar_id:
+            logger.info(f"Calendar state file {state.path} belongs to another calendar. Starting from an empty state.")
+            return state
+        state.sync_token = content.get('sync_token')
+        state.events = content.get('events', {})
+        return state
+
+    def save(self) -> None:
+        """ Write the state to its file. """
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps({
+            'calendar_id': self.calendar_id,
+            'sync_token': self.sync_token,
+            'events': self.events
+        }))
+        tmp_path.replace(self.path)
+        logger.debug(f"Saved calendar state ({len(self.events)} events) to {self.path}.")
+
+    def reset(self) -> None:
+        """ Forget every event and the sync token (a full listing is needed to rebuild the state). """
+        self.sync_token = None
+        self.events = {}
+
+    def apply(self, google_events: list[dict]) -> None:
+        """ Apply events returned by the Calendar API (cancelled events are removed from the index). """
+        for google_event in google_events:
+            if google_event.get('status') == 'cancelled':
+                self.events.pop(google_event['id'], None)
+            else:
+                self.events[google_event['id']] = index_entry(google_event)
+
+    def remove(self, event_ids: list[str]) -> None:
+        """ Remove events from the index. """
+        for event_id in event_ids:
+            self.events.pop(event_id, None)
+
+    def in_scope(self, date_from: str | None = None, date_to: str | None = None) -> dict[str, dict]:
+        """ Return the events ending after date_from and starting before date_to (same rules as `fetch_events`). """
+        time_min = self._parse_bound(date_from)
+        time_max = self._parse_bound(date_to)
+        return {
+            event_id: entry for event_id, entry in self.events.items()
+            if (time_min is None or self._parse_bound(entry.get('end')) > time_min)
+            and (time_max is None or self._parse_bound(entry.get('start')) < time_max)
+        }
+
+    @staticmethod
+    def _parse_bound(value: str | None) -> datetime | None:
+        """ Parse an ISO date or datetime (dates are midnight UTC). """
+        if value is None:
+            return None
+        parsed = datetime.fromisoformat(value)
+        return parsed if parsed.tzinfo is not None else parsed.replace(tzinfo=timezone.utc)
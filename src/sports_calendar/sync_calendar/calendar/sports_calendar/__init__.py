@@ -1,3 +1,4 @@
 from .. import logger
 from .calendar import SportsCalendar
-from .events import SportsEventCollection
\ No newline at end of file
+from .events import SportsEventCollection
+from .ics_writer import ICSWriter, write_ics
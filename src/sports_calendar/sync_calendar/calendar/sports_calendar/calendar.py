@@ -4,14 +4,23 @@ from icalendar import Calendar
 
 from . import logger
 from .events import SportsEventCollection, SportsEvent
+from .ics_writer import write_ics
 
 
 class SportsCalendar:
-    """ Abstract base class for sports calendars """
+    """
+    Abstract base class for sports calendars. The sports events are kept as is (no icalendar object tree),
+    unless the calendar wraps an existing icalendar Calendar, to which the events are added.
+    """
 
     def __init__(self, calendar: Calendar = None):
         """ Initialize the sports calendar with an optional icalendar Calendar object """
-        self.calendar = calendar if calendar else Calendar()
+        self.calendar = calendar
+        self.events: list[SportsEvent] = []
+
+    def __len__(self) -> int:
+        """ Number of events of the calendar """
+        return len(self.calendar.subcomponents) if self.calendar is not None else len(self.events)
 
     def add_events(self, events: SportsEventCollection) -> None:
         """ Add events to the calendar """
@@ -20,10 +29,25 @@ class SportsCalendar:
 
     def add_event(self, event: SportsEvent) -> None:
         """ Add a single event to the calendar """
-        self.calendar.add_component(event.get_event())
+        if self.calendar is not None:
+            self.calendar.add_component(event.get_event())
+        else:
+            self.events.append(event)
+
+    def to_calendar(self) -> Calendar:
+        """ Return the icalendar Calendar of the events (built on demand, e.g. for the Google Calendar synchronization) """
+        if self.calendar is not None:
+            return self.calendar
+        calendar = Calendar()
+        for event in self.events:
+            calendar.add_component(event.get_event())
+        return calendar
 
     def save_to_ics(self, path: Path) -> None:
-        """ Save the calendar to an ICS file """
+        """ Save the calendar to an ICS file (streamed from the sports events, unless built from an existing calendar) """
+        if self.calendar is None:
+            write_ics(self.events, path)
+            return
         path_suffix = path.suffix.lower()
         if path_suffix != '.ics':
             logger.error(f"Invalid file extension: {path_suffix}. Expected .ics")
@@ -34,8 +58,11 @@ class SportsCalendar:
 
     def __str__(self):
         """ String representation of the calendar (first 10 events) """
-        events = list(self.calendar.subcomponents)
-        event_strs = [str(event) for event in events[:10]]
-        if len(events) > 10:
-            event_strs.append(f"... and {len(events) - 10} more events.")
+        if self.calendar is not None:
+            events = self.calendar.subcomponents[:10]
+        else:
+            events = [event.get_event() for event in self.events[:10]]
+        event_strs = [str(event) for event in events]
+        if len(self) > 10:
+            event_strs.append(f"... and {len(self) - 10} more events.")
         return "\n".join(event_strs)
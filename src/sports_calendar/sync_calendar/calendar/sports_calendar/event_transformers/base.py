@@ -1,4 +1,6 @@
 from abc import ABC, abstractmethod
+from typing import Iterator
+from datetime import datetime, timedelta
 
 import pandas as pd
 
@@ -7,17 +9,64 @@ from ..events import SportsEvent
 
 class EventTransformer(ABC):
     """ Abstract base class for event transformers. """
+    event_class: type[SportsEvent]
+    columns: list[str]  # Required columns passed to the event constructor
+    optional_columns: list[str]  # Optional columns passed to the event constructor (None when missing)
 
     @abstractmethod
     def transform(self, series: pd.Series) -> SportsEvent:
         """ Transform a pandas Series into a SportsEvent. """
         raise NotImplementedError("Subclasses must implement this method.")
 
+    @abstractmethod
+    def compute_fields(self, columns: dict[str, pd.Series]) -> dict[str, pd.Series]:
+        """ Compute the summary, start, end, location, description and identity key of all the events column-wise. """
+        raise NotImplementedError("Subclasses must implement this method.")
+
     def batch_transform(self, df: pd.DataFrame) -> list[SportsEvent]:
-        """ Transform a DataFrame into a list of SportsEvents. """
-        return [self.transform(series) for _, series in df.iterrows()]
+        """ Transform a DataFrame into a list of SportsEvents, computing the event fields once per column. """
+        if df.empty:
+            return []
+        columns = {col: self.clean_column(df[col]) for col in self.columns}
+        columns.update({
+            col: self.clean_column(df[col]) if col in df.columns else pd.Series([None] * len(df), index=df.index, dtype=object)
+            for col in self.optional_columns
+        })
+        fields = self.compute_fields(columns)
+
+        events = []
+        names, field_names = list(columns), list(fields)
+        column_values = [series.tolist() for series in columns.values()]
+        field_values = [series.tolist() for series in fields.values()]
+        for values, computed in zip(zip(*column_values), zip(*field_values)):
+            event = self.event_class(**dict(zip(names, values)))
+            event.set_fields(**dict(zip(field_names, computed)))
+            events.append(event)
+        return events
+
+    def iter_transform(self, df: pd.DataFrame, chunk_size: int = 10_000) -> Iterator[SportsEvent]:
+        """ Transform a DataFrame chunk by chunk and yield the events (to stream them, e.g. to an ICS file). """
+        for start in range(0, len(df), chunk_size):
+            yield from self.batch_transform(df.iloc[start:start + chunk_size])
 
     @staticmethod
     def clean_value(val):
         """ Convert NaN or missing values to None. """
         return None if pd.isna(val) else val
+
+    @staticmethod
+    def clean_column(series: pd.Series) -> pd.Series:
+        """ Convert NaN or missing values of a column to None. """
+        return series.astype(object).where(series.notna(), None)
+
+    @staticmethod
+    def parse_dates(series: pd.Series, duration: timedelta) -> tuple[pd.Series, pd.Series]:
+        """ Parse ISO date times once per distinct value and return the start and end of the events. """
+        parsed = {value: datetime.fromisoformat(value) for value in series.unique()}
+        start = series.map(parsed)
+        return start, start.map(lambda dt: dt + duration)
+
+    @staticmethod
+    def optional_line(label: str, series: pd.Series) -> pd.Series:
+        """ Return the description line '\\n<label>: <value>' of each set (truthy) value, an empty string otherwise. """
+        return ("\n" + label + ": " + series.astype(str)).where(series.astype(bool), "")
@@ -1,3 +1,5 @@
+from datetime import timedelta
+
 import pandas as pd
 
 from .base import EventTransformer
@@ -6,6 +8,9 @@ from ..events import F1Event
 
 class F1EventTransformer(EventTransformer):
     """ Transformer for F1 events. """
+    event_class = F1Event
+    columns = ['name', 'session', 'date_time']
+    optional_columns = ['city', 'country']
 
     def transform(self, series: pd.Series) -> F1Event:
         """ Transform a pandas Series into an F1Event. """
@@ -16,3 +21,27 @@ class F1EventTransformer(EventTransformer):
             city=self.clean_value(series.get('city')),
             country=self.clean_value(series.get('country'))
         )
+
+    def compute_fields(self, columns: dict[str, pd.Series]) -> dict[str, pd.Series]:
+        """ Compute the fields (and identity keys) of the F1 events column-wise. """
+        start, end = self.parse_dates(columns['date_time'], timedelta(hours=2))
+        city, country = columns['city'], columns['country']
+        location = (city.astype(str) + ", " + country.astype(str)).where(city.astype(bool) & country.astype(bool), "")
+        description = (
+            "Sport: " + F1Event.sport
+            + "\nSession: " + columns['session'].astype(str)
+            + self.optional_line("City", city)
+            + self.optional_line("Country", country)
+        )
+        identity_key = (
+            F1Event.sport + " | " + columns['name'].astype(str) + " | " + columns['session'].astype(str)
+            + " | " + columns['date_time'].astype(str)
+        )
+        return {
+            'summary': columns['name'].astype(str) + " (" + columns['session'].astype(str) + ")",
+            'start': start,
+            'end': end,
+            'location': location,
+            'description': description,
+            'identity_key': identity_key
+        }
@@ -1,3 +1,5 @@
+from datetime import timedelta
+
 import pandas as pd
 
 from .base import EventTransformer
@@ -6,6 +8,9 @@ from ..events import FootballEvent
 
 class FootballEventTransformer(EventTransformer):
     """ Transformer for football events. """
+    event_class = FootballEvent
+    columns = ['home_team_name', 'away_team_name', 'date_time']
+    optional_columns = ['competition_name', 'competition_abbreviation', 'stage', 'leg', 'venue']
 
     def transform(self, series: pd.Series) -> FootballEvent:
         """ Transform a pandas Series into a FootballEvent. """
@@ -19,3 +24,29 @@ class FootballEventTransformer(EventTransformer):
             leg=self.clean_value(series.get('leg')),
             venue=self.clean_value(series.get('venue'))
         )
+
+    def compute_fields(self, columns: dict[str, pd.Series]) -> dict[str, pd.Series]:
+        """ Compute the fields (and identity keys) of the football events column-wise. """
+        start, end = self.parse_dates(columns['date_time'], timedelta(hours=2))
+        summary = (
+            columns['home_team_name'].astype(str) + " - " + columns['away_team_name'].astype(str)
+            + " (" + columns['competition_abbreviation'].astype(str) + ")"
+        )
+        description = (
+            "Sport: " + FootballEvent.sport
+            + self.optional_line("Competition", columns['competition_name'])
+            + self.optional_line("Stage", columns['stage'])
+            + self.optional_line("Leg", columns['leg'])
+        )
+        identity_key = (
+            FootballEvent.sport + " | " + columns['home_team_name'].astype(str) + " vs " + columns['away_team_name'].astype(str)
+            + " | " + columns['date_time'].astype(str)
+        )
+        return {
+            'summary': summary,
+            'start': start,
+            'end': end,
+            'location': columns['venue'],
+            'description': description,
+            'identity_key': identity_key
+        }
@@ -1,5 +1,6 @@
 from __future__ import annotations
 from abc import ABC, abstractmethod
+from typing import Any
 
 from icalendar import Event
 
@@ -7,13 +8,32 @@ from datetime import datetime
 
 
 class SportsEvent(ABC):
-    """ Abstract base class for sports events. """
+    """ Abstract base class for sports events (slotted, subclasses must declare the `__slots__` of their attributes). """
+    # Computed fields, cached on first access (None until computed or set by the event transformers)
+    __slots__ = ("_summary", "_start", "_end", "_location", "_description", "_identity_key", "_hash")
     sport: str
 
+    def __init__(self):
+        """ Initialize the cached fields (summary, start, end, location, description, identity key and hash). """
+        self._summary = self._start = self._end = self._location = self._description = None
+        self._identity_key = self._hash = None
+
     def __repr__(self):
         """ Return a string representation of the event. """
         return f"{self.__class__.__name__}(sport={self.sport}, summary={self.summary}, start={self.start}, end={self.end})"
 
+    def __eq__(self, other: object) -> bool:
+        """ Two events are equal when they have the same type and identity key. """
+        if not isinstance(other, SportsEvent):
+            return NotImplemented
+        return type(self) is type(other) and self.identity_key() == other.identity_key()
+
+    def __hash__(self) -> int:
+        """ Hash of the identity key (computed once, like the key). """
+        if self._hash is None:
+            self._hash = hash(self.identity_key())
+        return self._hash
+
     @property
     @abstractmethod
     def summary(self) -> str:
@@ -39,6 +59,11 @@ class SportsEvent(ABC):
     def description(self) -> str:
         """ TODO """
 
+    def set_fields(self, **fields: Any) -> None:
+        """ Set precomputed values of the fields (computed column-wise by the event transformers). """
+        for name, value in fields.items():
+            setattr(self, f"_{name}", value)
+
     def get_event(self) -> Event:
         event = Event()
         event.add("summary", self.summary)
@@ -46,11 +71,18 @@ class SportsEvent(ABC):
         event.add("dtend", self.end)
         event.add("location", self.location)
         event.add("description", self.description)
+        event.add("x-identity-key", self.identity_key())
         return event
 
-    @abstractmethod
     def identity_key(self) -> str:
-        """ Return a unique string identifying this event for equality/deduplication. """
+        """ Return a unique string identifying this event for equality/deduplication (computed once). """
+        if self._identity_key is None:
+            self._identity_key = self._build_identity_key()
+        return self._identity_key
+
+    @abstractmethod
+    def _build_identity_key(self) -> str:
+        """ Build the identity key of the event. """
         pass
 
 
@@ -8,6 +8,7 @@ from .base import SportsEvent
 
 class F1Event(SportsEvent):
     """ Represents a Formula 1 event. """
+    __slots__ = ("name", "session", "date_time", "city", "country")
     sport = "f1"
 
     def __init__(
@@ -20,6 +21,7 @@ class F1Event(SportsEvent):
         **kwargs
     ):
         """ Initialize the F1Event with event details. """
+        super().__init__()
         self.name = name
         self.session = session
         self.date_time = date_time
@@ -29,26 +31,40 @@ class F1Event(SportsEvent):
     @property
     def summary(self) -> str:
         """ Summary of the F1 event. """
-        return f"{self.name} ({self.session})"
+        if self._summary is None:
+            self._summary = f"{self.name} ({self.session})"
+        return self._summary
 
     @property
     def start(self) -> datetime:
         """ Start time of the F1 event. """
-        return datetime.fromisoformat(self.date_time)
+        if self._start is None:
+            self._start = datetime.fromisoformat(self.date_time)
+        return self._start
 
     @property
     def end(self) -> datetime:
         """ End time of the F1 event. """
-        return self.start + timedelta(hours=2)
+        if self._end is None:
+            self._end = self.start + timedelta(hours=2)
+        return self._end
 
     @property
     def location(self) -> str:
         """ Location of the F1 event. """
-        return f"{self.city}, {self.country}" if self.city and self.country else ""
+        if self._location is None:
+            self._location = f"{self.city}, {self.country}" if self.city and self.country else ""
+        return self._location
 
     @property
     def description(self) -> str:
         """ Description of the F1 event. """
+        if self._description is None:
+            self._description = self._build_description()
+        return self._description
+
+    def _build_description(self) -> str:
+        """ Build the description of the F1 event. """
         description_lines = [f"Sport: {self.sport}"]
         description_lines.append(f"Session: {self.session}")
         if self.city:
@@ -57,6 +73,6 @@ class F1Event(SportsEvent):
             description_lines.append(f"Country: {self.country}")
         return "\n".join(description_lines)
 
-    def identity_key(self) -> str:
-        """ Return a unique string identifying this event for equality/deduplication. """
+    def _build_identity_key(self) -> str:
+        """ Build the identity key of the event. """
         return f"{self.sport} | {self.name} | {self.session} | {self.date_time}"
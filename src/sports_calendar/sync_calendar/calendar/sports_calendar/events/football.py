@@ -8,6 +8,7 @@ from .base import SportsEvent
 
 class FootballEvent(SportsEvent):
     """ Represents a football match event. """
+    __slots__ = ("home_team_name", "away_team_name", "date_time", "competition_name", "competition_abbreviation", "stage", "leg")
     sport = "football"
 
     def __init__(
@@ -23,6 +24,7 @@ class FootballEvent(SportsEvent):
         **kwargs
     ):
         """ Initialize the FootballEvent with match details. """
+        super().__init__()
         self.home_team_name = home_team_name
         self.away_team_name = away_team_name
         self.date_time = date_time
@@ -30,32 +32,43 @@ class FootballEvent(SportsEvent):
         self.competition_abbreviation = competition_abbreviation
         self.stage = stage
         self.leg = leg
-
-        self._venue = venue
+        self._location = venue
 
     @property
     def summary(self) -> str:
         """ TODO """
-        return f"{self.home_team_name} - {self.away_team_name} ({self.competition_abbreviation})"
+        if self._summary is None:
+            self._summary = f"{self.home_team_name} - {self.away_team_name} ({self.competition_abbreviation})"
+        return self._summary
 
     @property
     def start(self) -> datetime:
         """ TODO """
-        return datetime.fromisoformat(self.date_time)
+        if self._start is None:
+            self._start = datetime.fromisoformat(self.date_time)
+        return self._start
 
     @property
     def end(self) -> datetime:
         """ TODO """
-        return self.start + timedelta(hours=2)
+        if self._end is None:
+            self._end = self.start + timedelta(hours=2)
+        return self._end
 
     @property
     def location(self) -> str:
         """ TODO """
-        return self._venue
+        return self._location
 
     @property
     def description(self) -> str:
         """ TODO """
+        if self._description is None:
+            self._description = self._build_description()
+        return self._description
+
+    def _build_description(self) -> str:
+        """ Build the description of the match. """
         description_lines = [f"Sport: {self.sport}"]
         if self.competition_name:
             description_lines.append(f"Competition: {self.competition_name}")
@@ -65,6 +78,6 @@ class FootballEvent(SportsEvent):
             description_lines.append(f"Leg: {self.leg}")
         return "\n".join(description_lines) if description_lines else None
 
-    def identity_key(self) -> str:
-        """ Return a unique string identifying this event for equality/deduplication. """
+    def _build_identity_key(self) -> str:
+        """ Build the identity key of the event. """
         return f"{self.sport} | {self.home_team_name} vs {self.away_team_name} | {self.date_time}"
@@ -0,0 +1,122 @@
+from __future__ import annotations
+import hashlib
+from pathlib import Path
+from typing import IO, Iterable
+from datetime import datetime, timezone
+
+from . import logger
+from .events import SportsEvent
+
+PRODID = "-//sports-calendar//sports-calendar//EN"
+UID_DOMAIN = "sports-calendar"
+MAX_LINE_OCTETS = 75  # RFC 5545: lines longer than 75 octets must be folded
+
+
+class ICSWriter:
+    """
+    Streaming ICS writer: the VEVENTs are written one at a time to the file handle, so the memory used
+    doesn't depend on the number of events (no icalendar object tree is built).
+    """
+
+    def __init__(self, handle: IO[bytes]):
+        self.handle = handle
+        self.dtstamp = format_datetime(datetime.now(timezone.utc))
+        self.count = 0
+
+    def __enter__(self) -> ICSWriter:
+        self.write_header()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if exc_type is None:
+            self.write_footer()
+
+    def write_header(self) -> None:
+        """ Write the beginning of the calendar. """
+        self._write_line("BEGIN:VCALENDAR")
+        self._write_line("VERSION:2.0")
+        self._write_line(f"PRODID:{PRODID}")
+
+    def write_footer(self) -> None:
+        """ Write the end of the calendar. """
+        self._write_line("END:VCALENDAR")
+
+    def write_events(self, events: Iterable[SportsEvent]) -> None:
+        """ Write every event of the iterable (a generator can be used to keep the memory flat). """
+        for event in events:
+            self.write_event(event)
+
+    def write_event(self, event: SportsEvent) -> None:
+        """ Write a single VEVENT. """
+        identity_key = event.identity_key()
+        self._write_line("BEGIN:VEVENT")
+        self._write_line(f"UID:{make_uid(identity_key)}")
+        self._write_line(f"DTSTAMP:{self.dtstamp}")
+        self._write_line(f"SUMMARY:{escape_text(event.summary)}")
+        self._write_line(f"DTSTART:{format_datetime(event.start)}")
+        self._write_line(f"DTEND:{format_datetime(event.end)}")
+        self._write_line(f"LOCATION:{escape_text(event.location)}")
+        self._write_line(f"DESCRIPTION:{escape_text(event.description)}")
+        self._write_line(f"X-IDENTITY-KEY:{escape_text(identity_key)}")
+        self._write_line("END:VEVENT")
+        self.count += 1
+
+    def _write_line(self, line: str) -> None:
+        """ Write a content line, folded at 75 octets. """
+        self.handle.write(fold_line(line))
+
+
+def write_ics(events: Iterable[SportsEvent], path: Path | str) -> int:
+    """ Stream the events to an ICS file and return the number of events written. """
+    path = Path(path)
+    if path.suffix.lower() != '.ics':
+        logger.error(f"Invalid file extension: {path.suffix.lower()}. Expected .ics")
+        raise ValueError(f"Invalid file extension: {path.suffix.lower()}. Expected .ics")
+    with open(path, 'wb') as f, ICSWriter(f) as writer:
+        writer.write_events(events)
+    logger.info(f"Wrote {writer.count} events to {path}")
+    return writer.count
+
+
+def make_uid(identity_key: str) -> str:
+    """ Return a stable UID derived from the identity key of an event. """
+    return f"{hashlib.sha1(identity_key.encode('utf-8')).hexdigest()}@{UID_DOMAIN}"
+
+
+def escape_text(value: str | None) -> str:
+    """ Escape a TEXT value (RFC 5545 section 3.3.11). """
+    if value is None:
+        return ""
+    return (
+        str(value)
+        .replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\r\n", "\\n")
+        .replace("\n", "\\n")
+    )
+
+
+def format_datetime(value: datetime) -> str:
+    """ Format a DATE-TIME value: aware datetimes are written in UTC, naive ones as floating times. """
+    if value.tzinfo is None:
+        return value.strftime("%Y%m%dT%H%M%S")
+    return value.astimezone(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+
+def fold_line(line: str) -> bytes:
+    """ Encode a content line and fold it every 75 octets without splitting a UTF-8 character. """
+    encoded = line.encode('utf-8')
+    if len(encoded) <= MAX_LINE_OCTETS:
+        return encoded + b"\r\n"
+    chunks = []
+    start = 0
+    limit = MAX_LINE_OCTETS
+    while start < len(encoded):
+        end = min(start + limit, len(encoded))
+        while end < len(encoded) and (encoded[end] & 0xC0) == 0x80:  # Don't cut inside a multi-byte character
+            end -= 1
+        chunks.append(encoded[start:end])
+        start = end
+        limit = MAX_LINE_OCTETS - 1  # Continuation lines start with a space
+    return b"\r\n ".join(chunks) + b"\r\n"
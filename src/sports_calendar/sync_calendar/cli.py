@@ -1,20 +1,35 @@
+from pathlib import Path
+
 import typer 
 
-from .main import run_selection, clear_calendar
+from .main import run_selection, run_selections, clear_calendar, export_selection
 
 
 sync_calendar = typer.Typer(help="Commands to run and manage the calendar selection and utils.")
 
 @sync_calendar.callback(invoke_without_command=True)
 def main(
-    key: str = typer.Argument("dev"),
+    keys: list[str] | None = typer.Argument(None, help="Keys of the selections to run (default is 'dev')."),
+    all_selections: bool = typer.Option(False, "--all", help="Run all the selections."),
+    workers: int = typer.Option(4, "--workers", min=1, help="Number of google calendars updated concurrently when running several selections."),
     dry_run: bool = typer.Option(False, "--dry-run")
 ):
     """ Run the data selection. """
-    run_selection(
-        key=key,
-        dry_run=dry_run
-    )
+    if all_selections and keys:
+        typer.echo("Error: --all cannot be used with selection keys.", err=True)
+        raise typer.Exit(code=1)
+
+    if all_selections or (keys and len(keys) > 1):
+        run_selections(
+            keys=keys,
+            dry_run=dry_run,
+            workers=workers
+        )
+    else:
+        run_selection(
+            key=keys[0] if keys else "dev",
+            dry_run=dry_run
+        )
 
 
 clear_cal = typer.Typer(help="Commands to clear events from the Google Calendar.")
@@ -37,3 +52,14 @@ def main(
         date_from=date_from,
         date_to=date_to
     )
+
+
+export_cal = typer.Typer(help="Commands to export the events of a selection to an ICS file.")
+
+@export_cal.callback(invoke_without_command=True)
+def main(
+    key: str = typer.Argument(..., help="Key of the selection to export."),
+    path: Path = typer.Argument(..., help="Path of the ICS file to write (.ics).")
+):
+    """ Export the events of a selection to an ICS file. """
+    export_selection(key=key, path=path)
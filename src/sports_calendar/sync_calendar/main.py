@@ -1,14 +1,23 @@
 from __future__ import annotations
+from pathlib import Path
+from datetime import datetime, timedelta, timezone
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 from . import logger
 from .calendar import (
     SportsCalendar,
-    GoogleCalendarManager
+    GoogleCalendarManager,
+    CalendarState
 )
+from .calendar.sports_calendar import write_ics
 from .models import BaseTable
 from .config import Secrets
-from .selection import SelectionManager, SelectionRunner
-from sports_calendar.sc_core import Paths
+from .selection import Selection, SelectionManager, SelectionRunner
+from .calendar.google_calendar.api_client import BATCH_SIZE
+from sports_calendar.sc_core import Paths, TokenBucket
+
+
+CALENDAR_API_RATE_LIMIT = 500  # Calendar API operations per minute allowed for all the calendars of the account
 
 
 def run_selection(
@@ -22,11 +31,7 @@ def run_selection(
     BaseTable.configure(Paths.DB_DIR)
 
     selection = SelectionManager().get_selection(key)
-    runner = SelectionRunner(selection)
-    events = runner.run()
-
-    sports_calendar = SportsCalendar()
-    sports_calendar.add_events(events)
+    sports_calendar = build_calendar(selection)
 
     if dry_run:
         logger.info("Dry run mode is enabled. No events will be added to the google calendar.")
@@ -35,11 +40,88 @@ def run_selection(
 
     gcal_id = Secrets().get_gcal_id(key)
     google_cal_manager = GoogleCalendarManager.from_defaults(gcal_id)
-    google_cal_manager.clear_calendar(scope='future', verbose=True)
-    google_cal_manager.add_calendar(sports_calendar.calendar, scope='future', verbose=True)
+    push_calendar(key, sports_calendar, google_cal_manager, verbose=True)
 
     logger.info(f"Selection {key} has been successfully processed and added to the google calendar.")
 
+def run_selections(
+    keys: list[str] | None = None,
+    dry_run: bool = False,
+    workers: int = 4,
+    **kwargs
+):
+    """
+    Run several selections (all of them if no key is given): the tables are loaded once and shared by all the
+    selections, then the calendars are pushed concurrently within one API budget for the account.
+    """
+    BaseTable.configure(Paths.DB_DIR)
+
+    selection_manager = SelectionManager()
+    keys = keys or selection_manager.names()
+    logger.info(f"Running selections: {', '.join(keys)}.")
+
+    calendars = {key: build_calendar(selection_manager.get_selection(key)) for key in keys}
+
+    if dry_run:
+        logger.info("Dry run mode is enabled. No events will be added to the google calendars.")
+        for key, sports_calendar in calendars.items():
+            logger.debug(f"Calendar events to be added for selection {key}:\n{sports_calendar}")
+        return
+
+    # Managers are created sequentially (authentication may write the token file), only the pushes run concurrently
+    secrets = Secrets()
+    budget = TokenBucket(CALENDAR_API_RATE_LIMIT, burst=BATCH_SIZE)
+    managers = {key: GoogleCalendarManager.from_defaults(secrets.get_gcal_id(key), budget=budget) for key in keys}
+
+    failed = []
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="sync-calendar") as executor:
+        futures = {
+            executor.submit(push_calendar, key, calendars[key], managers[key]): key
+            for key in keys
+        }
+        for future in as_completed(futures):
+            key = futures[future]
+            try:
+                future.result()
+                logger.info(f"Selection {key} has been successfully processed and added to the google calendar.")
+            except Exception:
+                logger.exception(f"Error pushing selection {key} to the google calendar.")
+                failed.append(key)
+
+    if failed:
+        logger.error(f"Failed to push selections: {', '.join(failed)}.")
+        raise RuntimeError(f"Failed to push selections: {', '.join(failed)}.")
+
+def export_selection(key: str, path: Path, **kwargs) -> int:
+    """ Stream the events of a selection (same date range as the synchronization) to an ICS file, return their number. """
+    logger.info(f"Exporting selection {key} to {path}.")
+
+    BaseTable.configure(Paths.DB_DIR)
+
+    selection = SelectionManager().get_selection(key)
+    runner = SelectionRunner(selection)
+    return write_ics(runner.iter_events(date_from=sync_date_from()), path)
+
+def sync_date_from() -> str:
+    """ Return the first date of the events which can still be synchronized. """
+    # Only the future events are pushed (see push_calendar), so older partitions of the tables are not read.
+    # The previous day is kept for the events which started before midnight and are still running.
+    return (datetime.now(timezone.utc).date() - timedelta(days=1)).isoformat()
+
+def build_calendar(selection: Selection) -> SportsCalendar:
+    """ Resolve the events of a selection which can still be synchronized and return them as a sports calendar. """
+    runner = SelectionRunner(selection)
+    events = runner.run(date_from=sync_date_from())
+
+    sports_calendar = SportsCalendar()
+    sports_calendar.add_events(events)
+    return sports_calendar
+
+def push_calendar(key: str, sports_calendar: SportsCalendar, google_cal_manager: GoogleCalendarManager, verbose: bool = False) -> None:
+    """ Synchronize the future events of the google calendar of a selection with its sports calendar. """
+    state = CalendarState.load(Paths.DB_DIR / ".calendar_state" / f"{key}.json", calendar_id=google_cal_manager.api.calendar_id)
+    google_cal_manager.sync_calendar(sports_calendar.to_calendar(), scope='future', state=state, verbose=verbose)
+
 def clear_calendar(
     key: str = "dev",
     scope: str | None = None,
@@ -1,10 +1,17 @@
 from pathlib import Path
 from abc import ABC, abstractmethod
 
+import numpy as np
 import pandas as pd
 
 from . import logger
-from sports_calendar.sc_core.file_io import FileHandlerFactory
+from sports_calendar.sc_core.file_io import (
+    BaseFileHandler,
+    FileHandlerFactory,
+    PartitionedFileHandler,
+    TableIndex,
+    CombinedTableIndex
+)
 
 
 class BaseTable(ABC):
@@ -14,11 +21,23 @@ class BaseTable(ABC):
     __sport__ = None
     _file_handler = None
     _repo_path = None
+    _cache: dict[str, dict[Path, tuple[tuple, pd.DataFrame, TableIndex | None]]] = {}  # Shared by all tables, keyed by table name and file
 
     @classmethod
     def configure(cls, repo_path: Path):
         logger.debug(f"Configuring table {cls.__name__} with repo path: {repo_path}")
         cls._repo_path = repo_path
+        cls.invalidate_cache()
+
+    @classmethod
+    def invalidate_cache(cls) -> None:
+        """ Drop the cached DataFrame of this table (of every table when called on BaseTable). """
+        if cls is BaseTable:
+            logger.debug("Clearing the cache of all tables.")
+            BaseTable._cache.clear()
+        else:
+            logger.debug(f"Clearing the cache of table {cls.__name__}.")
+            BaseTable._cache.pop(cls.__name__, None)
 
     @classmethod
     @abstractmethod
@@ -27,8 +46,45 @@ class BaseTable(ABC):
         raise NotImplementedError(f"{cls.__name__}.query() is not implemented.")
 
     @classmethod
-    def get_table(cls) -> pd.DataFrame:
-        """ Returns the table as a DataFrame. """
+    def get_table(cls, positions: np.ndarray | None = None) -> pd.DataFrame:
+        """ Returns the table (or only the rows at the given positions), loaded once per process until the file changes. """
+        df, _ = cls._load()
+        return cls._take(df, positions)
+
+    @classmethod
+    def get_index(cls) -> TableIndex | CombinedTableIndex | None:
+        """ Returns the secondary indexes written with the table file by the staging layer, if they are up to date. """
+        _, index = cls._load()
+        return index
+
+    @classmethod
+    def _load(cls, date_from: str | None = None, date_to: str | None = None) -> tuple[pd.DataFrame, TableIndex | CombinedTableIndex | None]:
+        """
+        Returns the DataFrame and index of the table. For a partitioned table, only the partitions which may
+        contain rows in the date range are loaded. Each file is cached until it changes.
+        """
+        handler = cls._get_file_handler()
+        if isinstance(handler, PartitionedFileHandler):
+            keys = handler.select_partitions(date_from, date_to)
+            logger.debug(f"Loading partitions {keys} of table {cls.__name__}.")
+            handlers = [handler.partition_handler(key) for key in keys]
+        else:
+            handlers = [handler]
+
+        entries = [cls._load_file(file_handler) for file_handler in handlers]
+        if not entries:
+            return cls._load_table(None), None
+        if len(entries) == 1:
+            return entries[0]
+        df = pd.concat([df for df, _ in entries], ignore_index=True)
+        indexes = [index for _, index in entries]
+        if any(index is None for index in indexes):
+            return df, None
+        return df, CombinedTableIndex(indexes, [len(df) for df, _ in entries])
+
+    @classmethod
+    def _get_file_handler(cls) -> BaseFileHandler:
+        """ Returns the handler of the table file (partitioned if the staging layer writes the table as partitions). """
         if cls.__file_name__ is None:
             logger.error(f"File name for {cls.__name__} is not defined.")
             raise ValueError(f"File name for {cls.__name__} is not defined.")
@@ -40,11 +96,79 @@ class BaseTable(ABC):
             path = cls._repo_path / "staging" / cls.__sport__ / cls.__file_name__
             logger.debug(f"Creating file handler for table {cls.__name__} at path: {path}")
             cls._file_handler = FileHandlerFactory.create_file_handler(path)
+        return cls._file_handler
+
+    @classmethod
+    def _load_file(cls, handler: BaseFileHandler) -> tuple[pd.DataFrame, TableIndex | None]:
+        """ Returns the cached DataFrame and index of a table file, (re)loading them if the file changed. """
+        cache_key = cls._get_cache_key(handler)
+        table_cache = BaseTable._cache.setdefault(cls.__name__, {})
+        cached = table_cache.get(handler.path)
+        if cached is not None and cached[0] == cache_key:
+            logger.debug(f"Using cached DataFrame for table {cls.__name__} ({handler.path.name}).")
+            return cached[1], cached[2]
+
+        df = cls._load_table(handler)
+        index = TableIndex.load(handler.path)
+        if index is None:
+            logger.debug(f"No up-to-date index for {handler.path}, queries will scan the whole file.")
+        table_cache[handler.path] = (cache_key, df, index)
+        return df, index
+
+    @staticmethod
+    def _take(df: pd.DataFrame, positions: np.ndarray | None = None) -> pd.DataFrame:
+        """ Returns a copy of the rows at the given positions (of every row if None). """
+        if positions is None:
+            return df.copy()
+        return df.iloc[positions].copy()
 
-        df = cls._file_handler.read()
-        if df.empty:
-            logger.warning(f"The table {cls.__name__} is empty.")
-            return df
+    @classmethod
+    def _index_lookup(cls, index: TableIndex | CombinedTableIndex | None, column: str, values: list) -> np.ndarray | None:
+        """ Returns the positions of the rows whose column is in values, or None if the column is not indexed. """
+        source = cls.__columns__[column]["source"]
+        if index is None or source not in index:
+            return None
+        return index.lookup(source, values)
+
+    @classmethod
+    def _index_range(cls, index: TableIndex | CombinedTableIndex | None, column: str, date_from: str | None = None, date_to: str | None = None) -> np.ndarray | None:
+        """ Returns the positions of the rows whose date column may be in the range, or None if it is not indexed. """
+        source = cls.__columns__[column]["source"]
+        if index is None or source not in index or (date_from is None and date_to is None):
+            return None
+        return index.lookup_range(source, date_from, date_to)
+
+    @staticmethod
+    def _intersect(*positions: np.ndarray | None) -> np.ndarray | None:
+        """ Intersects row positions, None meaning every row. """
+        result = None
+        for rows in positions:
+            if rows is None:
+                continue
+            result = rows if result is None else np.intersect1d(result, rows, assume_unique=True)
+        return result
+
+    @staticmethod
+    def _get_cache_key(handler: BaseFileHandler) -> tuple:
+        """ Return the key identifying the current version of a table file (path, mtime and size). """
+        path = handler.path
+        if not path.exists():
+            return (path, None, None)
+        stat = path.stat()
+        return (path, stat.st_mtime_ns, stat.st_size)
+
+    @classmethod
+    def _load_table(cls, handler: BaseFileHandler | None) -> pd.DataFrame:
+        """ Read a table file and convert its columns to the declared types (an empty table is returned without file). """
+        source_columns = [props["source"] for props in cls.__columns__.values() if props["source"] is not None]
+        if handler is None:
+            df = pd.DataFrame(columns=source_columns)
+        else:
+            logger.debug(f"Loading table {cls.__name__} from {handler.path}.")
+            df = handler.read(columns=source_columns)
+            if df.empty:
+                logger.warning(f"The table {cls.__name__} is empty ({handler.path}).")
+                df = pd.DataFrame(columns=source_columns)
         df = cls._as_types(df, cls.__columns__)
         return df
 
@@ -69,6 +193,8 @@ class BaseTable(ABC):
             if not col_type:
                 logger.warning(f"Column '{col}' has no type specified, skipping conversion.")
                 continue
+            if BaseTable._has_type(df[col], col_type):
+                continue
 
             try:
                 if col_type == "int":
@@ -87,3 +213,14 @@ class BaseTable(ABC):
                 raise
         
         return df[[col for col in columns if col in df]]
+
+    @staticmethod
+    def _has_type(series: pd.Series, col_type: str) -> bool:
+        """ Check if a column is already stored with the expected type (e.g. read from a typed file). """
+        if col_type == "int":
+            return series.dtype == "Int64"
+        if col_type == "float":
+            return series.dtype == float
+        if col_type == "bool":
+            return series.dtype == "boolean" or series.dtype == bool
+        return False
@@ -5,7 +5,7 @@ from .base import BaseTable
 
 class F1EventsTable(BaseTable):
     """ Table for storing F1 event data. """
-    __file_name__ = "events.csv"
+    __file_name__ = "events.parquet"
     __columns__ = {
         "id": {"type": "int", "source": "session_id"},
         "name": {"type": "str", "source": "short_name"},
@@ -24,7 +24,12 @@ class F1EventsTable(BaseTable):
         date_to: str | None = None
     ) -> pd.DataFrame:
         """ Query F1 events by IDs and optional date range. """
-        df = cls.get_table()
+        df, index = cls._load(date_from, date_to)
+        positions = cls._intersect(
+            cls._index_lookup(index, 'id', ids) if ids is not None else None,
+            cls._index_range(index, 'date_time', date_from, date_to)
+        )
+        df = cls._take(df, positions)
         if ids is not None:
             df = df[df['id'].isin(ids)]
         if date_from is not None:
@@ -1,13 +1,15 @@
+import numpy as np
 import pandas as pd
 
 from .base import BaseTable
+from sports_calendar.sc_core.file_io import BaseFileHandler, TableIndex, CombinedTableIndex
 
 
 ## Models
 
 class FootballRegionsTable(BaseTable):
     """ Table for storing football region data. """
-    __file_name__ = "regions.csv"
+    __file_name__ = "regions.parquet"
     __columns__ = None
     __sport__ = "football"
 
@@ -18,7 +20,7 @@ class FootballRegionsTable(BaseTable):
 
 class FootballCompetitionsTable(BaseTable):
     """ Table for storing football competition data. """
-    __file_name__ = "competitions.csv"
+    __file_name__ = "competitions.parquet"
     __columns__ = {
         "id": {"type": "int", "source": "id"},
         "name": {"type": "str", "source": "name"},
@@ -33,14 +35,16 @@ class FootballCompetitionsTable(BaseTable):
     @classmethod
     def query(cls, ids: list | None = None) -> pd.DataFrame:
         """ Query competitions by IDs. """
-        df = cls.get_table()
+        df, index = cls._load()
+        positions = cls._index_lookup(index, 'id', ids) if ids is not None else None
+        df = cls._take(df, positions)
         if ids is not None:
             df = df[df['id'].isin(ids)]
         return df
 
 class FootballTeamsTable(BaseTable):
     """ Table for storing football team data. """
-    __file_name__ = "teams.csv"
+    __file_name__ = "teams.parquet"
     __columns__ = {
         "id": {"type": "int", "source": "id"},
         "name": {"type": "str", "source": "name"},
@@ -54,14 +58,16 @@ class FootballTeamsTable(BaseTable):
     @classmethod
     def query(cls, ids: list | None = None) -> pd.DataFrame:
         """ Query teams by IDs. """
-        df = cls.get_table()
+        df, index = cls._load()
+        positions = cls._index_lookup(index, 'id', ids) if ids is not None else None
+        df = cls._take(df, positions)
         if ids is not None:
             df = df[df['id'].isin(ids)]
         return df
 
 class FootballMatchesTable(BaseTable):
     """ Table for storing football match data. """
-    __file_name__ = "matches.csv"
+    __file_name__ = "matches.parquet"
     __columns__ = {
         "id": {"type": "int", "source": "id"},
         "competition_id": {"type": "int", "source": "competition_id"},
@@ -76,9 +82,9 @@ class FootballMatchesTable(BaseTable):
     __sport__ = "football"
 
     @classmethod
-    def get_table(cls) -> pd.DataFrame:
-        """ Returns the matches table as a DataFrame. """
-        df = super().get_table()
+    def _load_table(cls, handler: BaseFileHandler | None) -> pd.DataFrame:
+        """ Loads the matches table with an additional date column. """
+        df = super()._load_table(handler)
         temp_col = pd.to_datetime(df['date_time'], errors='coerce', utc=True)
         df['date'] = temp_col.dt.date # Bricolage...
         return df
@@ -92,24 +98,70 @@ class FootballMatchesTable(BaseTable):
         date_from: str | None = None,
         date_to: str | None = None
     ) -> pd.DataFrame:
-        """ Query matches by various filters. """
-        df = cls.get_table()
+        """ Query matches by various filters (only the partitions of the date range are read). """
+        df, index = cls._load(date_from, date_to)
+        positions = cls._intersect(
+            cls._index_lookup(index, 'id', ids) if ids is not None else None,
+            cls._index_lookup(index, 'competition_id', competition_ids) if competition_ids is not None else None,
+            cls._team_positions(index, team_ids) if team_ids is not None else None,
+            cls._index_range(index, 'date_time', date_from, date_to)
+        )
+        df = cls._take(df, positions)
         if ids is not None:
             df = df[df['id'].isin(ids)]
         if competition_ids is not None:
             df = df[df['competition_id'].isin(competition_ids)]
         if team_ids is not None:
             df = df[(df['home_team_id'].isin(team_ids)) | (df['away_team_id'].isin(team_ids))]
+        return cls._filter_dates(df, date_from, date_to)
+
+    @classmethod
+    def query_any(
+        cls,
+        competition_ids: list | None = None,
+        team_ids: list | None = None,
+        date_from: str | None = None,
+        date_to: str | None = None
+    ) -> pd.DataFrame:
+        """ Query the matches played in any of the competitions or by any of the teams. """
+        competition_ids = competition_ids or []
+        team_ids = team_ids or []
+        df, index = cls._load(date_from, date_to)
+        competition_positions = cls._index_lookup(index, 'competition_id', competition_ids)
+        team_positions = cls._team_positions(index, team_ids)
+        any_positions = None
+        if competition_positions is not None and team_positions is not None:
+            any_positions = np.union1d(competition_positions, team_positions)
+        df = cls._take(df, cls._intersect(any_positions, cls._index_range(index, 'date_time', date_from, date_to)))
+        mask = (
+            df['competition_id'].isin(competition_ids)
+            | df['home_team_id'].isin(team_ids)
+            | df['away_team_id'].isin(team_ids)
+        )
+        return cls._filter_dates(df[mask.fillna(False).astype(bool)], date_from, date_to)
+
+    @classmethod
+    def _team_positions(cls, index: TableIndex | CombinedTableIndex | None, team_ids: list) -> np.ndarray | None:
+        """ Returns the positions of the matches of the teams, or None if the team columns are not indexed. """
+        home_positions = cls._index_lookup(index, 'home_team_id', team_ids)
+        away_positions = cls._index_lookup(index, 'away_team_id', team_ids)
+        if home_positions is None or away_positions is None:
+            return None
+        return np.union1d(home_positions, away_positions)
+
+    @staticmethod
+    def _filter_dates(df: pd.DataFrame, date_from: str | None = None, date_to: str | None = None) -> pd.DataFrame:
+        """ Filters the matches on their date and drops the helper date column. """
         if date_from is not None:
-            df = df[df['date'] >= pd.to_datetime(date_from)]
+            df = df[df['date'] >= pd.to_datetime(date_from).date()]
         if date_to is not None:
-            df = df[df['date'] <= pd.to_datetime(date_to)]
-        df.drop(columns=['date'], inplace=True)
+            df = df[df['date'] <= pd.to_datetime(date_to).date()]
+        df = df.drop(columns=['date'])
         return df.reset_index(drop=True)
 
 class FootballStandingsTable(BaseTable):
     """ Table for storing football standings data. """
-    __file_name__ = "standings.csv"
+    __file_name__ = "standings.parquet"
     __columns__ = {
         "id": {"type": "int", "source": None},
         "competition_id": {"type": "int", "source": "competition_id"},
@@ -133,7 +185,12 @@ class FootballStandingsTable(BaseTable):
         team_ids: list | None = None
     ) -> pd.DataFrame:
         """ Query standings by competition and team IDs. """
-        df = cls.get_table()
+        df, index = cls._load()
+        positions = cls._intersect(
+            cls._index_lookup(index, 'competition_id', competition_ids) if competition_ids is not None else None,
+            cls._index_lookup(index, 'team_id', team_ids) if team_ids is not None else None
+        )
+        df = cls._take(df, positions)
         if competition_ids is not None:
             df = df[df['competition_id'].isin(competition_ids)]
         if team_ids is not None:
@@ -161,8 +218,31 @@ class FootballMatchesManager:
             date_from=date_from,
             date_to=date_to
         )
-        teams_df = FootballTeamsTable.query().add_prefix('team_')
-        competitions_df = FootballCompetitionsTable.query().add_prefix('competition_')
+        return FootballMatchesManager._add_context(matches)
+
+    @staticmethod
+    def query_any(
+        competition_ids: list | None = None,
+        team_ids: list | None = None,
+        date_from: str | None = None,
+        date_to: str | None = None
+    ) -> pd.DataFrame:
+        """ Query football matches with context, played in any of the competitions or by any of the teams. """
+        matches = FootballMatchesTable.query_any(
+            competition_ids=competition_ids,
+            team_ids=team_ids,
+            date_from=date_from,
+            date_to=date_to
+        )
+        return FootballMatchesManager._add_context(matches)
+
+    @staticmethod
+    def _add_context(matches: pd.DataFrame) -> pd.DataFrame:
+        """ Join the teams and the competition of the matches. """
+        team_ids = pd.concat([matches['home_team_id'], matches['away_team_id']]).dropna().unique().tolist()
+        teams_df = FootballTeamsTable.query(ids=team_ids).add_prefix('team_')
+        competition_ids = matches['competition_id'].dropna().unique().tolist()
+        competitions_df = FootballCompetitionsTable.query(ids=competition_ids).add_prefix('competition_')
 
         full_matches = matches.merge(
             teams_df.add_prefix('home_'),
@@ -1,6 +1,12 @@
+from typing import Iterator
+
+import pandas as pd
+
+from . import logger
 from .selection import Selection
 from .selection.selection_resolvers import SelectionResolverFactory
 from .calendar.sports_calendar import SportsEventCollection
+from .calendar.sports_calendar.events import SportsEvent
 from .calendar.sports_calendar.event_transformers import EventTransformerFactory
 
 
@@ -11,13 +17,38 @@ class SelectionRunner:
         self.selection = selection
 
     def run(self, date_from: str | None = None, date_to: str | None = None) -> SportsEventCollection:
-        """ TODO """
+        """ Resolve the selection items (one query per sport) and transform their events, in the order of the items. """
+        item_events = self.resolve(date_from, date_to)
         events = SportsEventCollection()
-        for item in self.selection:
-            resolver = SelectionResolverFactory.create_resolver(item.sport)
-            item_events = resolver.get_events(item, date_from, date_to)
+        for item, df in zip(self.selection, item_events):
             transformer = EventTransformerFactory.create_transformer(item.sport)
-            events.extend(transformer.batch_transform(item_events))
+            events.extend(transformer.batch_transform(df))
         # Deduplicate events
         events.drop_duplicates(inplace=True)
         return events
+
+    def iter_events(self, date_from: str | None = None, date_to: str | None = None, chunk_size: int = 10_000) -> Iterator[SportsEvent]:
+        """ Yield the deduplicated events of the selection chunk by chunk (only their identity keys are kept, to stream large feeds). """
+        seen = set()
+        for item, df in zip(self.selection, self.resolve(date_from, date_to)):
+            transformer = EventTransformerFactory.create_transformer(item.sport)
+            for event in transformer.iter_transform(df, chunk_size=chunk_size):
+                key = event.identity_key()
+                if key not in seen:
+                    seen.add(key)
+                    yield event
+
+    def resolve(self, date_from: str | None = None, date_to: str | None = None) -> list[pd.DataFrame]:
+        """ Plan the queries of the selection: the items are grouped by sport and each group is resolved at once. """
+        items_by_sport: dict[str, list[int]] = {}
+        for position, item in enumerate(self.selection):
+            items_by_sport.setdefault(item.sport, []).append(position)
+
+        item_events: list[pd.DataFrame | None] = [None] * len(self.selection.items)
+        for sport, positions in items_by_sport.items():
+            logger.debug(f"Resolving {len(positions)} {sport} selection items with a single query.")
+            resolver = SelectionResolverFactory.create_resolver(sport)
+            results = resolver.get_events_batch([self.selection.items[p] for p in positions], date_from, date_to)
+            for position, df in zip(positions, results):
+                item_events[position] = df
+        return item_events
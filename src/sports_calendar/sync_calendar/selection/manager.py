@@ -28,3 +28,7 @@ class SelectionManager:
             logger.error(f"Selection '{name}' not found.")
             raise KeyError(f"Selection '{name}' not found.")
         return self.selections[name]
+
+    def names(self) -> list[str]:
+        """ Return the names of all the loaded selections. """
+        return sorted(self.selections)
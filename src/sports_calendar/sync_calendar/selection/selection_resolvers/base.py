@@ -15,14 +15,35 @@ class SelectionResolver(ABC):
 
     def get_events(self, selection_item: SelectionItem, date_from: str | None = None, date_to: str | None = None) -> pd.DataFrame:
         """ Get events for a selection item within a date range. """
-        events = self.get_all_events(selection_item, date_from, date_to)
-        if events.empty:
-            return pd.DataFrame()
-        for filter in selection_item.filters:
-            events = self.filter_applier.apply(filter, events)
-        return events
+        return self.get_events_batch([selection_item], date_from, date_to)[0]
+
+    def get_events_batch(self, selection_items: list[SelectionItem], date_from: str | None = None, date_to: str | None = None) -> list[pd.DataFrame]:
+        """
+        Get the events of several selection items of the same sport within a date range: a single query is run
+        for all the items, then each item takes its own part of the shared result and applies its filters.
+        """
+        if not selection_items:
+            return []
+        shared_events = self.get_shared_events(selection_items, date_from, date_to)
+        if shared_events.empty:
+            return [pd.DataFrame() for _ in selection_items]
+        partitions = self.partition_events(selection_items, shared_events)
+        results = []
+        for selection_item, events in zip(selection_items, partitions):
+            if events.empty:
+                results.append(pd.DataFrame())
+                continue
+            for filter in selection_item.filters:
+                events = self.filter_applier.apply(filter, events)
+            results.append(events)
+        return results
+
+    @abstractmethod
+    def get_shared_events(self, selection_items: list[SelectionItem], date_from: str | None = None, date_to: str | None = None) -> pd.DataFrame:
+        """ Fetch, in one query, all possible events of the selection items for the date range. """
+        raise NotImplementedError(f"{self.__class__.__name__} must implement get_shared_events.")
 
     @abstractmethod
-    def get_all_events(self, selection_item: SelectionItem, date_from: str | None = None, date_to: str | None = None) -> pd.DataFrame:
-        """Fetch all possible events for this selection item and date range."""
-        raise NotImplementedError(f"{self.__class__.__name__} must implement get_all_events.")
+    def partition_events(self, selection_items: list[SelectionItem], shared_events: pd.DataFrame) -> list[pd.DataFrame]:
+        """ Split the shared events into the events of each selection item (same order as the items). """
+        raise NotImplementedError(f"{self.__class__.__name__} must implement partition_events.")
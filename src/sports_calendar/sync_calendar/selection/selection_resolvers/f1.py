@@ -13,9 +13,13 @@ class F1SelectionResolver(SelectionResolver):
         """ Initialize the resolver with an F1-specific filter applier. """
         super().__init__(filter_applier)
 
-    def get_all_events(self, selection_item: SelectionItem, date_from=None, date_to=None) -> pd.DataFrame:
-        """ Fetch all possible F1 events for this selection item and date range. """
+    def get_shared_events(self, selection_items: list[SelectionItem], date_from=None, date_to=None) -> pd.DataFrame:
+        """ Fetch all possible F1 events for the date range (F1 items are not restricted to an entity). """
         return F1EventsTable.query(
             date_from=date_from,
             date_to=date_to
         )
+
+    def partition_events(self, selection_items: list[SelectionItem], shared_events: pd.DataFrame) -> list[pd.DataFrame]:
+        """ Every F1 item starts from all the events of the date range. """
+        return [shared_events for _ in selection_items]
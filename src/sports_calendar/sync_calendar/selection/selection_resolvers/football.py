@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 
 from .base import SelectionResolver
@@ -13,13 +14,40 @@ class FootballSelectionResolver(SelectionResolver):
         """ Initialize the resolver with a football-specific filter applier. """
         super().__init__(filter_applier)
 
-    def get_all_events(self, selection_item: SelectionItem, date_from=None, date_to=None) -> pd.DataFrame:
-        """ Fetch all possible football events for this selection item and date range. """
-        team_ids = [selection_item.entity_id] if selection_item.entity == 'team' else None
-        competition_ids = [selection_item.entity_id] if selection_item.entity == 'competition' else None
-        return FootballMatchesManager.query(
+    def get_shared_events(self, selection_items: list[SelectionItem], date_from=None, date_to=None) -> pd.DataFrame:
+        """ Fetch, with a single join, the matches of every team and competition of the items. """
+        if any(item.entity is None for item in selection_items):
+            # An item without entity selects every match of the date range
+            return FootballMatchesManager.query(date_from=date_from, date_to=date_to)
+        team_ids = sorted({item.entity_id for item in selection_items if item.entity == 'team'})
+        competition_ids = sorted({item.entity_id for item in selection_items if item.entity == 'competition'})
+        return FootballMatchesManager.query_any(
             team_ids=team_ids,
             competition_ids=competition_ids,
             date_from=date_from,
             date_to=date_to
         )
+
+    def partition_events(self, selection_items: list[SelectionItem], shared_events: pd.DataFrame) -> list[pd.DataFrame]:
+        """ Select the matches of the team / competition of each item, using row positions grouped by id. """
+        positions = {
+            'competition': shared_events.groupby('competition_id', sort=False).indices,
+            'home_team': shared_events.groupby('home_team_id', sort=False).indices,
+            'away_team': shared_events.groupby('away_team_id', sort=False).indices,
+        }
+        empty = np.array([], dtype=np.intp)
+
+        partitions = []
+        for item in selection_items:
+            if item.entity is None:
+                partitions.append(shared_events)
+                continue
+            if item.entity == 'competition':
+                rows = positions['competition'].get(item.entity_id, empty)
+            else:
+                rows = np.union1d(  # Sorted, so the matches keep the order of the table
+                    positions['home_team'].get(item.entity_id, empty),
+                    positions['away_team'].get(item.entity_id, empty)
+                )
+            partitions.append(shared_events.iloc[rows].reset_index(drop=True))
+        return partitions
@@ -1,4 +1,4 @@
 import logging
 logger = logging.getLogger(__name__)
 
-from .cli import sync_db
\ No newline at end of file
+from .cli import sync_db, migrate_landing
\ No newline at end of file
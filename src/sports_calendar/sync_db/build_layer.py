@@ -2,8 +2,9 @@ from __future__ import annotations
 
 from . import logger
 from .order_models import ModelOrder
+from .scheduler import DagScheduler
 from .managers import ModelManager
-from .definitions.specs import LayerSpec
+from .definitions.specs import LayerSpec, ModelSpec
 
 
 class LayerBuilder:
@@ -15,15 +16,29 @@ class LayerBuilder:
         self.models_order = ModelOrder(self.layer_spec.models, self.layer_spec.stage)
         logger.debug(f"Initialized LayerBuilder with layer spec ({self.layer_spec}) and models order ({self.models_order}).")
 
-    def build(self, **kwargs) -> None:
-        """ TODO """
+    def build(self, workers: int = 1, **kwargs) -> None:
+        """ Build the models of the layer, running up to `workers` independent models at the same time. """
         logger.info(f"Building layer '{self.layer_spec.stage}'.")
-        for model_spec in self.models_order:
-            try:
-                logger.debug(f"Building model: {model_spec.name} in layer '{self.layer_spec.stage}'")
-                model_manager = ModelManager(model_spec)
-                model_manager.run(**kwargs)
-            except Exception:
-                logger.exception(f"Error processing model {model_spec.name} in layer '{self.layer_spec.stage}'. Marking as failed.")
-                self.models_order.mark_failed(model_spec)
+        if workers > 1:
+            self._build_concurrently(workers, **kwargs)
+        else:
+            for model_spec in self.models_order:
+                try:
+                    self._run_model(model_spec, **kwargs)
+                except Exception:
+                    logger.exception(f"Error processing model {model_spec.name} in layer '{self.layer_spec.stage}'. Marking as failed.")
+                    self.models_order.mark_failed(model_spec)
         logger.info(f"Completed building layer '{self.layer_spec.stage}'.")
+
+    def _build_concurrently(self, workers: int, **kwargs) -> None:
+        """ Dispatch every ready model on a thread pool and schedule the dependents as soon as they are unblocked. """
+        logger.debug(f"Building layer '{self.layer_spec.stage}' with {workers} workers.")
+        scheduler = DagScheduler(self.models_order, workers=workers, name=f"sync-db-{self.layer_spec.stage}")
+        scheduler.run(lambda model_spec: self._run_model(model_spec, **kwargs))
+        scheduler.report()
+
+    def _run_model(self, model_spec: ModelSpec, **kwargs) -> None:
+        """ Run a single model of the layer. """
+        logger.debug(f"Building model: {model_spec.name} in layer '{self.layer_spec.stage}'")
+        model_manager = ModelManager(model_spec)
+        model_manager.run(**kwargs)
@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+from . import logger
+from .order_models import WorkflowOrder
+from .scheduler import DagScheduler
+from .managers import ModelManager
+from .definitions.specs import LayerSpec, ModelSpec
+
+
+class WorkflowBuilder:
+    """ Build several layers as a single DAG, so that a model starts as soon as its own dependencies are built. """
+
+    def __init__(self, layer_specs: list[LayerSpec]):
+        """ Initialize the WorkflowBuilder with the layer specifications to build. """
+        self.layer_specs = layer_specs
+        self.models_order = WorkflowOrder(layer_specs)
+        logger.debug(f"Initialized WorkflowBuilder with layers ({[str(layer.stage) for layer in layer_specs]}).")
+
+    def build(self, workers: int = 1, **kwargs) -> None:
+        """ Build all the models of the layers, running up to `workers` models at the same time. """
+        stages = ", ".join(str(layer.stage) for layer in sorted(self.layer_specs, key=lambda layer: layer.stage))
+        logger.info(f"Building layers: {stages}.")
+        scheduler = DagScheduler(self.models_order, workers=workers, name="sync-db")
+        scheduler.run(lambda model_spec: self._run_model(model_spec, **kwargs))
+        scheduler.report()
+        logger.info(f"Completed building layers: {stages}.")
+
+    def _run_model(self, model_spec: ModelSpec, **kwargs) -> None:
+        """ Run a single model of the workflow. """
+        logger.debug(f"Building model: {model_spec.name} in layer '{self.models_order.stages[model_spec.name]}'")
+        model_manager = ModelManager(model_spec)
+        model_manager.run(**kwargs)
@@ -1,6 +1,7 @@
 import typer
 
 from .main import run_pipeline
+from .migrate import migrate_landing_to_jsonl
 from sports_calendar.sc_core import DataStage
 from sports_calendar.sc_core.cli_helpers import (
     parse_stage,
@@ -18,12 +19,26 @@ def main(
     stage: str | None = typer.Option(None, "--stage", callback=parse_stage, help="Specify the stage to run the pipeline on (default is all stages). Valid values are " + ", ".join(DataStage.as_str())),
     model: str | None = typer.Option(None, "--model", help=f"Specify the model to run the pipeline on (stage must be specified)."),
     reset: bool = typer.Option(False, "--reset"),
-    dry_run: bool = typer.Option(False, "--dry-run")
+    dry_run: bool = typer.Option(False, "--dry-run"),
+    workers: int = typer.Option(1, "--workers", min=1, help="Number of models of a stage to run concurrently (models are only started once their dependencies are built)."),
+    offline: bool = typer.Option(False, "--offline", help="Replay the cached HTTP responses instead of calling the APIs and websites.")
 ):
     """ Run the data pipeline. """
     run_pipeline(
         stage=stage,
         model=model,
         reset=reset,
-        dry_run=dry_run
+        dry_run=dry_run,
+        workers=workers,
+        offline=offline
     )
+
+
+migrate_landing = typer.Typer(help="Commands to migrate existing landing files to the current storage format.")
+
+@migrate_landing.callback(invoke_without_command=True)
+def migrate(
+    keep_source: bool = typer.Option(False, "--keep-source", help="Keep the original JSON files after conversion.")
+):
+    """ Convert JSON landing files to JSON Lines. """
+    migrate_landing_to_jsonl(keep_source=keep_source)
@@ -1,5 +1,6 @@
 import logging
 logger = logging.getLogger(__name__)
 
-from .api import ESPNApiClient, FootballDataApiClient
-from .web import LiveSoccerScraper, FootballRankingScraper
\ No newline at end of file
+from .api import BaseApiClient, ESPNApiClient, FootballDataApiClient
+from .web import BaseScraper, LiveSoccerScraper, FootballRankingScraper
+from .response_cache import ResponseCache
@@ -1,3 +1,4 @@
 from .. import logger
+from .base_api_client import BaseApiClient
 from .espn_api_client import ESPNApiClient
 from .football_data_api_client import FootballDataApiClient
\ No newline at end of file
@@ -1,15 +1,83 @@
 import time
+import threading
+from urllib.parse import urlsplit
 
 import requests
+from requests.adapters import HTTPAdapter
 
 from . import logger
+from ..rate_limiter import TokenBucket, get_token_bucket, get_retry_delay
+from ..response_cache import ResponseCache
 
 
 class BaseApiClient:
     """ TODO """
 
-    def __init__(self, **kwargs):
+    pool_size: int = 16
+    timeout: float | tuple[float, float] = (5, 30)
+    rate_limit: float | None = None  # Requests per minute allowed by the provider (None = no limit)
+    rate_limit_burst: int = 1
+    cache_ttl: float = 0  # Seconds during which a cached response is used without revalidation
+
+    # Sessions are shared by all the clients of the same class (and pool size) for the whole run
+    _sessions: dict[tuple[type, int], requests.Session] = {}
+    _sessions_lock = threading.Lock()
+
+    def __init__(
+        self,
+        pool_size: int | None = None,
+        timeout: float | tuple[float, float] | None = None,
+        cache_ttl: float | None = None,
+        **kwargs
+    ):
         """ TODO """
+        self.pool_size = pool_size or self.pool_size
+        self.timeout = timeout or self.timeout
+        self.cache_ttl = cache_ttl if cache_ttl is not None else self.cache_ttl
+
+    @property
+    def session(self) -> requests.Session:
+        """ Return the long-lived pooled session of the client (created on first use). """
+        key = (type(self), self.pool_size)
+        with self._sessions_lock:
+            if key not in BaseApiClient._sessions:
+                logger.debug(f"Creating HTTP session for {type(self).__name__} with pool size {self.pool_size}.")
+                BaseApiClient._sessions[key] = self._create_session(self.pool_size)
+            return BaseApiClient._sessions[key]
+
+    def get_token_bucket(self, url: str) -> TokenBucket | None:
+        """ Return the token bucket of the host of the URL (shared by all the clients), if the client is rate limited. """
+        if self.rate_limit is None:
+            return None
+        return get_token_bucket(urlsplit(url).netloc, self.rate_limit, self.rate_limit_burst)
+
+    @staticmethod
+    def _check_quota(response: requests.Response, bucket: TokenBucket | None) -> None:
+        """ Pause the token bucket when the provider reports that no request is left in the current window. """
+        available = response.headers.get("X-Requests-Available-Minute")
+        if bucket is None or available is None or available.strip() != "0":
+            return
+        retry_delay = get_retry_delay(response)
+        if retry_delay:
+            logger.debug(f"Request quota exhausted, pausing requests for {retry_delay} seconds.")
+            bucket.pause(retry_delay)
+
+    @classmethod
+    def close_sessions(cls) -> None:
+        """ Close every pooled session (they are recreated on next use). """
+        with cls._sessions_lock:
+            for session in BaseApiClient._sessions.values():
+                session.close()
+            BaseApiClient._sessions.clear()
+
+    @staticmethod
+    def _create_session(pool_size: int) -> requests.Session:
+        """ Create a session keeping up to `pool_size` connections alive per host. """
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
 
     def query_api(
         self,
@@ -21,17 +89,45 @@ class BaseApiClient:
         request_interval: int = 0
     ) -> dict|None:
         """ TODO """
+        cached = ResponseCache.get(url, params)
+        if ResponseCache.offline:
+            if cached is None:
+                logger.error(f"Offline mode: no cached response for URL: {url}.")
+                return None
+            logger.debug(f"Offline mode: replaying cached response for URL: {url}.")
+            return cached.json()
+        if cached is not None and cached.age() < self.cache_ttl:
+            logger.debug(f"Using cached response for URL: {url} (age: {cached.age():.0f}s).")
+            return cached.json()
+        if cached is not None:
+            headers = {**(headers or {}), **cached.conditional_headers()}
+
         retries = 0
+        bucket = self.get_token_bucket(url)
         while retries < max_retries:
             try:
                 time.sleep(request_interval)
-                response = requests.get(url, params=params, headers=headers)
+                if bucket is not None:
+                    bucket.acquire()
+                response = self.session.get(url, params=params, headers=headers, timeout=self.timeout)
 
                 if response.status_code == 200:
-                    return response.json()
+                    self._check_quota(response, bucket)
+                    content = response.json()
+                    ResponseCache.put(url, params, response, self.cache_ttl)
+                    return content
+                elif response.status_code == 304 and cached is not None:
+                    logger.debug(f"Cached response still valid for URL: {url}.")
+                    ResponseCache.refresh(cached)
+                    return cached.json()
                 elif response.status_code == 429:
-                    logger.warning(f"Rate limit exceeded (status code 429). Attempt {retries}/{max_retries}. Retrying in {delay} seconds...")
-                    time.sleep(delay)
+                    retry_delay = get_retry_delay(response)
+                    retry_delay = delay if retry_delay is None else retry_delay
+                    logger.warning(f"Rate limit exceeded (status code 429). Attempt {retries}/{max_retries}. Retrying in {retry_delay} seconds...")
+                    if bucket is not None:
+                        bucket.pause(retry_delay)
+                    else:
+                        time.sleep(retry_delay)
                     retries += 1
                 else:
                     logger.error(f"Failed to fetch data from URL: {url}. Status code: {response.status_code}")
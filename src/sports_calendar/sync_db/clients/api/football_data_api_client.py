@@ -9,6 +9,8 @@ class FootballDataApiClient(BaseApiClient):
     """ TODO """
 
     base_url = "https://api.football-data.org/v4"
+    rate_limit = 10  # Free tier quota: 10 requests per minute
+    rate_limit_burst = 10
 
     def __init__(self, api_token: str = None, **kwargs):
         """ TODO """
@@ -34,7 +36,7 @@ class FootballDataApiClient(BaseApiClient):
         url_fragment = f"/teams/{team_id}/matches"
         url = f"{self.base_url}{url_fragment}"
         params = {"dateFrom": date_from, "dateTo": date_to}
-        response = self.query_api(url, params=params, headers=self.headers, request_interval=6)
+        response = self.query_api(url, params=params, headers=self.headers)
         if not response:
             return []
         return response.get("matches", [])
@@ -47,7 +49,7 @@ class FootballDataApiClient(BaseApiClient):
         url_fragment = f"/competitions/{competition_id}/matches"
         url = f"{self.base_url}{url_fragment}"
         params = {"dateFrom": date_from, "dateTo": date_to}
-        response = self.query_api(url, params=params, headers=self.headers, request_interval=6)
+        response = self.query_api(url, params=params, headers=self.headers)
         if not response:
             return []
         return response.get("matches", [])
@@ -56,7 +58,7 @@ class FootballDataApiClient(BaseApiClient):
         """ TODO """
         url_fragment = f"/competitions/{competition_id}/standings"
         url = f"{self.base_url}{url_fragment}"
-        response = self.query_api(url, headers=self.headers, request_interval=6)
+        response = self.query_api(url, headers=self.headers)
         if not response:
             return []
         return [response]
@@ -65,7 +67,7 @@ class FootballDataApiClient(BaseApiClient):
         """ TODO """
         url_fragment = "/competitions"
         url = f"{self.base_url}{url_fragment}"
-        response = self.query_api(url, headers=self.headers, request_interval=6)
+        response = self.query_api(url, headers=self.headers)
         if not response:
             return []
         return response.get("competitions", [])
@@ -74,7 +76,7 @@ class FootballDataApiClient(BaseApiClient):
         """ TODO """
         url_fragment = "/areas"
         url = f"{self.base_url}{url_fragment}"
-        response = self.query_api(url, headers=self.headers, request_interval=6)
+        response = self.query_api(url, headers=self.headers)
         if not response:
             return []
         return response.get("areas", [])
@@ -83,7 +85,7 @@ class FootballDataApiClient(BaseApiClient):
         """ TODO """
         url_fragment = f"/competitions/{competition_id}/teams"
         url = f"{self.base_url}{url_fragment}"
-        response = self.query_api(url, headers=self.headers, request_interval=6)
+        response = self.query_api(url, headers=self.headers)
         if not response:
             return []
         return response.get("teams", [])
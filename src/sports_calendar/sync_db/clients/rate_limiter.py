@@ -0,0 +1,44 @@
+import threading
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+import requests
+
+from . import logger
+from sports_calendar.sc_core import TokenBucket
+
+
+_buckets: dict[str, TokenBucket] = {}
+_buckets_lock = threading.Lock()
+
+def get_token_bucket(host: str, rate_per_minute: float, burst: int = 1) -> TokenBucket:
+    """ Return the token bucket of a host, shared by every client of the process. """
+    with _buckets_lock:
+        if host not in _buckets:
+            logger.debug(f"Creating token bucket for {host}: {rate_per_minute} requests per minute, burst of {burst}.")
+            _buckets[host] = TokenBucket(rate_per_minute, burst)
+        return _buckets[host]
+
+
+def get_retry_delay(response: requests.Response) -> float | None:
+    """ Return the number of seconds to wait before the next request according to the response headers. """
+    retry_after = response.headers.get("Retry-After")
+    if retry_after is not None:
+        try:
+            return max(0.0, float(retry_after))
+        except ValueError:
+            try:
+                retry_at = parsedate_to_datetime(retry_after)
+                return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+            except (TypeError, ValueError):
+                logger.warning(f"Invalid Retry-After header: {retry_after}.")
+
+    # football-data.org: seconds until the request counter of the current minute is reset
+    counter_reset = response.headers.get("X-RequestCounter-Reset")
+    if counter_reset is not None:
+        try:
+            return max(0.0, float(counter_reset))
+        except ValueError:
+            logger.warning(f"Invalid X-RequestCounter-Reset header: {counter_reset}.")
+
+    return None
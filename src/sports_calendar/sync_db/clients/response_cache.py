@@ -0,0 +1,143 @@
+from __future__ import annotations
+import json
+import hashlib
+import threading
+from pathlib import Path
+from datetime import datetime, timezone
+from dataclasses import dataclass, asdict
+
+import requests
+
+from . import logger
+from sports_calendar.sc_core import Paths
+
+
+@dataclass
+class CachedResponse:
+    """ Body and validators of a response stored in the cache. """
+    url: str
+    params: dict | None
+    body: str
+    fetched_at: str
+    etag: str | None = None
+    last_modified: str | None = None
+    replay_only: bool = False  # Stored for the offline mode only (client without cache TTL), never served online
+
+    def age(self) -> float:
+        """ Return the number of seconds since the response was fetched (or revalidated). """
+        return (datetime.now(timezone.utc) - datetime.fromisoformat(self.fetched_at)).total_seconds()
+
+    def json(self) -> dict:
+        """ Return the body parsed as JSON. """
+        return json.loads(self.body)
+
+    def conditional_headers(self) -> dict[str, str]:
+        """ Return the headers to revalidate the response with the server. """
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class ResponseCache:
+    """
+    On-disk cache of HTTP responses under `DB_DIR/.http_cache`, keyed by URL and query parameters.
+    The responses of clients without a cache TTL are stored as replay-only entries, and entries older than `max_age`
+    are evicted.
+
+    In offline mode, the clients never reach the network and only replay the cached responses, replay-only ones
+    included (they are never evicted in offline mode). Online, replay-only entries are neither served nor revalidated.
+    """
+    folder_name = ".http_cache"
+    max_age: float = 7 * 24 * 3600  # Seconds after which an entry is evicted (longer than the TTLs of the recipes)
+    offline: bool = False
+    _lock = threading.Lock()
+
+    @classmethod
+    def set_offline(cls, offline: bool = True) -> None:
+        """ Enable or disable the offline mode for the whole process. """
+        logger.debug(f"Setting response cache offline mode to {offline}.")
+        cls.offline = offline
+
+    @classmethod
+    def get(cls, url: str, params: dict | None = None) -> CachedResponse | None:
+        """ Return the cached response of the request, if any. """
+        path = cls._path(url, params)
+        if path is None or not path.exists():
+            return None
+        try:
+            cached = CachedResponse(**json.loads(path.read_text()))
+        except Exception as e:
+            logger.warning(f"Ignoring corrupted cache entry {path} for URL {url}: {e}")
+            return None
+        if cls.offline:
+            return cached
+        if cached.age() > cls.max_age:
+            logger.debug(f"Evicting expired cache entry {path} for URL {url} (age: {cached.age():.0f}s).")
+            path.unlink(missing_ok=True)
+            return None
+        return None if cached.replay_only else cached
+
+    @classmethod
+    def put(cls, url: str, params: dict | None, response: requests.Response, ttl: float) -> None:
+        """ Store the body and the validators of a successful response (replay-only if the client has no cache TTL). """
+        cls._write(CachedResponse(
+            url=url,
+            params=params,
+            body=response.text,
+            fetched_at=cls._now(),
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+            replay_only=ttl <= 0
+        ))
+
+    @classmethod
+    def refresh(cls, cached: CachedResponse) -> None:
+        """ Reset the age of a cached response after the server confirmed it didn't change (304). """
+        cached.fetched_at = cls._now()
+        cls._write(cached)
+
+    @classmethod
+    def prune(cls) -> int:
+        """ Remove the entries older than `max_age` (e.g. requests whose parameters change every day), return their number. """
+        if not Paths.is_initialized():
+            return 0
+        folder = Paths.DB_DIR / cls.folder_name
+        if not folder.exists():
+            return 0
+        threshold = datetime.now(timezone.utc).timestamp() - cls.max_age
+        removed = 0
+        with cls._lock:
+            for path in folder.glob("*.json"):
+                # An entry is rewritten when fetched or revalidated, so its modification time is its age
+                if path.stat().st_mtime < threshold:
+                    path.unlink(missing_ok=True)
+                    removed += 1
+        logger.debug(f"Removed {removed} expired entries from the response cache.")
+        return removed
+
+    @classmethod
+    def _write(cls, cached: CachedResponse) -> None:
+        """ Write a cache entry atomically. """
+        path = cls._path(cached.url, cached.params)
+        if path is None:
+            return
+        with cls._lock:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(".tmp")
+            tmp_path.write_text(json.dumps(asdict(cached)))
+            tmp_path.replace(path)
+
+    @classmethod
+    def _path(cls, url: str, params: dict | None) -> Path | None:
+        """ Return the path of the cache entry of a request (None when no database directory is configured). """
+        if not Paths.is_initialized():
+            return None
+        key = json.dumps([url, params or {}], sort_keys=True, default=str)
+        return Paths.DB_DIR / cls.folder_name / f"{hashlib.sha256(key.encode()).hexdigest()}.json"
+
+    @staticmethod
+    def _now() -> str:
+        return datetime.now(timezone.utc).isoformat(timespec="seconds")
@@ -1,3 +1,4 @@
 from .. import logger
+from .base_scraper import BaseScraper
 from .live_soccer_scraper import LiveSoccerScraper
 from .football_ranking_scraper import FootballRankingScraper
\ No newline at end of file
@@ -1,31 +1,111 @@
 import time
+import weakref
+import threading
 
 import cloudscraper
 from bs4 import BeautifulSoup
 
 from . import logger
+from ..rate_limiter import get_retry_delay
+from ..response_cache import ResponseCache
 
 class BaseScraper:
     """ TODO """
 
-    def __init__(self, **kwargs):
+    pool_size: int = 4
+    timeout: float | tuple[float, float] = (10, 60)
+    cache_ttl: float = 0  # Seconds during which a cached page is used without revalidation
+
+    # Scrapers are shared by all the clients of the same class (and pool size) running in the same thread, so the
+    # Cloudflare challenge is solved once per thread and the connections are kept alive. cloudscraper's challenge
+    # solving and cookies are not thread-safe, so a session is never used by two threads: the sessions are stored in
+    # thread-local storage and go away with their thread (e.g. the workers of a ClientProcessor run)
+    _local = threading.local()
+    _open_scrapers: weakref.WeakSet[cloudscraper.CloudScraper] = weakref.WeakSet()  # To close the live ones on teardown
+    _scrapers_lock = threading.Lock()
+
+    def __init__(
+        self,
+        pool_size: int | None = None,
+        timeout: float | tuple[float, float] | None = None,
+        cache_ttl: float | None = None,
+        **kwargs
+    ):
         """ TODO """
+        self.pool_size = pool_size or self.pool_size
+        self.timeout = timeout or self.timeout
+        self.cache_ttl = cache_ttl if cache_ttl is not None else self.cache_ttl
+
+    @property
+    def scraper(self) -> cloudscraper.CloudScraper:
+        """ Return the long-lived pooled scraper session of the client for the current thread (created on first use). """
+        scrapers = getattr(self._local, "scrapers", None)
+        if scrapers is None:
+            scrapers = self._local.scrapers = {}
+        key = (type(self), self.pool_size)
+        if key not in scrapers:
+            logger.debug(
+                f"Creating scraper session for {type(self).__name__} with pool size {self.pool_size} "
+                f"in thread {threading.current_thread().name}."
+            )
+            scrapers[key] = self._create_scraper(self.pool_size)
+            with self._scrapers_lock:
+                BaseScraper._open_scrapers.add(scrapers[key])
+        return scrapers[key]
+
+    @classmethod
+    def close_scrapers(cls) -> None:
+        """ Close every live scraper session (the ones of the current thread are recreated on next use). """
+        with cls._scrapers_lock:
+            scrapers = list(BaseScraper._open_scrapers)
+            BaseScraper._open_scrapers.clear()
+        for scraper in scrapers:
+            scraper.close()
+        BaseScraper._local.scrapers = {}
+
+    @staticmethod
+    def _create_scraper(pool_size: int) -> cloudscraper.CloudScraper:
+        """ Create a scraper keeping up to `pool_size` connections alive per host. """
+        scraper = cloudscraper.create_scraper()
+        for prefix in ("http://", "https://"):
+            # Resize the pool of the mounted adapters (keeps the TLS settings of cloudscraper's adapter)
+            scraper.get_adapter(prefix).init_poolmanager(pool_size, pool_size)
+        return scraper
 
     def scrape_url(self, url: str, max_retries: int = 3, delay: int = 15, request_interval: int = 0) -> BeautifulSoup|None:
         """ TODO """
+        cached = ResponseCache.get(url)
+        if ResponseCache.offline:
+            if cached is None:
+                logger.error(f"Offline mode: no cached page for URL: {url}.")
+                return None
+            logger.debug(f"Offline mode: replaying cached page for URL: {url}.")
+            return BeautifulSoup(cached.body, 'html.parser')
+        if cached is not None and cached.age() < self.cache_ttl:
+            logger.debug(f"Using cached page for URL: {url} (age: {cached.age():.0f}s).")
+            return BeautifulSoup(cached.body, 'html.parser')
+
         retries = 0
-        scraper = cloudscraper.create_scraper()
+        scraper = self.scraper
+        headers = cached.conditional_headers() if cached is not None else None
         while retries < max_retries:
             try:
                 time.sleep(request_interval)
-                response = scraper.get(url)
+                response = scraper.get(url, headers=headers, timeout=self.timeout)
 
                 if response.status_code == 200:
                     soup = BeautifulSoup(response.text, 'html.parser')
+                    ResponseCache.put(url, None, response, self.cache_ttl)
                     return soup
+                elif response.status_code == 304 and cached is not None:
+                    logger.debug(f"Cached page still valid for URL: {url}.")
+                    ResponseCache.refresh(cached)
+                    return BeautifulSoup(cached.body, 'html.parser')
                 elif response.status_code == 429:
-                    logger.warning(f"Rate limit exceeded (status code 429). Attempt {retries}/{max_retries}. Retrying in {delay} seconds...")
-                    time.sleep(delay)
+                    retry_delay = get_retry_delay(response)
+                    retry_delay = delay if retry_delay is None else retry_delay
+                    logger.warning(f"Rate limit exceeded (status code 429). Attempt {retries}/{max_retries}. Retrying in {retry_delay} seconds...")
+                    time.sleep(retry_delay)
                     retries += 1
                 else:
                     logger.error(f"Failed to fetch data from URL: {url}. Status code: {response.status_code}")
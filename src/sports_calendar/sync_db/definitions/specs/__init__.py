@@ -4,6 +4,6 @@ logger = logging.getLogger(__name__)
 from .main import WorkflowSpec
 from .layer import LayerSpec
 from .model import ModelSpec
-from .output import OutputSpec, ConstraintSpec, UniqueSpec, NonNullableSpec, CoerceSpec
+from .output import OutputSpec, ConstraintSpec, UniqueSpec, NonNullableSpec, CoerceSpec, IndexSpec, PartitionSpec
 from .processing import ProcessingStepSpec, ProcessingIOInfo
 from .source import SourceSpec
\ No newline at end of file
@@ -14,6 +14,7 @@ class UniqueSpec(SpecModel):
     field_sets: list[list[str]]
     version_col: str
     keep: Literal["first", "last"] = "last"
+    presorted: bool = False  # The rows are already in version order (e.g. appended over time), skip sorting them
 
 @dataclass
 class NonNullableSpec(SpecModel):
@@ -30,6 +31,32 @@ class CoerceSpec(SpecModel):
 
 ConstraintSpec = Union[UniqueSpec, NonNullableSpec, CoerceSpec]
 
+# ---- Index spec ----
+
+@dataclass
+class IndexSpec(SpecModel):
+    field: str
+    kind: Literal["hash", "month"] = "hash"
+
+    def validate(self) -> None:
+        """ Validate the index specification. """
+        if self.kind not in ("hash", "month"):
+            logger.error(f"Invalid kind '{self.kind}' for index on '{self.field}'. Expected 'hash' or 'month'.")
+            raise ValueError(f"Invalid kind '{self.kind}' for index on '{self.field}'. Expected 'hash' or 'month'.")
+
+# ---- Partition spec ----
+
+@dataclass
+class PartitionSpec(SpecModel):
+    field: str
+    kind: Literal["month", "year"] = "month"
+
+    def validate(self) -> None:
+        """ Validate the partition specification. """
+        if self.kind not in ("month", "year"):
+            logger.error(f"Invalid kind '{self.kind}' for partitioning on '{self.field}'. Expected 'month' or 'year'.")
+            raise ValueError(f"Invalid kind '{self.kind}' for partitioning on '{self.field}'. Expected 'month' or 'year'.")
+
 # ---- Output spec ----
 
 @dataclass
@@ -37,7 +64,23 @@ class OutputSpec(SpecModel):
     name: str
     path: Path
     layer: str
+    mode: Literal["merge", "append", "upsert"] = "merge"
     constraints: list[ConstraintSpec] = field(default_factory=list)
+    indexes: list[IndexSpec] = field(default_factory=list)
+    partitioning: PartitionSpec | None = None
+
+    def validate(self) -> None:
+        """ Validate the output specification. """
+        if self.mode not in ("merge", "append", "upsert"):
+            logger.error(f"Invalid mode '{self.mode}' for output '{self.name}'. Expected 'merge', 'append' or 'upsert'.")
+            raise ValueError(f"Invalid mode '{self.mode}' for output '{self.name}'. Expected 'merge', 'append' or 'upsert'.")
+        if self.mode == "upsert":
+            if not any(constraint.type == "unique" for constraint in self.constraints):
+                logger.error(f"Output '{self.name}' in 'upsert' mode requires a unique constraint to match the rows on.")
+                raise ValueError(f"Output '{self.name}' in 'upsert' mode requires a unique constraint to match the rows on.")
+            if self.partitioning is not None:
+                logger.error(f"Output '{self.name}' can't be partitioned in 'upsert' mode (partitions are already merged one by one).")
+                raise ValueError(f"Output '{self.name}' can't be partitioned in 'upsert' mode (partitions are already merged one by one).")
 
     def resolve_path(self, base_path: Path | str) -> None:
         base_path = Path(base_path)
@@ -1,39 +1,55 @@
 from . import logger
 from .definitions import load_workflow
 from .build_layer import LayerBuilder, ModelManager
+from .build_workflow import WorkflowBuilder
+from .clients import ResponseCache, BaseApiClient, BaseScraper
 from sports_calendar.sc_core import DataStage, Paths
 
 
 def run_pipeline(
     stage: DataStage | None = None,
     model: str | None = None,
+    workers: int = 1,
+    offline: bool = False,
     **kwargs
 ) -> None:
-    logger.debug(f"Running pipeline with stage: {stage}, model: {model}, kwargs: {kwargs}")
+    logger.debug(f"Running pipeline with stage: {stage}, model: {model}, workers: {workers}, offline: {offline}, kwargs: {kwargs}")
     workflow = load_workflow(strict=True)
+    ResponseCache.set_offline(offline)
+    if not offline:
+        ResponseCache.prune()
 
     workflow.resolve_paths(base_path=Paths.DB_DIR)
 
-    # Single model
-    if model:
-        logger.debug(f"Processing single model: {model} in stage: {stage}")
-        layer_spec = workflow.get(stage)
-        model_spec = layer_spec.get(model)        
-        if not model_spec:
-            logger.error(f"Model '{model}' not found in layer '{layer_spec.name}'.")
-            raise ValueError(f"Model '{model}' not found in layer '{layer_spec.name}'.")
-        try:
-            model_manager = ModelManager(model_spec)
-            model_manager.run(**kwargs)
-        except Exception:
-            logger.exception(f"Error processing model {model_spec.name} in layer '{layer_spec.name}'.")
+    try:
+        # Single model
+        if model:
+            logger.debug(f"Processing single model: {model} in stage: {stage}")
+            layer_spec = workflow.get(stage)
+            model_spec = layer_spec.get(model)        
+            if not model_spec:
+                logger.error(f"Model '{model}' not found in layer '{layer_spec.name}'.")
+                raise ValueError(f"Model '{model}' not found in layer '{layer_spec.name}'.")
+            try:
+                model_manager = ModelManager(model_spec)
+                model_manager.run(**kwargs)
+            except Exception:
+                logger.exception(f"Error processing model {model_spec.name} in layer '{layer_spec.name}'.")
 
-    # Multiple models
-    else:
-        logger.debug(f"Processing all models (stage: {stage}).")
-        stages = [stage] if stage is not None else DataStage.instances()
-        for _stage in stages:
-            logger.debug(f"Processing stage: {_stage}")
-            layer_spec = workflow.get(_stage)
+        # Single stage
+        elif stage is not None:
+            logger.debug(f"Processing all models of stage: {stage}")
+            layer_spec = workflow.get(stage)
             builder = LayerBuilder(layer_spec)
-            builder.build(**kwargs)
+            builder.build(workers=workers, **kwargs)
+
+        # All stages, scheduled as one DAG (cross-stage dependencies replace the barrier between stages)
+        else:
+            logger.debug("Processing all models of all stages.")
+            layer_specs = [workflow.get(_stage) for _stage in DataStage.instances()]
+            builder = WorkflowBuilder(layer_specs)
+            builder.build(workers=workers, **kwargs)
+    finally:
+        # Close the pooled HTTP sessions of the clients (kept alive for the whole run)
+        BaseApiClient.close_sessions()
+        BaseScraper.close_scrapers()
@@ -1,3 +1,4 @@
 from .. import logger
 from .enforcers import ConstraintEnforcer
 from .enforcer_factory import ConstraintEnforcerFactory
+from .plan import EnforcementPlan
@@ -23,13 +23,21 @@ class ConstraintEnforcer(Generic[S], ABC):
         if df.empty:
             logger.warning("Nothing to enforce: DataFrame is empty.")
             return df
-        return self._apply(df)
+        df, rows = self.enforce(df.copy(deep=False), np.arange(len(df)))
+        return take_rows(df, rows)
 
     @abstractmethod
-    def _apply(self, df: pd.DataFrame) -> pd.DataFrame:
-        """ Apply the specific enforcement logic to the DataFrame. """
+    def enforce(self, df: pd.DataFrame, rows: np.ndarray) -> tuple[pd.DataFrame, np.ndarray]:
+        """
+        Enforce the constraint on the rows of the DataFrame at the given positions, and return the DataFrame
+        (columns may be replaced, not modified in place) with the positions of the rows kept, in output order.
+        """
         raise NotImplementedError("Subclasses must implement this method.")
 
+    def describe(self) -> str:
+        """ Return a short description of the constraint, for logging. """
+        return self.spec.type
+
     @staticmethod
     def _check_df(df: pd.DataFrame) -> None:
         """ Check if df is valid, raise error if not. """
@@ -44,25 +52,49 @@ class UniqueEnforcer(ConstraintEnforcer[UniqueSpec]):
     def __init__(self, spec: UniqueSpec):
         super().__init__(spec)
 
-    def _apply(self, df: pd.DataFrame) -> pd.DataFrame:
-        """ Apply the specific enforcement logic to the DataFrame. """
+    def enforce(self, df: pd.DataFrame, rows: np.ndarray) -> tuple[pd.DataFrame, np.ndarray]:
+        """
+        One stable sort by version (ties keep their input order, so the rows appended last win with keep='last'),
+        then each field set is deduplicated on the rows kept by the previous ones, hashing only its own columns.
+        """
+        if not self.spec.presorted:
+            versions = pd.Series(df[self.spec.version_col].to_numpy()[rows])
+            rows = rows[versions.sort_values(ascending=True, kind="stable").index.to_numpy()]
         for field_set in self.spec.field_sets:
-            logger.debug(f"Enforcing uniqueness for field set: {field_set}")
-            df = df.sort_values(by=self.spec.version_col, ascending=True).drop_duplicates(subset=field_set, keep=self.spec.keep)
-        return df.reset_index(drop=True)
+            duplicated = df[field_set].iloc[rows].duplicated(keep=self.spec.keep).to_numpy()
+            rows = rows[~duplicated]
+            logger.debug(f"Enforcing uniqueness for field set {field_set}: {int(duplicated.sum())} duplicate rows dropped.")
+        return df, rows
+
+    def describe(self) -> str:
+        return f"unique {self.spec.field_sets}"
 
 
 class NonNullableEnforcer(ConstraintEnforcer[NonNullableSpec]):
     """ Enforces non-nullability in the DataFrame based on specified fields. """
 
+    NULL_TOKENS = ["nan", "None", ""]  # Nulls rendered as strings (e.g. by the sources or files written by earlier str casts)
+
     def __init__(self, spec: NonNullableSpec):
         super().__init__(spec)
 
-    def _apply(self, df: pd.DataFrame) -> pd.DataFrame:
-        """ Apply the specific enforcement logic to the DataFrame. """
-        pd.set_option('future.no_silent_downcasting', True)
-        df = df.replace({"nan": np.nan, "None": np.nan, "": np.nan})
-        return df.dropna(subset=self.spec.fields).reset_index(drop=True)
+    def enforce(self, df: pd.DataFrame, rows: np.ndarray) -> tuple[pd.DataFrame, np.ndarray]:
+        """ Drop the rows with a null in one of the fields, only the fields are read (their null tokens become NaN). """
+        missing = [field for field in self.spec.fields if field not in df.columns]
+        if missing:
+            logger.error(f"Non-nullable fields {missing} not found in DataFrame.")
+            raise KeyError(f"Non-nullable fields {missing} not found in DataFrame.")
+        nulls = np.zeros(len(df), dtype=bool)
+        for field in self.spec.fields:
+            column = df[field]
+            is_null = (column.isna() | column.isin(self.NULL_TOKENS)).to_numpy()
+            if is_null.any():
+                df[field] = column.mask(is_null)
+                nulls |= is_null
+        return df, rows[~nulls[rows]]
+
+    def describe(self) -> str:
+        return f"non-nullable {self.spec.fields}"
 
 
 class CoerceEnforcer(ConstraintEnforcer[CoerceSpec]):
@@ -79,8 +111,8 @@ class CoerceEnforcer(ConstraintEnforcer[CoerceSpec]):
     def __init__(self, spec: CoerceSpec):
         super().__init__(spec)
 
-    def _apply(self, df: pd.DataFrame) -> pd.DataFrame:
-        """ Apply the specific enforcement logic to the DataFrame. """
+    def enforce(self, df: pd.DataFrame, rows: np.ndarray) -> tuple[pd.DataFrame, np.ndarray]:
+        """ Cast the fields of the rows (the rows dropped before are removed first, they may not be castable). """
         if self.spec.cast_to not in self._CASTERS:
             logger.error(f"Unknown cast type: {self.spec.cast_to}")
             raise ValueError(f"Unknown cast type: {self.spec.cast_to}")
@@ -90,10 +122,27 @@ class CoerceEnforcer(ConstraintEnforcer[CoerceSpec]):
             if field not in df.columns:
                 logger.error(f"Field '{field}' not found in DataFrame.")
                 raise ValueError(f"Field '{field}' not found in DataFrame.")
+        if not is_identity(rows, len(df)):
+            df, rows = take_rows(df, rows), np.arange(len(rows))
+        for field in self.spec.fields:
             try:
                 df[field] = caster(df[field])
             except Exception as e:
                 logger.error(f"Failed to coerce field '{field}' to type '{self.spec.cast_to}': {e}")
                 raise ValueError(f"Failed to coerce field '{field}' to type '{self.spec.cast_to}': {e}")
 
+        return df, rows
+
+    def describe(self) -> str:
+        return f"coerce {self.spec.fields} to {self.spec.cast_to}"
+
+
+def is_identity(rows: np.ndarray, length: int) -> bool:
+    """ Check if the row positions select every row of a DataFrame of the given length, in order. """
+    return len(rows) == length and bool((rows == np.arange(length)).all())
+
+def take_rows(df: pd.DataFrame, rows: np.ndarray) -> pd.DataFrame:
+    """ Return the rows at the given positions with a fresh index (the DataFrame itself if it's every row in order). """
+    if is_identity(rows, len(df)):
         return df.reset_index(drop=True)
+    return df.iloc[rows].reset_index(drop=True)
@@ -0,0 +1,49 @@
+from __future__ import annotations
+from time import perf_counter
+from typing import TYPE_CHECKING
+
+import numpy as np
+import pandas as pd
+
+from . import logger
+from .enforcers import ConstraintEnforcer, take_rows
+from .enforcer_factory import ConstraintEnforcerFactory
+if TYPE_CHECKING:
+    from sports_calendar.sync_db.definitions.specs import ConstraintSpec
+
+
+class EnforcementPlan:
+    """
+    Enforce the constraints of an output in one pass: the enforcers narrow down the positions of the kept rows
+    and only replace the columns they reference, the rows are taken once at the end (or before a cast).
+    """
+
+    def __init__(self, enforcers: list[ConstraintEnforcer]):
+        self.enforcers = enforcers
+
+    def __repr__(self) -> str:
+        return f"EnforcementPlan({[enforcer.describe() for enforcer in self.enforcers]})"
+
+    @classmethod
+    def from_specs(cls, specs: list[ConstraintSpec]) -> EnforcementPlan:
+        """ Compile the plan of a list of constraint specifications, in their order. """
+        return cls([ConstraintEnforcerFactory.create_enforcer(spec) for spec in specs])
+
+    def apply(self, df: pd.DataFrame) -> pd.DataFrame:
+        """ Apply every constraint to the DataFrame (left unchanged), logging the rows dropped and time of each. """
+        if not self.enforcers:
+            return df
+        ConstraintEnforcer._check_df(df)
+        if df.empty:
+            logger.warning("Nothing to enforce: DataFrame is empty.")
+            return df
+
+        df, total = df.copy(deep=False), len(df)
+        rows = np.arange(total)
+        for enforcer in self.enforcers:
+            start, before = perf_counter(), len(rows)
+            df, rows = enforcer.enforce(df, rows)
+            logger.debug(f"Constraint {enforcer.describe()}: {before - len(rows)} rows dropped in {perf_counter() - start:.3f}s.")
+        if len(rows) < total:
+            logger.info(f"Constraints enforced: {total - len(rows)} of {total} rows dropped.")
+        return take_rows(df, rows)
@@ -1,14 +1,18 @@
 from __future__ import annotations
+from pathlib import Path
 from typing import TYPE_CHECKING
 
+import numpy as np
+import pandas as pd
+
 from . import logger
-from .enforcers import ConstraintEnforcerFactory
+from .enforcers import EnforcementPlan
+from .utils import get_table_schema
 from ..versioning import read_versions
-from sports_calendar.sync_db.utils import concat_io_content
-from sports_calendar.sc_core.file_io import FileHandlerFactory
+from sports_calendar.sync_db.utils import concat_io_content, cast_io_content
+from sports_calendar.sc_core.file_io import FileHandlerFactory, PartitionedFileHandler, PartitionKeyIndex, TableIndex
 
 if TYPE_CHECKING:
-    from .enforcers import ConstraintEnforcer
     from ..versioning import SourceVersions
     from sports_calendar.sc_core import IOContent
     from sports_calendar.sync_db.definitions.specs import OutputSpec
@@ -18,38 +22,188 @@ class OutputManager:
     """ Manage the output data writing process and enforce output constraints. """
 
     def __init__(self, output_spec: OutputSpec):
-        """ Initialize with an output specification and prepare file handler and enforcers. """
+        """ Initialize with an output specification and prepare file handler and enforcement plan. """
         logger.debug(f"Initializing OutputManager with spec: {output_spec}")
         self.output_spec = output_spec
-        self.handler = FileHandlerFactory.create_file_handler(self.output_spec.path)
-        self.enforcers = self._init_enforcers()
-
-    def _init_enforcers(self) -> list[ConstraintEnforcer]:
-        """ Initialize enforcers based on the output specification. """
-        enforcers = []
-        for contraint_spec in self.output_spec.constraints:
-            enforcers.append(ConstraintEnforcerFactory.create_enforcer(contraint_spec))
-        return enforcers
+        partitioning = self.output_spec.partitioning
+        self.handler = FileHandlerFactory.create_file_handler(
+            self.output_spec.path,
+            partition_by=partitioning.field if partitioning else None,
+            partition_kind=partitioning.kind if partitioning else None
+        )
+        self.enforcement_plan = EnforcementPlan.from_specs(self.output_spec.constraints)
+        # Column types of the output, kept end-to-end when the file format stores them (others are written as str)
+        self.schema = get_table_schema(self.output_spec.path) if self.handler.stores_dtypes else None
+        if self.schema:
+            logger.debug(f"Output {self.output_spec.name} is written with the column types {self.schema}.")
 
     def write(self, data: IOContent, source_versions: SourceVersions):
-        """ Write processed data to the output file, applying enforcers and saving metadata. """
+        """ Write processed data to the output file, enforcing its constraints and saving metadata. """
+        if self.output_spec.mode == "append":
+            self._append(data, source_versions)
+            return
+        if self.output_spec.partitioning is not None:
+            self._merge_partitions(data, source_versions)
+            return
+        if self.output_spec.mode == "upsert":
+            self._upsert(data, source_versions)
+            return
+        self._merge(data, source_versions)
+
+    def _merge(self, data: IOContent, source_versions: SourceVersions):
+        """ Merge the new data with the whole output file, enforcing constraints on the full table. """
         try:
             existing_data = self.handler.read()
-            full_data = concat_io_content(existing_data, data)
+            full_data = concat_io_content(existing_data, data, self.schema)
         except FileNotFoundError:
             logger.debug("No existing output file found. Proceeding with new data only.")
-            full_data = data
+            full_data = cast_io_content(data, self.schema) if self.schema else data
 
-        for enforcer in self.enforcers:
-            logger.debug(f"Applying enforcer: {enforcer.__class__.__name__}")
-            full_data = enforcer.apply(full_data)
+        full_data = self.enforcement_plan.apply(full_data)
 
         self.handler.write(full_data, source_versions=source_versions.to_dict(), overwrite=True)
+        self._write_indexes(full_data)
+
+    def _append(self, data: IOContent, source_versions: SourceVersions):
+        """ Append the new batch to the output file, enforcing constraints on the batch only. """
+        logger.debug(f"Appending new batch to output file: {self.output_spec.path}")
+        if self.schema and isinstance(data, pd.DataFrame):
+            data = self.schema.apply(data)
+        data = self.enforcement_plan.apply(data)
+
+        self.handler.write(data, source_versions=source_versions.to_dict(), overwrite=False)
+        if not self.output_spec.indexes:
+            return
+        if self.output_spec.partitioning is not None:
+            for key in self.handler.split(data):
+                self._write_indexes(self.handler.read_partitions([key]), self.handler.partition_path(key))
+        else:
+            self._write_indexes(self.handler.read())
+
+    def _upsert(self, data: IOContent, source_versions: SourceVersions):
+        """
+        Upsert the new batch: its unique keys are looked up in the key index persisted with the output file, and
+        only the rows sharing a key with it are replaced, the other rows are neither enforced nor rewritten.
+        """
+        if not isinstance(data, pd.DataFrame):
+            logger.error(f"Upsert is only supported for tabular outputs ({self.output_spec.path}).")
+            raise ValueError(f"Upsert is only supported for tabular outputs ({self.output_spec.path}).")
+        if isinstance(self.handler, PartitionedFileHandler):
+            # The key index of a single file is updated in place, partitions only have read-only combined indexes
+            logger.error(f"Upsert is not supported for partitioned outputs ({self.output_spec.path}).")
+            raise ValueError(f"Upsert is not supported for partitioned outputs ({self.output_spec.path}).")
+        index = TableIndex.load(self.handler.path) if self.handler.exists() else None
+        required = [TableIndex.key_name(field_set) for field_set in self._unique_field_sets()]
+        required += [index_spec.field for index_spec in self.output_spec.indexes]
+        if index is None or any(name not in index for name in required):
+            logger.info(f"No up-to-date key index for {self.output_spec.path}, merging the whole table to build it.")
+            self._merge(data, source_versions)
+            return
+        if self.schema and not self.schema.matches(self.handler.read_rows(np.array([], dtype=np.intp))):
+            logger.info(f"{self.output_spec.path} was written without its column types, merging the whole table to cast it.")
+            self._merge(data, source_versions)
+            return
+
+        batch = cast_io_content(data, self.schema)  # Same casting as the rows merged with the existing data
+        batch = self.enforcement_plan.apply(batch)
+
+        positions = np.array([], dtype=np.intp)
+        if not batch.empty:
+            positions = np.unique(np.concatenate(
+                [index.lookup_keys(field_set, batch) for field_set in self._unique_field_sets()]
+            ))
+        if len(positions) > 0:
+            logger.debug(f"{len(positions)} rows of {self.output_spec.path} share a key with the new data.")
+            batch = concat_io_content(self.handler.read_rows(positions), batch, self.schema)
+            batch = self.enforcement_plan.apply(batch)
+
+        start = len(self.handler) - len(positions)
+        self.handler.replace_rows(positions, batch, source_versions=source_versions.to_dict())
+        index.update(positions, batch, start)
+        index.write()
+
+    def _merge_partitions(self, data: IOContent, source_versions: SourceVersions):
+        """
+        Merge the new data into the partitions of its rows and the ones holding previous versions of them
+        (e.g. a rescheduled match), the other partitions are neither read nor written.
+        """
+        if not isinstance(data, pd.DataFrame):
+            logger.error(f"Partitioning is only supported for tabular outputs ({self.output_spec.path}).")
+            raise ValueError(f"Partitioning is only supported for tabular outputs ({self.output_spec.path}).")
+        self.handler.migrate()
+        keys = set(self.handler.get_partition_keys(data))
+        key_index = self._load_key_index()
+        if key_index is not None:
+            previous = key_index.lookup(data) - keys
+            if previous:
+                logger.debug(f"Partitions {sorted(previous)} hold previous versions of rows of the new data.")
+            keys |= previous
+        logger.debug(f"Merging new data into partitions {sorted(keys)} of {self.output_spec.path}.")
+
+        existing_data = self.handler.read_partitions(sorted(keys))
+        full_data = concat_io_content(existing_data, data, self.schema)
+        full_data = self.enforcement_plan.apply(full_data)
+
+        parts = self.handler.write_partitions(full_data, keys, source_versions=source_versions.to_dict())
+        for key in keys:
+            if key in parts:
+                self._write_indexes(parts[key], self.handler.partition_path(key))
+            else:
+                TableIndex.delete(self.handler.partition_path(key))
+        if key_index is not None:
+            key_index.update(parts, keys)
+            key_index.write(self._table_version())
+
+    def _load_key_index(self) -> PartitionKeyIndex | None:
+        """
+        Load the partition of each unique key of the partitioned output, or build it from the key columns of every
+        partition when it is missing or stale (e.g. after a cleanup). Return None if the output has no unique constraint.
+        """
+        field_sets = self._unique_field_sets()
+        if not field_sets:
+            return None
+        key_index = PartitionKeyIndex.load(self.handler.directory, self._table_version())
+        if key_index is not None and key_index.covers(field_sets):
+            return key_index
+        logger.info(f"Building the key index of the partitions of {self.output_spec.path}.")
+        fields = sorted({field for field_set in field_sets for field in field_set})
+        partitions = ((key, self.handler.read_partitions([key], columns=fields)) for key in self.handler.partition_keys())
+        return PartitionKeyIndex.build(self.handler.directory, partitions, field_sets)
+
+    def _table_version(self) -> int | None:
+        """ Return the metadata version of the output file. """
+        last_meta = self.handler.meta_manager.read_last()
+        return last_meta.version if last_meta else None
+
+    def _unique_field_sets(self) -> list[list[str]]:
+        """ Return the field sets of the unique constraints of the output. """
+        return [
+            field_set
+            for constraint_spec in self.output_spec.constraints if constraint_spec.type == "unique"
+            for field_set in constraint_spec.field_sets
+        ]
+
+    def _write_indexes(self, data: IOContent, path: Path | None = None) -> None:
+        """
+        Build the secondary indexes of the output file (or partition) from the data written to it (row offsets),
+        and the key indexes of its unique constraints in 'upsert' mode.
+        """
+        keys = self._unique_field_sets() if self.output_spec.mode == "upsert" else []
+        if not self.output_spec.indexes and not keys:
+            return
+        if not isinstance(data, pd.DataFrame):
+            logger.warning(f"Indexes are only supported for tabular outputs, skipping them for {self.output_spec.path}.")
+            return
+        path = path or self.handler.path
+        columns = {index_spec.field: index_spec.kind for index_spec in self.output_spec.indexes}
+        logger.debug(f"Writing indexes {columns} (keys: {keys}) for output file: {path}")
+        TableIndex.build(path, data.reset_index(drop=True), columns, keys=keys).write()
 
     def reset(self):
         """ Reset the output file by deleting it. """
         logger.debug(f"Resetting output file: {self.output_spec.path}")
         self.handler.delete(force=True)
+        TableIndex.delete(self.handler.path)  # Indexes of partitions are deleted with them
 
     def read_source_versions(self) -> SourceVersions:
         """ Retrieve the last recorded source versions from output metadata. """
@@ -1,6 +1,9 @@
 from __future__ import annotations
 from typing import TYPE_CHECKING
 
+import pandas as pd
+
+from .utils import get_table_schema
 from ..versioning import SourceVersions, SourceVersion, version_filter
 from sports_calendar.sync_db.utils import get_max_field_value
 from sports_calendar.sc_core.file_io import FileHandlerFactory
@@ -52,4 +55,7 @@ class SourcesManager:
             strategy=source.versioning_strategy,
             source_version=source_version
         )
+        table_schema = get_table_schema(source.path)
+        if table_schema is not None and isinstance(data, pd.DataFrame):
+            data = table_schema.apply(data)  # Processors get the declared dtypes, whatever the file format
         return data
@@ -1,14 +1,35 @@
 from __future__ import annotations
+from functools import cache
+from pathlib import Path
 from typing import TYPE_CHECKING
 
 import pandas as pd
 
 from . import logger
+from sports_calendar.sc_core import Paths, TableSchema
+from sports_calendar.validate_db.definitions import load_schema
 
 if TYPE_CHECKING:
     from sports_calendar.sc_core import IOContent
 
 
+def get_table_schema(path: Path | str) -> TableSchema | None:
+    """ Return the column types declared for a table by the validation schemas, if it has some. """
+    db_dir = getattr(Paths, "DB_DIR", None)
+    if db_dir is None:
+        return None
+    return _load_table_schemas(Path(db_dir)).get(Path(path).resolve(strict=False))
+
+@cache
+def _load_table_schemas(db_dir: Path) -> dict[Path, TableSchema]:
+    """ Load the column types of the tables of the validation schemas, once per database directory. """
+    schema = load_schema(strict=True)
+    schema.resolve_paths(base_path=db_dir)
+    table_schemas = schema.table_schemas()
+    logger.debug(f"Loaded the column types of {len(table_schemas)} tables from the validation schemas.")
+    return table_schemas
+
+
 def inject_static_fields(data: IOContent, static_fields: list[dict] | None = None) -> IOContent:
     """ Inject static fields into the data. """
     if static_fields is None:
@@ -0,0 +1,24 @@
+from . import logger
+from .definitions import load_workflow
+from sports_calendar.sc_core import DataStage, Paths
+from sports_calendar.sc_core.file_io import migrate_json_to_jsonl
+
+
+def migrate_landing_to_jsonl(keep_source: bool = False, **kwargs) -> None:
+    """ Convert the existing JSON landing files to the JSON Lines files expected by the landing workflow. """
+    workflow = load_workflow(strict=True)
+    workflow.resolve_paths(base_path=Paths.DB_DIR)
+
+    layer_spec = workflow.get(DataStage.LANDING)
+    for model_spec in layer_spec:
+        target_path = model_spec.output.path
+        if target_path.suffix != ".jsonl":
+            logger.debug(f"Output of model {model_spec.name} is not a JSONL file, skipping.")
+            continue
+        legacy_path = target_path.with_suffix(".json")
+        if not legacy_path.exists():
+            logger.debug(f"No legacy JSON file found for model {model_spec.name}, skipping.")
+            continue
+        migrate_json_to_jsonl(legacy_path, remove_source=not keep_source)
+
+    logger.info("Landing files migration completed.")
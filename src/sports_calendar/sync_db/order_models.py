@@ -5,7 +5,7 @@ from . import logger
 from sports_calendar.sc_core import DataStage
 
 if TYPE_CHECKING:
-    from .definitions.specs import ModelSpec
+    from .definitions.specs import ModelSpec, LayerSpec
 
 
 class ModelOrder:
@@ -18,12 +18,17 @@ class ModelOrder:
     """
 
     def __init__(self, models: list[ModelSpec], stage: str = "landing"):
+        self._setup(models, self._get_dependencies(models, stage))
+
+    def _setup(self, models: list[ModelSpec], dependencies: dict[str, set[str]]) -> None:
+        """ Initialize the tracking state from the models and their resolved dependencies. """
         self.models = models
-        self.dependencies = self._get_dependencies(models, stage)
+        self.dependencies = dependencies
         self._check_circular_dependencies(self.dependencies)
         self.model_names = set(model.name for model in models)
 
         self.completed = set()
+        self.running = set()
         self.failed = set()
         self.ignored = set()
         self._build_reverse_deps()
@@ -34,31 +39,58 @@ class ModelOrder:
 
     def __next__(self) -> ModelSpec:
         """ Return the next model ready for processing, respecting dependency completion. """
-        ready_models = [
+        ready_models = self.get_ready()
+        if not ready_models:
+            self.check_finished()
+            raise StopIteration
+        self.completed.add(ready_models[0].name)
+        return ready_models[0]
+
+    def get_ready(self) -> list[ModelSpec]:
+        """ Return all the models whose dependencies are completed and that are not processed yet. """
+        return [
             model for model in self.models
             if model.name not in self.completed # Model isn't already completed
             and model.name not in self.failed # Model isn't already failed
             and model.name not in self.ignored # Model isn't ignored
+            and model.name not in self.running # Model isn't currently running
             and self.dependencies[model.name].issubset(self.completed) # All dependencies are completed
         ]
-        if not ready_models:
-            if self.completed | self.failed | self.ignored == self.model_names:
-                if self.ignored:
-                    logger.warning(f"Ignored models due to failed dependencies: {self.ignored}")
-                raise StopIteration
-            else:
-                logger.error("Deadlock or unresolved dependencies due to previous failures.")
-                logger.debug(f"Missing models: {self.model_names - (self.completed | self.failed)}")
-                raise ValueError("Deadlock or unresolved dependencies due to previous failures.")
-        self.completed.add(ready_models[0].name)
-        return ready_models[0]
+
+    def check_finished(self) -> None:
+        """ Check that every model has been processed once no model is ready anymore. """
+        if self.completed | self.failed | self.ignored == self.model_names:
+            if self.ignored:
+                logger.warning(f"Ignored models due to failed dependencies: {self.ignored}")
+            return
+        logger.error("Deadlock or unresolved dependencies due to previous failures.")
+        logger.debug(f"Missing models: {self.model_names - (self.completed | self.failed)}")
+        raise ValueError("Deadlock or unresolved dependencies due to previous failures.")
+
+    def mark_running(self, model: ModelSpec) -> None:
+        """ Mark a model as running (used when models are dispatched concurrently). """
+        if model.name in self.running | self.completed | self.failed | self.ignored:
+            logger.error(f"Model {model.name} was already dispatched, cannot mark as running.")
+            raise ValueError(f"Model {model.name} was already dispatched, cannot mark as running.")
+        self.running.add(model.name)
+
+    def mark_completed(self, model: ModelSpec) -> None:
+        """ Mark a running model as completed. """
+        if model.name not in self.running:
+            logger.error(f"Model {model.name} is not running, cannot mark as completed.")
+            raise ValueError(f"Model {model.name} is not running, cannot mark as completed.")
+        self.running.remove(model.name)
+        self.completed.add(model.name)
 
     def mark_failed(self, model: ModelSpec) -> None:
-        """ Mark a model as failed. """
-        if model.name not in self.completed:
-            logger.error(f"Model {model.name} is not completed, cannot mark as failed.")
-            raise ValueError(f"Model {model.name} is not completed, cannot mark as failed.")
-        self.completed.remove(model.name)
+        """ Mark a model (completed by the iterator or running) as failed. """
+        if model.name in self.running:
+            self.running.remove(model.name)
+        elif model.name in self.completed:
+            self.completed.remove(model.name)
+        else:
+            logger.error(f"Model {model.name} is neither completed nor running, cannot mark as failed.")
+            raise ValueError(f"Model {model.name} is neither completed nor running, cannot mark as failed.")
         self.failed.add(model.name)
         self._ignore_deps(model.name)
 
@@ -123,3 +155,50 @@ class ModelOrder:
     
         for model in dependencies:
             visit(model)
+
+
+class WorkflowOrder(ModelOrder):
+    """
+    Manage and iterate over the models of several layers as a single dependency graph.
+
+    Cross-stage dependencies (`stage.model`) are kept instead of being replaced by a barrier
+    between stages, so a model can start as soon as the models it depends on are completed.
+    Dependencies on a stage that isn't part of the run are ignored, like in `ModelOrder`.
+    """
+
+    def __init__(self, layers: list[LayerSpec]):
+        self.stages = {}
+        models = []
+        for layer in sorted(layers, key=lambda layer: layer.stage):
+            for model in layer.models:
+                if model.name in self.stages:
+                    logger.error(f"Model name {model.name} is used in several stages, cannot build a workflow order.")
+                    raise ValueError(f"Model name {model.name} is used in several stages, cannot build a workflow order.")
+                self.stages[model.name] = layer.stage
+                models.append(model)
+        self._setup(models, self._get_workflow_dependencies(models, self.stages))
+
+    @staticmethod
+    def _get_workflow_dependencies(models: list[ModelSpec], stages: dict[str, DataStage]) -> dict[str, set[str]]:
+        """ Get the dependencies of the models across all the stages of the workflow. """
+        included_stages = set(stages.values())
+        dependencies = {}
+        for model in models:
+            stage = stages[model.name]
+            dependencies[model.name] = set()
+
+            for dep in model.dependencies:
+                dep_stage, dep_name = dep.split(".")
+                dep_stage = DataStage(dep_stage)
+
+                if dep_stage > stage:
+                    logger.error(f"Model {model.name} has a dependency on a model in a later stage: {dep}")
+                    raise ValueError(f"Model {model.name} has a dependency on a model in a later stage: {dep}")
+                elif dep_stage not in included_stages:
+                    continue
+                elif stages.get(dep_name, dep_stage) != dep_stage:
+                    logger.error(f"Model {model.name} has a dependency on {dep} but {dep_name} belongs to stage {stages[dep_name]}.")
+                    raise ValueError(f"Model {model.name} has a dependency on {dep} but {dep_name} belongs to stage {stages[dep_name]}.")
+                dependencies[model.name].add(dep_name)
+
+        return dependencies
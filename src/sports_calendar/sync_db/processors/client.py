@@ -1,5 +1,6 @@
 from __future__ import annotations
 from typing import TYPE_CHECKING, Any
+from concurrent.futures import ThreadPoolExecutor
 
 from . import logger
 from .base import Processor
@@ -33,31 +34,47 @@ class ClientProcessor(Processor):
         config = cls.load_config(io_info.config_key)
         client_class_name = config.get("client_class")
         method_name = config.get("method")
+        max_concurrency = config.get("max_concurrency", 1)
+        client_kwargs = config.get("client_kwargs", {})
+        if "cache_ttl" in config:
+            client_kwargs = {**client_kwargs, "cache_ttl": config["cache_ttl"]}
 
         if client_class_name not in CLIENT_CLASS_REGISTRY:
             logger.error(f"Client class {client_class_name} not found in registry.")
             raise ValueError(f"Client class {client_class_name} not found in registry.")
 
         client_class = CLIENT_CLASS_REGISTRY[client_class_name]
-        client_obj = client_class()
+        client_obj = client_class(**client_kwargs)
 
         if params is None:
             params = [{}]
 
-        return cls.fetch_data_from_client(client_obj, method_name, params)
+        return cls.fetch_data_from_client(client_obj, method_name, params, max_concurrency=max_concurrency)
 
     @staticmethod
-    def fetch_data_from_client(client_obj: any, method_name: str, params_list: list[dict]) -> IOContent:
-        """ Call the client's method multiple times using the given parameters and aggregate results. """
+    def fetch_data_from_client(client_obj: any, method_name: str, params_list: list[dict], max_concurrency: int = 1) -> IOContent:
+        """
+        Call the client's method multiple times using the given parameters and aggregate results.
+        Up to `max_concurrency` calls run at the same time, the results are aggregated in the order of the parameters.
+        """
         logger.debug(f"Fetching data from client: {client_obj.__class__.__name__}, method: {method_name}, params: {params_list}")
         method = getattr(client_obj, method_name, None)
         if method is None:
             logger.error(f"Method {method_name} not found in the class {client_obj.__class__.__name__}.")
             raise ValueError(f"Method {method_name} not found in the class {client_obj.__class__.__name__}.")
 
+        if not isinstance(max_concurrency, int) or max_concurrency < 1:
+            logger.error(f"Invalid max_concurrency {max_concurrency} for client {client_obj.__class__.__name__}. Expected a positive integer.")
+            raise ValueError(f"Invalid max_concurrency {max_concurrency} for client {client_obj.__class__.__name__}. Expected a positive integer.")
+
+        if max_concurrency == 1 or len(params_list) <= 1:
+            results = (method(**params) for params in params_list)
+        else:
+            with ThreadPoolExecutor(max_workers=min(max_concurrency, len(params_list)), thread_name_prefix=method_name) as executor:
+                results = list(executor.map(lambda params: method(**params), params_list))
+
         outputs = None
-        for params in params_list:
-            output = method(**params)
+        for output in results:
             outputs = concat_io_content(outputs, output)
 
         return outputs
@@ -119,26 +119,123 @@ class ColumnsMapping:
         return cls(direct_paths, iterate)
 
 
+# Compiled extraction
+
+class PathTrie:
+    """
+    JSON paths of columns compiled into a trie: the prefixes shared by several paths (e.g. 'competitions.0.competitors.0.team')
+    are looked up once per record, and the values are appended to the column arrays directly.
+    """
+    __slots__ = ("children", "outputs", "subtree")
+
+    def __init__(self):
+        self.children: dict[str | int, PathTrie] | tuple[tuple[str | int, PathTrie], ...] = {}
+        self.outputs: tuple[int, ...] = ()  # Columns whose path ends at this node
+        self.subtree: tuple[int, ...] = ()  # Columns whose path goes through this node, set to None when it's missing
+
+    @classmethod
+    def from_columns(cls, columns: Columns) -> PathTrie:
+        """ Compile the paths of the columns, the column arrays being referenced by their position in columns. """
+        root = cls()
+        for position, col in enumerate(columns):
+            node = root
+            for key in col.path.keys:
+                node = node.children.setdefault(key, cls())
+            node.outputs += (position,)
+        root._freeze()
+        return root
+
+    def _freeze(self) -> tuple[int, ...]:
+        """ Turn the children into tuples (faster to iterate) and compute the columns of each subtree. """
+        subtree = self.outputs
+        for child in self.children.values():
+            subtree += child._freeze()
+        self.children = tuple(self.children.items())
+        self.subtree = subtree
+        return subtree
+
+    def extract(self, data: any, arrays: list[list]) -> None:
+        """ Append the value of every column of the trie found in data (None if missing) to its array. """
+        for position in self.outputs:
+            arrays[position].append(data)
+        for key, child in self.children:
+            try:
+                value = data[key]
+            except (KeyError, IndexError, TypeError):
+                for position in child.subtree:
+                    arrays[position].append(None)
+                continue
+            child.extract(value, arrays)
+
+class CompiledMapping:
+    """ Columns mapping compiled into path tries, extracting a list of records into a DataFrame column by column. """
+
+    def __init__(self, mapping: ColumnsMapping):
+        self.direct_names = [col.name for col in mapping.direct_paths]
+        self.direct_trie = PathTrie.from_columns(mapping.direct_paths)
+        self.iterate_path = mapping.iterate.path if mapping.iterate else None
+        self.iterate_names = [col.name for col in mapping.iterate.columns] if mapping.iterate else []
+        self.iterate_trie = PathTrie.from_columns(mapping.iterate.columns) if mapping.iterate else None
+
+    def extract(self, records: list[dict]) -> pd.DataFrame:
+        """ Extract the columns of the records (one row per item of the iterated list, if any). """
+        direct_arrays = [[] for _ in self.direct_names]
+        if self.iterate_path is None:
+            for record in records:
+                self.direct_trie.extract(record, direct_arrays)
+            return self._to_frame({}, direct_arrays, len(records))
+
+        iterate_arrays = [[] for _ in self.iterate_names]
+        record_arrays = [[] for _ in self.direct_names]
+        rows = 0
+        for record in records:
+            items = self.iterate_path.apply(record)
+            if not isinstance(items, list) or not items:
+                continue
+            for item in items:
+                self.iterate_trie.extract(item, iterate_arrays)
+            for array in record_arrays:
+                array.clear()
+            self.direct_trie.extract(record, record_arrays)
+            for array, values in zip(direct_arrays, record_arrays):
+                array.extend(values * len(items))  # The record values are repeated on the rows of its items
+            rows += len(items)
+        return self._to_frame(dict(zip(self.iterate_names, iterate_arrays)), direct_arrays, rows)
+
+    def _to_frame(self, iterate_columns: dict[str, list], direct_arrays: list[list], rows: int) -> pd.DataFrame:
+        """ Build the DataFrame, iterated columns first and direct paths overriding them (as ColumnsMapping.apply). """
+        if rows == 0:
+            return pd.DataFrame()
+        columns = {**iterate_columns, **dict(zip(self.direct_names, direct_arrays))}
+        return pd.DataFrame(columns)
+
+
 # JSON extraction
 
 class JsonExtractionProcessor(Processor):
     """ Processor to extract JSON fields into a DataFrame. """
     config_filename = "json_extraction"
+    _compiled: dict[str, tuple[dict, CompiledMapping]] = {}  # Config key -> (config, compiled mapping)
 
     @classmethod
     def _run(cls, data: dict[str, list[dict]], io_info: ProcessingIOInfo, **kwargs) -> pd.DataFrame:
         """ Extract JSON fields into a DataFrame. """
-        json_data = data.get("data").copy()
+        json_data = data.get("data")
         if json_data is None:
             logger.error("Input data not found in the provided data dictionary.")
             raise ValueError("Input data not found in the provided data dictionary.")
 
-        config = cls.load_config(io_info.config_key)
-        mapping = ColumnsMapping.from_dict(config)
+        mapping = cls.get_mapping(io_info.config_key)
+        return mapping.extract(json_data)
 
-        extracted_data = []
-        for item in json_data:
-            extracted_data.extend(mapping.apply(item))
-            # logger.debug(f"Extracted {len(extracted_data)} items so far.")
-
-        return pd.DataFrame(extracted_data)
+    @classmethod
+    def get_mapping(cls, config_key: str) -> CompiledMapping:
+        """ Return the compiled mapping of a config key, compiled once as long as its config is unchanged. """
+        config = cls.load_config(config_key)
+        cached = cls._compiled.get(config_key)
+        if cached is not None and cached[0] is config:
+            return cached[1]
+        logger.debug(f"Compiling JSON extraction mapping '{config_key}'.")
+        mapping = CompiledMapping(ColumnsMapping.from_dict(config))
+        cls._compiled[config_key] = (config, mapping)
+        return mapping
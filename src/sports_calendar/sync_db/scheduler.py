@@ -0,0 +1,97 @@
+from __future__ import annotations
+from time import perf_counter
+from typing import Callable, TYPE_CHECKING
+from concurrent.futures import ThreadPoolExecutor, Future, wait, FIRST_COMPLETED
+
+from . import logger
+from .order_models import ModelOrder
+
+if TYPE_CHECKING:
+    from .definitions.specs import ModelSpec
+
+
+class DagScheduler:
+    """
+    Run the models of a `ModelOrder` on a thread pool, each one as soon as its dependencies are completed.
+
+    Completions and failures are marked back into the order (so the dependents of a failed model are ignored)
+    and the start / end time of every model is recorded to report the critical path of the run.
+    """
+
+    def __init__(self, order: ModelOrder, workers: int = 1, name: str = "sync-db"):
+        if workers < 1:
+            logger.error(f"Number of workers must be at least 1, got {workers}.")
+            raise ValueError(f"Number of workers must be at least 1, got {workers}.")
+        self.order = order
+        self.workers = workers
+        self.name = name
+        self.timings: dict[str, tuple[float, float]] = {}
+        self._started_at: float | None = None
+        self._ended_at: float | None = None
+
+    def run(self, func: Callable[[ModelSpec], None]) -> None:
+        """ Run `func` on every model of the order, respecting the dependencies. """
+        self._started_at = perf_counter()
+        running: dict[Future, ModelSpec] = {}
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix=self.name) as executor:
+            while True:
+                for model_spec in self.order.get_ready():
+                    self.order.mark_running(model_spec)
+                    running[executor.submit(self._timed, func, model_spec)] = model_spec
+                if not running:
+                    break
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    model_spec = running.pop(future)
+                    try:
+                        future.result()
+                        self.order.mark_completed(model_spec)
+                    except Exception:
+                        logger.exception(f"Error processing model {model_spec.name}. Marking as failed.")
+                        self.order.mark_failed(model_spec)
+        self._ended_at = perf_counter()
+        self.order.check_finished()
+
+    def critical_path(self) -> tuple[list[str], float]:
+        """ Return the chain of dependent models with the longest cumulated duration, and that duration. """
+        finish: dict[str, float] = {}
+        previous: dict[str, str | None] = {}
+
+        def visit(name: str) -> float:
+            if name not in finish:
+                start, end = self.timings[name]
+                deps = [dep for dep in self.order.dependencies[name] if dep in self.timings]
+                slowest = max(deps, key=visit, default=None)
+                previous[name] = slowest
+                finish[name] = (end - start) + (finish[slowest] if slowest else 0.0)
+            return finish[name]
+
+        if not self.timings:
+            return [], 0.0
+        last = max(self.timings, key=visit)
+        path = []
+        current = last
+        while current is not None:
+            path.append(current)
+            current = previous[current]
+        return path[::-1], finish[last]
+
+    def report(self) -> None:
+        """ Log the wall time of the run and its critical path. """
+        if self._started_at is None or self._ended_at is None:
+            logger.debug("Scheduler has not run yet, nothing to report.")
+            return
+        path, duration = self.critical_path()
+        wall_time = self._ended_at - self._started_at
+        busy_time = sum(end - start for start, end in self.timings.values())
+        steps = " -> ".join(f"{name} ({self.timings[name][1] - self.timings[name][0]:.1f}s)" for name in path)
+        logger.info(f"Built {len(self.timings)} models in {wall_time:.1f}s ({busy_time:.1f}s of model time, {self.workers} workers).")
+        logger.info(f"Critical path ({duration:.1f}s): {steps or 'none'}")
+
+    def _timed(self, func: Callable[[ModelSpec], None], model_spec: ModelSpec) -> None:
+        """ Run `func` on a model and record its start and end time (even when it fails). """
+        start = perf_counter()
+        try:
+            func(model_spec)
+        finally:
+            self.timings[model_spec.name] = (start, perf_counter())
@@ -2,4 +2,4 @@ import logging
 logger = logging.getLogger(__name__)
 
 from .filter_utils import filter_file_content
-from .io_utils import get_max_field_value, concat_io_content
+from .io_utils import get_max_field_value, concat_io_content, cast_io_content
@@ -1,9 +1,10 @@
 from typing import Any
 
+import numpy as np
 import pandas as pd
 
 from . import logger
-from sports_calendar.sc_core import IOContent
+from sports_calendar.sc_core import IOContent, TableSchema
 
 
 def get_max_field_value(data: IOContent, field: str) -> Any:
@@ -38,17 +39,18 @@ def _get_max_field_value_json(data: list[dict], field: str) -> Any:
     return max(item[field] for item in data if item[field] is not None)
 
 
-def concat_io_content(data: IOContent, new_data: IOContent | dict | None) -> IOContent:
-    """ Concatenate two data sources. """
+def concat_io_content(data: IOContent, new_data: IOContent | dict | None, schema: TableSchema | None = None) -> IOContent:
+    """ Concatenate two data sources (DataFrames are cast to str, except the columns typed by the schema). """
     if new_data is None:
         logger.warning("New data is None. Returning original data.")
         return data
     elif data is None:
         return new_data
     elif isinstance(data, pd.DataFrame) and isinstance(new_data, pd.DataFrame):
-        data = data.astype(str)
-        new_data = new_data.astype(str)
-        return pd.concat([data, new_data], ignore_index=True)
+        data = _as_typed(data, schema)
+        new_data = _as_typed(new_data, schema)
+        concatenated = pd.concat([data, new_data], ignore_index=True)
+        return schema.apply(concatenated) if schema else concatenated  # Categories of both frames are unified
     elif isinstance(data, list) and isinstance(new_data, list):
         return data + new_data
     elif isinstance(data, list) and isinstance(new_data, dict):
@@ -58,3 +60,30 @@ def concat_io_content(data: IOContent, new_data: IOContent | dict | None) -> IOC
         logger.debug(f"New data: {new_data}")
         logger.error(f"Unsupported data types: {type(data)} and {type(new_data)}. Expected both to be of the same type.")
         raise TypeError(f"Unsupported data types: {type(data)} and {type(new_data)}. Expected both to be of the same type.")
+
+def cast_io_content(data: IOContent, schema: TableSchema | None = None) -> IOContent:
+    """ Cast tabular data as concat_io_content does when merging it with existing data. """
+    if isinstance(data, pd.DataFrame):
+        return _as_typed(data, schema)
+    return data
+
+def _as_typed(df: pd.DataFrame, schema: TableSchema | None = None) -> pd.DataFrame:
+    """ Cast the columns typed by the schema to their dtype, and the other ones to str. """
+    if not schema:
+        return _as_str(df)
+    untyped = [column for column in df.columns if column not in schema]
+    if untyped:
+        as_str = _as_str(df[untyped])
+        df = df.copy(deep=False)
+        for column in untyped:
+            df[column] = as_str[column]
+    return schema.apply(df)
+
+def _as_str(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Cast all columns to str, keeping missing values missing (like CSV reads, the 'nan' left by earlier str casts
+    of Parquet tables is read back as missing).
+    """
+    values = df.astype(object)
+    present = values.notna() & (values != "nan")
+    return values.astype(str).where(present, np.nan)
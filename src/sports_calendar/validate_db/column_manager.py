@@ -38,7 +38,7 @@ class ColumnManager:
                     if not invalid_values.empty:
                         raise ValueError(f"Invalid datetime values detected: {invalid_values.tolist()}")
                 else:
-                    col.astype(self.column_spec.type)
+                    col.dropna().astype(self.column_spec.type)  # Nulls are checked by the nullable constraint
             except Exception as e:
                 self._handle_issue(
                     model=model,
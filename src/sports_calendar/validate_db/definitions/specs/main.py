@@ -4,7 +4,7 @@ from dataclasses import dataclass
 
 from . import logger
 from .layer import LayerSchemaSpec
-from sports_calendar.sc_core import SpecModel, DataStage
+from sports_calendar.sc_core import SpecModel, DataStage, TableSchema
 
 
 @dataclass
@@ -37,3 +37,13 @@ class SchemaSpec(SpecModel):
         """ Resolve the paths of all layers in the schema relative to a base path. """
         for layer in self.layers:
             layer.resolve_paths(base_path)
+
+    def table_schemas(self) -> dict[Path, TableSchema]:
+        """ Return the column types of the models which declare some, by model path. """
+        schemas = {}
+        for layer in self.layers:
+            for model in layer:
+                table_schema = model.to_table_schema()
+                if table_schema:
+                    schemas[Path(model.path)] = table_schema
+        return schemas
@@ -2,7 +2,7 @@ from pathlib import Path
 from dataclasses import dataclass
 
 from . import logger
-from sports_calendar.sc_core import SpecModel
+from sports_calendar.sc_core import SpecModel, TableSchema
 
 
 @dataclass
@@ -20,6 +20,10 @@ class ModelSchemaSpec(SpecModel):
     path: Path
     columns: list[ColumnSpec]
 
+    def to_table_schema(self) -> TableSchema:
+        """ Return the column types of the model, to keep its data in stable dtypes. """
+        return TableSchema.from_columns(self.columns)
+
     def resolve_path(self, base_path: Path | str) -> None:
         """ Resolve the path of the model schema relative to a base path. """
         base_path = Path(base_path)